@@ -0,0 +1,74 @@
+"""
+Parity check and throughput comparison of the text extraction backends.
+
+Writes synthetic passbook PDFs to a temporary directory, checks that every backend
+yields exactly the reference (pdfplumber) page text and parse result, then times a
+full extraction of each PDF per backend. Exits non-zero on any parity mismatch.
+
+Usage: python benchmarks/bench_backends.py [--rows N ...] [--repeat R]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from epfo_backends import BACKENDS, DEFAULT_BACKEND, get_backend  # noqa: E402
+from epfo_parser_final import EPFOMultiYearParser  # noqa: E402
+from synthetic_passbook import write_passbook_pdf  # noqa: E402
+
+
+def parse(pdf_path: str, backend: str):
+    parser = EPFOMultiYearParser(backend=backend)
+    year_data = parser._parse_pdf(pdf_path, "2023")
+    return parser.member_info, year_data["balances"], year_data["transactions"]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument(
+        "--rows", type=int, nargs="+", default=[100, 1000, 5000],
+        help="Transaction rows per synthetic passbook",
+    )
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Timed runs (best is reported)")
+    args = arg_parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            pdf_path = write_passbook_pdf(
+                os.path.join(tmp, f"MHBAN00123450000012345_{rows}_2023.pdf"), 2023, rows
+            )
+            reference = list(get_backend(DEFAULT_BACKEND).iter_page_texts(pdf_path))
+            reference_result = parse(pdf_path, DEFAULT_BACKEND)
+            print(f"{rows} rows, {len(reference)} pages")
+
+            for name in BACKENDS:
+                backend = get_backend(name)
+                same_text = list(backend.iter_page_texts(pdf_path)) == reference
+                same_result = parse(pdf_path, name) == reference_result
+                if not (same_text and same_result):
+                    failures += 1
+
+                best = float("inf")
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    for _ in backend.iter_page_texts(pdf_path):
+                        pass
+                    best = min(best, time.perf_counter() - start)
+                print(
+                    f"  {name:<12} {best * 1000:9.1f} ms  {len(reference) / best:8.1f} pages/s"
+                    f"  text parity: {'ok' if same_text else 'MISMATCH'}"
+                    f"  parse parity: {'ok' if same_result else 'MISMATCH'}"
+                )
+
+    if failures:
+        print(f"{failures} parity mismatch(es)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
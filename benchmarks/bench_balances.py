@@ -0,0 +1,45 @@
+"""
+Scaling benchmark for EPFOMultiYearParser.extract_balances_from_text.
+
+Times regular synthetic passbooks and pathological inputs (many "Int." labels or
+"Total ... for the year" labels with no amounts after them) at growing sizes, so a
+non-linear regression shows up as a growing us/KB figure.
+
+Usage: python benchmarks/bench_balances.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from epfo_parser_final import EPFOMultiYearParser  # noqa: E402
+from synthetic_passbook import passbook_text  # noqa: E402
+
+
+def time_balances(parser, text):
+    start = time.perf_counter()
+    parser.extract_balances_from_text(text, "2023")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = EPFOMultiYearParser()
+    cases = []
+    for rows in (500, 5000, 50000):
+        cases.append((f"passbook {rows} rows", passbook_text(2023, rows)))
+    for count in (1000, 4000, 16000):
+        cases.append((f"{count} bare 'Int.' labels", "Int. " * count))
+    for count in (1000, 4000, 16000):
+        cases.append((f"{count} bare 'Total' labels", "Total Contributions for the year " * count))
+
+    print(f"{'case':<32} {'size KB':>10} {'ms':>10} {'us/KB':>8}")
+    for name, text in cases:
+        elapsed = time_balances(parser, text)
+        kb = len(text) / 1024
+        print(f"{name:<32} {kb:>10.1f} {elapsed * 1000:>10.2f} {elapsed * 1e6 / kb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Compare the "text" and "columns" extraction modes on synthetic passbook PDFs.
+
+For each size a plain PDF and one with wrapped descriptions are written. The pages
+are extracted once, and then each mode's parsing is timed on the extracted pages:
+page text for "text", positioned word lines for "columns". The report also shows
+the end-to-end _parse_pdf time and how many of the generated rows each mode
+recovered (same wage month, date and amounts).
+
+Usage: python benchmarks/bench_columns.py [--rows N ...] [--wrap W] [--backend NAME] [--repeat R]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from epfo_backends import BACKENDS, get_backend  # noqa: E402
+from epfo_parser_final import EPFOMultiYearParser  # noqa: E402
+from synthetic_passbook import transaction_rows, write_passbook_pdf  # noqa: E402
+
+
+def row_key(transaction):
+    if transaction["type"] == "DR":
+        amounts = (
+            transaction["employee_withdrawal"],
+            transaction["employer_withdrawal"],
+            transaction["pension_withdrawal"],
+        )
+    else:
+        amounts = (
+            transaction["employee_contribution"],
+            transaction["employer_contribution"],
+            transaction["pension_contribution"],
+        )
+    return transaction["month"], transaction["date"], amounts
+
+
+def recovered(transactions, truth):
+    found = {row_key(t) for t in transactions}
+    return sum(
+        (row[0], row[1], tuple(int(a.replace(",", "")) for a in row[6:9])) in found
+        for row in truth
+    )
+
+
+def best_of(repeat, func):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument(
+        "--rows", type=int, nargs="+", default=[100, 1000],
+        help="Transaction rows per synthetic passbook",
+    )
+    arg_parser.add_argument(
+        "--wrap", type=int, default=24,
+        help="Wrap width (characters) of descriptions in the wrapped variant",
+    )
+    arg_parser.add_argument("--backend", choices=sorted(BACKENDS), default="pdfminer")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Timed runs (best is reported)")
+    args = arg_parser.parse_args()
+
+    backend = get_backend(args.backend)
+    parser = EPFOMultiYearParser(backend=args.backend)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            truth = transaction_rows(2023, rows)
+            for wrap in (0, args.wrap):
+                pdf_path = write_passbook_pdf(
+                    os.path.join(tmp, f"MHBAN00123450000012345_{rows}_{wrap}_2023.pdf"),
+                    2023, rows, wrap_particulars=wrap,
+                )
+                page_texts = list(backend.iter_page_texts(pdf_path))
+                page_lines = list(backend.iter_page_lines(pdf_path))
+                label = f"wrapped at {wrap}" if wrap else "plain"
+                print(f"{rows} rows, {len(page_lines)} pages, {label}")
+
+                for mode in ("text", "columns"):
+                    if mode == "text":
+                        def parse_only():
+                            return parser.parse_pages(page_texts, "2023")[2]
+                    else:
+                        def parse_only():
+                            return parser.parse_page_lines(page_lines, "2023")[2]
+                    transactions = parse_only()
+                    parse_time = best_of(args.repeat, parse_only)
+
+                    mode_parser = EPFOMultiYearParser(backend=args.backend, mode=mode)
+                    total_time = best_of(1, lambda: mode_parser._parse_pdf(pdf_path, "2023"))
+                    print(
+                        f"  {mode:<8} parse {parse_time * 1000:8.2f} ms"
+                        f"  ({rows / parse_time:>9,.0f} rows/s)"
+                        f"  end-to-end {total_time * 1000:8.1f} ms"
+                        f"  rows recovered {recovered(transactions, truth)}/{rows}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
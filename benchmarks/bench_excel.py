@@ -0,0 +1,138 @@
+"""
+Excel report write time and peak memory, streamed workbook against pandas DataFrames.
+
+Builds a synthetic consolidated result of --rows transactions and writes it as an
+Excel report:
+
+- member: epfo_excel.write_member_workbook, the write-only openpyxl workbook
+  generate_excel_report uses;
+- batch: epfo_excel.ExcelWorkbookWriter, the multi-member workbook of
+  `epfoparser batch --excel`, with the rows spread over --members members;
+- pandas: the previous path, one DataFrame per sheet written through
+  pd.ExcelWriter(engine="openpyxl") (skipped if pandas is not installed).
+
+Each write runs in its own process; peak RSS is shown as the growth over the RSS
+the process had once the result was built, so a streamed writer's figure should
+stay roughly flat as --rows grows.
+
+Usage: python benchmarks/bench_excel.py [--rows N ...] [--members N] [--writers NAME ...]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+WRITERS = ("member", "batch", "pandas")
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def write_pandas(result: dict, path: str):
+    import pandas as pd
+
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        pd.DataFrame([result["member_info"]]).to_excel(writer, sheet_name="Member Info", index=False)
+        pd.DataFrame(result["yearly_summaries"]).to_excel(writer, sheet_name="Yearly Summary", index=False)
+        pd.DataFrame(result["all_transactions"].to_dicts()).to_excel(
+            writer, sheet_name="All Transactions", index=False
+        )
+        pd.DataFrame([result["final_balances"]]).to_excel(writer, sheet_name="Final Balances", index=False)
+        pd.DataFrame([result["total_withdrawals"]]).to_excel(
+            writer, sheet_name="Total Withdrawals", index=False
+        )
+
+
+def write_batch(result: dict, path: str, members: int):
+    from epfo_excel import ExcelWorkbookWriter
+    from epfo_parser_final import TransactionRange
+
+    transactions = result["all_transactions"]
+    per_member = -(-len(transactions) // members)
+    with ExcelWorkbookWriter(path) as workbook:
+        for i in range(members):
+            start = i * per_member
+            part = TransactionRange(transactions, start, min(start + per_member, len(transactions)))
+            member_info = dict(result["member_info"], member_id=f"MHBAN{i:017d}")
+            workbook.add_result(dict(result, member_info=member_info, all_transactions=part))
+
+
+def child_write(writer: str, rows: int, members: int, path: str) -> dict:
+    from epfo_excel import write_member_workbook
+    from synthetic_passbook import consolidated_result
+
+    _, result = consolidated_result(rows)
+    before = peak_rss_mb()
+    start = time.perf_counter()
+    if writer == "member":
+        write_member_workbook(result, path)
+    elif writer == "batch":
+        write_batch(result, path, members)
+    else:
+        write_pandas(result, path)
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": elapsed,
+        "rss_mb": peak_rss_mb() - before,
+        "size_mb": os.path.getsize(path) / 2**20,
+    }
+
+
+def run_child(*args) -> dict:
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", *map(str, args)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        _, _, writer, rows, members, path = sys.argv
+        print(json.dumps(child_write(writer, int(rows), int(members), path)))
+        return
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument(
+        "--rows", type=int, nargs="+", default=[100_000, 1_000_000],
+        help="Transaction counts to write (default: %(default)s)",
+    )
+    arg_parser.add_argument(
+        "--members", type=int, default=1000, help="Members the batch workbook's rows are spread over"
+    )
+    arg_parser.add_argument(
+        "--writers", nargs="+", choices=WRITERS, default=list(WRITERS), help="Writers to run"
+    )
+    args = arg_parser.parse_args()
+
+    writers = list(args.writers)
+    if "pandas" in writers:
+        try:
+            import pandas  # noqa: F401
+        except ImportError:
+            print("pandas not installed: skipping the pandas writer")
+            writers.remove("pandas")
+
+    print(f"{'writer':<8} {'rows':>10} {'write s':>8} {'rows/s':>9} {'peak MB':>8} {'size MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            for writer in writers:
+                path = os.path.join(tmp, f"{writer}-{rows}.xlsx")
+                res = run_child(writer, rows, args.members, path)
+                print(
+                    f"{writer:<8} {rows:>10,} {res['seconds']:8.2f} {rows / res['seconds']:9.0f}"
+                    f" {res['rss_mb']:8.1f} {res['size_mb']:8.1f}"
+                )
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Time-limited benchmark of the text extractors on fixtures and pathological inputs.
+
+Runs clean_text, extract_member_info_from_text, extract_balances_from_text,
+extract_transactions_from_text and extract_transfer_transactions (on each
+transaction line) one at a time, in a worker process that is killed when a run
+exceeds --time-limit:
+
+- on the cleaned-text fixtures in benchmarks/fixtures/text, checking each result
+  against the fixture's .expected.json snapshot (--update-fixtures rewrites them);
+- on every pathological_text generator at growing sizes, estimating how run time
+  scales with input size.
+
+Exits non-zero if a run times out, a fixture result changed, or an extractor scales
+worse than --max-exponent (1 is linear, 2 quadratic) on a pathological input, so
+catastrophic backtracking is caught before it reaches real passbooks.
+
+Usage: python benchmarks/bench_extractors.py [--sizes N ...] [--time-limit S] [--update-fixtures]
+"""
+import argparse
+import glob
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from epfo_parser_final import TRANSACTION_SPLIT_RE, EPFOMultiYearParser  # noqa: E402
+from pathological_text import GENERATORS  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "text")
+YEAR = "2023"
+
+
+def transfer_transactions(parser, text):
+    transactions = []
+    for line in TRANSACTION_SPLIT_RE.split(text):
+        parser.extract_transfer_transactions(line.strip(), YEAR, transactions)
+    return transactions
+
+
+EXTRACTORS = {
+    "clean_text": lambda parser, text: parser.clean_text(text),
+    "member_info": lambda parser, text: parser.extract_member_info_from_text(text),
+    "balances": lambda parser, text: parser.extract_balances_from_text(text, YEAR),
+    "transactions": lambda parser, text: parser.extract_transactions_from_text(text, YEAR),
+    "transfers": transfer_transactions,
+}
+
+
+def case_text(case: str, size: int) -> str:
+    """Input of a case: a fixture file, or a pathological generator's text at the given size."""
+    if case in GENERATORS:
+        return GENERATORS[case](size)
+    with open(os.path.join(FIXTURE_DIR, case + ".txt"), encoding="utf-8") as f:
+        return f.read()
+
+
+def run_case(extractor: str, case: str, size: int, repeat: int):
+    """Worker: best-of-repeat seconds and the result of one extractor on one input."""
+    parser = EPFOMultiYearParser()
+    text = case_text(case, size)
+    # Every extractor but clean_text sees cleaned text, as in the parser
+    if extractor != "clean_text":
+        text = parser.clean_text(text)
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = EXTRACTORS[extractor](parser, text)
+        best = min(best, time.perf_counter() - start)
+    return best, len(text), result
+
+
+class LimitedRunner:
+    """Runs cases in a single worker process, replacing it when a case overruns."""
+
+    def __init__(self, time_limit: float):
+        self.time_limit = time_limit
+        self.pool = multiprocessing.Pool(1)
+
+    def run(self, *args):
+        """(seconds, size, result), or None if the case ran past the time limit."""
+        pending = self.pool.apply_async(run_case, args)
+        try:
+            return pending.get(timeout=self.time_limit)
+        except multiprocessing.TimeoutError:
+            self.pool.terminate()
+            self.pool = multiprocessing.Pool(1)
+            return None
+
+    def close(self):
+        self.pool.terminate()
+
+
+def check_fixtures(runner: LimitedRunner, repeat: int, update: bool) -> int:
+    failures = 0
+    fixtures = sorted(
+        os.path.basename(path)[:-4] for path in glob.glob(os.path.join(FIXTURE_DIR, "*.txt"))
+    )
+    print(f"{'fixture':<28} {'extractor':<13} {'KB':>7} {'ms':>9}  result")
+    for fixture in fixtures:
+        expected_path = os.path.join(FIXTURE_DIR, fixture + ".expected.json")
+        expected = {}
+        if os.path.exists(expected_path) and not update:
+            with open(expected_path, encoding="utf-8") as f:
+                expected = json.load(f)
+        results = {}
+        for extractor in EXTRACTORS:
+            outcome = runner.run(extractor, fixture, 0, repeat)
+            if outcome is None:
+                failures += 1
+                print(f"{fixture:<28} {extractor:<13} {'':>7} {'':>9}  TIMEOUT")
+                continue
+            seconds, size, result = outcome
+            results[extractor] = json.loads(json.dumps(result))
+            if update:
+                status = "updated"
+            elif extractor not in expected:
+                status = "no snapshot"
+            elif results[extractor] == expected[extractor]:
+                status = "ok"
+            else:
+                status = "CHANGED"
+                failures += 1
+            print(f"{fixture:<28} {extractor:<13} {size / 1024:7.1f} {seconds * 1000:9.3f}  {status}")
+        if update:
+            with open(expected_path, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=1, ensure_ascii=False, sort_keys=True)
+                f.write("\n")
+    return failures
+
+
+def check_scaling(runner: LimitedRunner, sizes, repeat: int, max_exponent: float) -> int:
+    failures = 0
+    print(
+        f"\n{'pathological input':<28} {'extractor':<13} "
+        + " ".join(f"{f'n={size}':>10}" for size in sizes)
+        + f" {'exponent':>9}"
+    )
+    for case in GENERATORS:
+        for extractor in EXTRACTORS:
+            timings = []
+            for size in sizes:
+                outcome = runner.run(extractor, case, size, repeat)
+                if outcome is None:
+                    break
+                timings.append(outcome[:2])
+            cells = [f"{seconds * 1000:8.2f}ms" for seconds, _ in timings]
+            if len(timings) < len(sizes):
+                cells.append(f"{'TIMEOUT':>10}")
+            cells += [f"{'':>10}"] * (len(sizes) - len(cells))
+            status = ""
+            if len(timings) < len(sizes):
+                failures += 1
+                exponent = ""
+            else:
+                (t0, n0), (t1, n1) = timings[0], timings[-1]
+                # Below a millisecond, timer noise dominates the ratio
+                value = math.log(t1 / t0) / math.log(n1 / n0) if t1 >= 1e-3 else 0.0
+                exponent = f"{value:.2f}" if t1 >= 1e-3 else "-"
+                if value > max_exponent:
+                    failures += 1
+                    status = "  NON-LINEAR"
+            print(f"{case:<28} {extractor:<13} {' '.join(cells)} {exponent:>9}{status}")
+    return failures
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[500, 2000, 8000],
+        help="Repeat counts passed to each pathological generator",
+    )
+    arg_parser.add_argument(
+        "--time-limit", type=float, default=5.0, help="Seconds allowed per run (default: %(default)s)"
+    )
+    arg_parser.add_argument(
+        "--max-exponent", type=float, default=1.5,
+        help="Highest acceptable growth exponent of run time with input size (default: %(default)s)",
+    )
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the best is kept")
+    arg_parser.add_argument(
+        "--update-fixtures", action="store_true",
+        help="Rewrite the fixtures' .expected.json snapshots from the current parser",
+    )
+    args = arg_parser.parse_args()
+
+    runner = LimitedRunner(args.time_limit)
+    try:
+        failures = check_fixtures(runner, args.repeat, args.update_fixtures)
+        failures += check_scaling(runner, sorted(args.sizes), args.repeat, args.max_exponent)
+    finally:
+        runner.close()
+    if failures:
+        print(f"\n{failures} failure(s)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+End-to-end latency of an interactive run on a 20-year synthetic member.
+
+Writes one synthetic passbook PDF per year, then times the stages of
+`epfoparser parse`: parsing the folder, writing the consolidated JSON, and
+rendering the console report either from the file just written
+(display_epfo_console, the previous JSON round trip) or straight from the parsed
+result (display_epfo_result). Console output is discarded.
+
+Usage: python benchmarks/bench_handoff.py [--years N] [--rows-per-year N] [--repeat R]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from display_epfo import display_epfo_console, display_epfo_result  # noqa: E402
+from epfo_parser_final import EPFOMultiYearParser, write_consolidated_json  # noqa: E402
+from synthetic_passbook import write_passbook_pdf  # noqa: E402
+
+MEMBER_ID = "MHBAN00123450000012345"
+
+
+def best_of(repeat, func):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--years", type=int, default=20, help="Passbook years")
+    arg_parser.add_argument("--rows-per-year", type=int, default=12, help="Transactions per year")
+    arg_parser.add_argument("--backend", default="pdfminer", help="Extraction backend")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Timed runs (best is reported)")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = os.path.join(tmp, MEMBER_ID)
+        os.makedirs(folder)
+        for year in range(2024 - args.years + 1, 2025):
+            write_passbook_pdf(
+                os.path.join(folder, f"{MEMBER_ID}_{year}.pdf"), year, args.rows_per_year,
+                seed=year,
+            )
+
+        parser = None
+
+        def parse():
+            nonlocal parser
+            parser = EPFOMultiYearParser(backend=args.backend)
+            parser.process_member_folder(folder)
+
+        parse_time = best_of(args.repeat, parse)
+        result = parser.consolidated_data
+        write_time = best_of(args.repeat, lambda: write_consolidated_json(result, tmp))
+        json_path = write_consolidated_json(result, tmp)
+        file_time = best_of(args.repeat, lambda: display_epfo_console(json_path))
+        memory_time = best_of(args.repeat, lambda: display_epfo_result(parser))
+
+        rows = len(result["all_transactions"])
+        print(f"{args.years} years, {rows:,} transactions")
+        print(f"  parse folder            {parse_time * 1000:8.1f} ms")
+        print(f"  write JSON              {write_time * 1000:8.1f} ms")
+        print(f"  display from file       {file_time * 1000:8.1f} ms")
+        print(f"  display from memory     {memory_time * 1000:8.1f} ms")
+        before = parse_time + write_time + file_time
+        after = parse_time + write_time + memory_time
+        print(
+            f"  end to end: {before * 1000:.1f} ms via file, {after * 1000:.1f} ms in memory"
+            f" ({(before - after) / before:.1%} less)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Import-time budget for the parser, backend and display modules.
+
+Each module is imported in a fresh interpreter under `python -X importtime` and its
+cumulative import time (best of R runs) is checked against a budget. The heavy
+dependencies (pdfplumber, pdfminer, reportlab, tabulate, multiprocessing) must
+not be imported at all: they are loaded on the code path that needs them. Exits
+non-zero if a module is over budget or pulls in one of them.
+
+Usage: python benchmarks/bench_importtime.py [--budget-ms MS] [--repeat R]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ("epfo_parser_final", "epfo_backends", "epfo_cache", "display_epfo")
+DEFERRED = ("pdfplumber", "pdfminer", "reportlab", "tabulate", "multiprocessing")
+
+
+def import_profile(module):
+    """Return ({imported module: cumulative µs}, cumulative µs of `module`)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    imported = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imported[name.strip()] = int(cumulative)
+    return imported, imported[module]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument(
+        "--budget-ms", type=float, default=150.0,
+        help="Maximum cumulative import time per module (default: %(default)s)",
+    )
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Runs per module (best is reported)")
+    args = arg_parser.parse_args()
+
+    failures = 0
+    for module in MODULES:
+        best = float("inf")
+        for _ in range(args.repeat):
+            imported, cumulative = import_profile(module)
+            best = min(best, cumulative / 1000)
+        heavy = sorted(
+            name for name in imported if name.split(".")[0] in DEFERRED
+        )
+        over = best > args.budget_ms
+        failures += over + bool(heavy)
+        print(
+            f"{module:<20} {best:7.1f} ms  {'OVER BUDGET' if over else 'ok':<11}"
+            f"  {'imports ' + ', '.join(heavy[:3]) if heavy else ''}"
+        )
+
+    if failures:
+        print(f"{failures} import-time check(s) failed (budget {args.budget_ms:g} ms)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
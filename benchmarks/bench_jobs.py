@@ -0,0 +1,76 @@
+"""
+Serial versus parallel (--jobs) parsing of one member folder.
+
+Writes a synthetic member with one passbook PDF per year, parses it serially and
+with process_member_folder(jobs=N), and checks the consolidated results are
+identical (apart from the extraction timestamp). Exits non-zero if any differs.
+
+Usage: python benchmarks/bench_jobs.py [--years N] [--rows-per-year N] [--jobs N ...]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from epfo_backends import BACKENDS  # noqa: E402
+from epfo_parser_final import EPFOMultiYearParser, _json_default  # noqa: E402
+from synthetic_passbook import write_passbook_pdf  # noqa: E402
+
+MEMBER_ID = "MHBAN00123450000012345"
+
+
+def comparable(result):
+    """The result as plain JSON data, without the run-dependent timestamp."""
+    data = json.loads(json.dumps(result, default=_json_default))
+    data["extraction_metadata"].pop("extracted_at")
+    return data
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--years", type=int, default=20, help="Passbook years")
+    arg_parser.add_argument("--rows-per-year", type=int, default=200, help="Transactions per year")
+    arg_parser.add_argument("--jobs", type=int, nargs="+", default=[2, 4, os.cpu_count() or 1])
+    arg_parser.add_argument("--backend", choices=sorted(BACKENDS), default="pdfplumber")
+    arg_parser.add_argument("--mode", default="text", help="Extraction mode")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = os.path.join(tmp, MEMBER_ID)
+        os.makedirs(folder)
+        for year in range(2024 - args.years + 1, 2025):
+            write_passbook_pdf(
+                os.path.join(folder, f"{MEMBER_ID}_{year}.pdf"), year, args.rows_per_year,
+                seed=year,
+            )
+
+        def run(jobs):
+            parser = EPFOMultiYearParser(backend=args.backend, mode=args.mode)
+            start = time.perf_counter()
+            result = parser.process_member_folder(folder, jobs=jobs)
+            return time.perf_counter() - start, comparable(result)
+
+        serial_time, reference = run(1)
+        print(f"{args.years} PDFs, {len(reference['all_transactions']):,} transactions")
+        print(f"  jobs=1   {serial_time:7.2f} s")
+        mismatches = 0
+        for jobs in sorted({jobs for jobs in args.jobs if jobs > 1}):
+            elapsed, result = run(jobs)
+            same = result == reference
+            mismatches += not same
+            print(
+                f"  jobs={jobs:<3} {elapsed:7.2f} s  {serial_time / elapsed:4.1f}x"
+                f"  identical: {same}"
+            )
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Write/read time and peak RSS of the consolidated output layouts.
+
+Compares the previous output path (json.dump with indent=2, read back with json.load)
+against the streamed indented JSON, compact JSON (--compact) and NDJSON layouts of
+write_consolidated_json, plain and gzipped, read back with display_epfo.iter_transactions.
+Every write and read runs in its own process so peak RSS (ru_maxrss) is measured per
+operation; the figure shown is the growth over the process's RSS before the operation
+started.
+
+Usage: python benchmarks/bench_json_io.py [--rows N]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+VARIANTS = ("indent", "json", "compact", "ndjson", "json.gz", "compact.gz", "ndjson.gz")
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child_write(variant: str, rows: int, out_dir: str):
+    from epfo_parser_final import _json_default, write_consolidated_json
+    from synthetic_passbook import consolidated_result
+
+    _, result = consolidated_result(rows)
+    before = peak_rss_mb()
+    start = time.perf_counter()
+    if variant == "indent":
+        path = os.path.join(out_dir, "indent.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False, default=_json_default)
+    else:
+        output_format, _, gz = variant.partition(".")
+        compact = output_format == "compact"
+        path = write_consolidated_json(
+            result, out_dir, "json" if compact else output_format, compress=bool(gz),
+            compact=compact,
+        )
+    elapsed = time.perf_counter() - start
+    return {"path": path, "seconds": elapsed, "rss_mb": peak_rss_mb() - before}
+
+
+def child_read(variant: str, path: str):
+    from display_epfo import iter_transactions, load_consolidated_header
+
+    before = peak_rss_mb()
+    start = time.perf_counter()
+    if variant == "indent":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        count = sum(1 for _ in data["all_transactions"])
+    else:
+        load_consolidated_header(path)
+        count = sum(1 for _ in iter_transactions(path))
+    elapsed = time.perf_counter() - start
+    return {"seconds": elapsed, "rss_mb": peak_rss_mb() - before, "count": count}
+
+
+def run_child(*args) -> dict:
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", *map(str, args)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        _, _, action, variant, *rest = sys.argv
+        if action == "write":
+            print(json.dumps(child_write(variant, int(rest[0]), rest[1])))
+        else:
+            print(json.dumps(child_read(variant, rest[0])))
+        return
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--rows", type=int, default=100_000, help="Passbook rows to generate")
+    args = arg_parser.parse_args()
+
+    print(f"{'layout':<10} {'write s':>8} {'write MB':>9} {'read s':>8} {'read MB':>8} {'size MB':>8}  rows")
+    with tempfile.TemporaryDirectory() as tmp:
+        for variant in VARIANTS:
+            out_dir = os.path.join(tmp, variant)
+            os.makedirs(out_dir)
+            written = run_child("write", variant, args.rows, out_dir)
+            read = run_child("read", variant, written["path"])
+            size = os.path.getsize(written["path"]) / 2**20
+            print(
+                f"{variant:<10} {written['seconds']:8.2f} {written['rss_mb']:9.1f}"
+                f" {read['seconds']:8.2f} {read['rss_mb']:8.1f} {size:8.1f}  {read['count']:,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Page-parallel extraction (--page-jobs) of one long single-year passbook.
+
+Writes a synthetic passbook with many pages, parses it with page_jobs=1 and with
+each requested worker count, and checks the parsed year is identical. Exits
+non-zero on a mismatch.
+
+Usage: python benchmarks/bench_page_jobs.py [--rows N] [--page-jobs N ...] [--backend NAME]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from epfo_backends import BACKENDS, get_backend  # noqa: E402
+from epfo_parser_final import EXTRACTION_MODES, EPFOMultiYearParser, _json_default  # noqa: E402
+from synthetic_passbook import write_passbook_pdf  # noqa: E402
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--rows", type=int, default=3000, help="Transaction rows in the passbook")
+    arg_parser.add_argument("--page-jobs", type=int, nargs="+", default=[2, 4, os.cpu_count() or 1])
+    arg_parser.add_argument("--backend", choices=sorted(BACKENDS), default="pdfminer")
+    arg_parser.add_argument("--mode", choices=EXTRACTION_MODES, default="text")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = write_passbook_pdf(
+            os.path.join(tmp, "MHBAN00123450000012345_2023.pdf"), 2023, args.rows
+        )
+        pages = get_backend(args.backend).page_count(pdf_path)
+
+        def run(page_jobs):
+            parser = EPFOMultiYearParser(backend=args.backend, mode=args.mode, page_jobs=page_jobs)
+            start = time.perf_counter()
+            parsed = parser.parse_pdf(pdf_path, "2023")
+            return time.perf_counter() - start, json.dumps(parsed, default=_json_default)
+
+        serial_time, reference = run(1)
+        print(f"{args.rows:,} rows, {pages} pages ({os.cpu_count()} CPUs)")
+        print(f"  page_jobs=1   {serial_time:7.2f} s")
+        mismatches = 0
+        for page_jobs in sorted({jobs for jobs in args.page_jobs if jobs > 1}):
+            elapsed, parsed = run(page_jobs)
+            same = parsed == reference
+            mismatches += not same
+            print(
+                f"  page_jobs={page_jobs:<3} {elapsed:7.2f} s  {serial_time / elapsed:4.1f}x"
+                f"  identical: {same}"
+            )
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Parquet export throughput and partition-pruned read time of the --parquet dataset.
+
+Builds a synthetic consolidated result of --rows transactions over --years passbook
+years, spreads it over --members members (in --establishments establishments) and
+exports them through epfo_parquet.ParquetExporter as `epfoparser batch --parquet`
+does. Then reads the transactions back with epfo_parquet.open_dataset: one year
+(only that year's partitions are opened) and the whole table.
+
+Usage: python benchmarks/bench_parquet.py [--rows N] [--years N] [--members N] [--repeat R]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def member_results(result: dict, members: int, establishments: int):
+    """Yield result split into `members` consolidated results of consecutive transactions."""
+    from epfo_parser_final import TransactionRange
+
+    transactions = result["all_transactions"]
+    per_member = -(-len(transactions) // members)
+    for i in range(members):
+        start = i * per_member
+        establishment_id = f"MHBAN{i % establishments:010d}"
+        member_info = dict(
+            result["member_info"],
+            member_id=f"{establishment_id}{i:07d}",
+            establishment_id=establishment_id,
+        )
+        part = TransactionRange(transactions, start, min(start + per_member, len(transactions)))
+        yield dict(result, member_info=member_info, all_transactions=part)
+
+
+def best_of(repeat: int, run):
+    best, value = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, value
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--rows", type=int, default=1_000_000, help="Transactions to export")
+    arg_parser.add_argument("--years", type=int, default=5, help="Passbook years the rows span")
+    arg_parser.add_argument(
+        "--members", type=int, default=20_000, help="Members the rows are spread over"
+    )
+    arg_parser.add_argument(
+        "--establishments", type=int, default=50, help="Distinct establishments"
+    )
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Timed reads (best is reported)")
+    args = arg_parser.parse_args()
+
+    try:
+        import pyarrow.dataset as ds
+    except ImportError:
+        print("pyarrow not installed: nothing to benchmark")
+        return
+    from epfo_parquet import ParquetExporter, open_dataset
+    from synthetic_passbook import consolidated_result
+
+    start = time.perf_counter()
+    _, result = consolidated_result(args.rows, per_year=-(-args.rows // args.years))
+    rows = len(result["all_transactions"])
+    print(f"built {rows:,} synthetic transactions in {time.perf_counter() - start:.1f} s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        with ParquetExporter(tmp, basename="batch") as exporter:
+            for member in member_results(result, args.members, args.establishments):
+                exporter.add_result(member)
+        elapsed = time.perf_counter() - start
+        size = sum(os.path.getsize(path) for path in exporter.files) / 2**20
+        print(
+            f"export   {elapsed:8.2f} s  {rows / elapsed:9,.0f} rows/s  "
+            f"{len(exporter.files)} files  {size:.1f} MB"
+        )
+
+        year = int(result["yearly_summaries"][0]["year"])
+        dataset = open_dataset(tmp)
+        seconds, table = best_of(
+            args.repeat, lambda: dataset.to_table(filter=ds.field("year") == year)
+        )
+        print(f"read {year} {seconds:8.3f} s  {table.num_rows:>9,} rows")
+        seconds, table = best_of(args.repeat, dataset.to_table)
+        print(f"read all {seconds:8.3f} s  {table.num_rows:>9,} rows")
+
+
+if __name__ == "__main__":
+    main()
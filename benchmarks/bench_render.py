@@ -0,0 +1,62 @@
+"""
+Console rendering time of the tabulate and fast renderers.
+
+Builds consolidated results with 100, 1k and 10k synthetic transactions and times
+display_epfo_result with each renderer, output captured in memory. Also checks the
+two renderers produce the same text. Exits non-zero if they differ.
+
+Usage: python benchmarks/bench_render.py [--rows N ...] [--repeat R]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from display_epfo import RENDERERS, display_epfo_result  # noqa: E402
+from synthetic_passbook import consolidated_result  # noqa: E402
+
+
+def render(result, renderer):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        display_epfo_result(result, renderer=renderer)
+    return out.getvalue()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument(
+        "--rows", type=int, nargs="+", default=[100, 1000, 10000],
+        help="Synthetic transactions per member",
+    )
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Timed runs (best is reported)")
+    args = arg_parser.parse_args()
+
+    mismatches = 0
+    for rows in args.rows:
+        # Spread over 20 years, at least 100 rows per year
+        _, result = consolidated_result(rows, per_year=max(rows // 20, 100))
+        print(f"{len(result['all_transactions']):,} transactions")
+        outputs = {}
+        for renderer in RENDERERS:
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                outputs[renderer] = render(result, renderer)
+                best = min(best, time.perf_counter() - start)
+            print(f"  {renderer:<9} {best * 1000:9.1f} ms")
+        same = len(set(outputs.values())) == 1
+        mismatches += not same
+        print(f"  identical output: {same}")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Local client for `epfoparser serve`: parity, latency and back-pressure.
+
+Starts the service on a free localhost port, checks that parsing a member folder
+and uploading its PDFs both return the same consolidated JSON as an in-process
+parse, then sends a burst of concurrent folder requests and reports throughput,
+latency, how many requests were turned away with 503 by the bounded queue, and the
+service's /metrics. For comparison it also times one `epfoparser parse` run as a
+fresh process. Exits non-zero on a parity mismatch. Works fully offline.
+
+Usage: python benchmarks/bench_service.py [--requests N] [--concurrency C] [--workers W] [--queue-size Q]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from epfo_parser_final import EPFOMultiYearParser, _json_default  # noqa: E402
+from synthetic_passbook import write_passbook_pdf  # noqa: E402
+
+MEMBER_ID = "MHBAN00123450000012345"
+
+
+def request(base, path, data=None, content_type=None):
+    headers = {"Content-Type": content_type} if content_type else {}
+    req = urllib.request.Request(base + path, data=data, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=600) as resp:
+            return resp.status, resp.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def multipart(paths):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for path in paths:
+        with open(path, "rb") as f:
+            parts.append(
+                f"--{boundary}\r\nContent-Disposition: form-data; name=\"files\"; "
+                f"filename=\"{os.path.basename(path)}\"\r\nContent-Type: application/pdf\r\n\r\n"
+                .encode() + f.read() + b"\r\n"
+            )
+    body = b"".join(parts) + f"--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def comparable(data):
+    data = json.loads(json.dumps(data, default=_json_default))
+    data["extraction_metadata"].pop("extracted_at")
+    # Uploaded PDFs are written to a temporary folder, so their mtimes differ
+    for source in data["extraction_metadata"].get("source_files", {}).values():
+        source.pop("mtime")
+    return data
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--requests", type=int, default=40, help="Requests in the burst")
+    arg_parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients")
+    arg_parser.add_argument("--workers", type=int, default=2, help="Service worker processes")
+    arg_parser.add_argument(
+        "--queue-size", type=int, default=8,
+        help="Service queue size (below --concurrency, some requests get 503)",
+    )
+    arg_parser.add_argument("--years", type=int, default=5, help="Passbook years per member")
+    arg_parser.add_argument("--backend", default="pdfminer", help="Extraction backend")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = os.path.join(tmp, MEMBER_ID)
+        os.makedirs(folder)
+        pdfs = [
+            write_passbook_pdf(os.path.join(folder, f"{MEMBER_ID}_{year}.pdf"), year, 12, seed=year)
+            for year in range(2024 - args.years + 1, 2025)
+        ]
+        expected = comparable(
+            EPFOMultiYearParser(backend=args.backend).process_member_folder(folder)
+        )
+
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, os.path.join(ROOT, "epfo_parser_final.py"), "parse", folder,
+             tmp, "--no-cache", "--backend", args.backend],
+            check=True, capture_output=True,
+        )
+        cli_time = time.perf_counter() - start
+
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "epfo_parser_final.py"), "serve", "--port", "0",
+             "--workers", str(args.workers), "--queue-size", str(args.queue_size),
+             "--no-cache", "--backend", args.backend],
+            stdout=subprocess.PIPE, text=True,
+        )
+        try:
+            line = server.stdout.readline()
+            base = "http://" + line.split("http://")[1].split()[0]
+
+            failures = 0
+            status, body = request(
+                base, "/parse", json.dumps({"folder": folder}).encode(), "application/json"
+            )
+            same_folder = status == 200 and comparable(json.loads(body)) == expected
+            status, body = request(base, "/parse", *multipart(pdfs))
+            same_upload = status == 200 and comparable(json.loads(body)) == expected
+            failures += (not same_folder) + (not same_upload)
+            print(f"folder request parity: {same_folder}, upload parity: {same_upload}")
+
+            def timed_request(_):
+                begin = time.perf_counter()
+                status, _ = request(
+                    base, "/parse", json.dumps({"folder": folder}).encode(), "application/json"
+                )
+                return status, time.perf_counter() - begin
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as clients:
+                outcomes = list(clients.map(timed_request, range(args.requests)))
+            elapsed = time.perf_counter() - start
+
+            ok = sorted(latency for status, latency in outcomes if status == 200)
+            rejected = sum(status == 503 for status, _ in outcomes)
+            print(
+                f"{args.requests} requests, {args.concurrency} clients, {args.workers} workers, "
+                f"queue {args.queue_size}: {len(ok)} ok, {rejected} rejected (503) in {elapsed:.2f} s"
+            )
+            if ok:
+                print(
+                    f"  client latency p50 {ok[len(ok) // 2] * 1000:.0f} ms, "
+                    f"max {ok[-1] * 1000:.0f} ms; {len(ok) / elapsed:.1f} parses/s"
+                )
+            print(f"  one-off CLI run for comparison: {cli_time * 1000:.0f} ms")
+            print("metrics:", request(base, "/metrics")[1].decode())
+        finally:
+            server.terminate()
+            server.wait()
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Memory and speed of TransactionStore versus a list of per-row dicts.
+
+Parses synthetic passbook text into transaction dicts (as the parser produces them)
+and measures, with tracemalloc, what holding them costs as a list of dicts and as a
+TransactionStore. Also times column sums and checks the dict round trip is lossless.
+
+Usage: python benchmarks/bench_store.py [--rows N] [--repeat R]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from epfo_parser_final import (  # noqa: E402
+    EPFOMultiYearParser,
+    InternTable,
+    TRANSACTION_AMOUNT_FIELDS,
+    TransactionStore,
+)
+from synthetic_passbook import passbook_text  # noqa: E402
+
+ROWS_PER_YEAR = 5000
+
+
+def parse_years(parser, rows):
+    """Yield per-year lists of freshly parsed transaction dicts, `rows` in total."""
+    year = 2000
+    while rows > 0:
+        count = min(rows, ROWS_PER_YEAR)
+        yield parser.extract_transactions_from_text(passbook_text(year, count, seed=year), str(year))
+        rows -= count
+        year += 1
+
+
+def traced(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--rows", type=int, default=200_000, help="Transactions to hold")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Timed runs (best is reported)")
+    args = arg_parser.parse_args()
+
+    parser = EPFOMultiYearParser()
+
+    def build_list():
+        rows = []
+        for year_rows in parse_years(parser, args.rows):
+            rows.extend(year_rows)
+        return rows
+
+    def build_store():
+        store = TransactionStore(InternTable())
+        for year_rows in parse_years(parser, args.rows):
+            store.extend(year_rows)
+        return store
+
+    rows, list_bytes = traced(build_list)
+    store, store_bytes = traced(build_store)
+    count = len(rows)
+    print(f"transactions: {count:,}")
+    print(f"  list of dicts    {list_bytes / 2**20:8.1f} MB  {list_bytes / count:7.1f} B/row")
+    print(f"  TransactionStore {store_bytes / 2**20:8.1f} MB  {store_bytes / count:7.1f} B/row"
+          f"  ({list_bytes / store_bytes:.1f}x smaller)")
+
+    def timed(func):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    loop_time = timed(lambda: {
+        field: sum(row.get(field, 0) for row in rows) for field in TRANSACTION_AMOUNT_FIELDS
+    })
+    sums_time = timed(store.column_sums)
+    print(f"column sums: dict loop {loop_time * 1000:.1f} ms, store {sums_time * 1000:.1f} ms")
+
+    lossless = store.to_dicts() == rows and list(store.column_sums().values()) == [
+        sum(row.get(field, 0) for row in rows) for field in TRANSACTION_AMOUNT_FIELDS
+    ]
+    print(f"round trip lossless: {lossless}")
+    if not lossless:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
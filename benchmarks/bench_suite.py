@@ -0,0 +1,179 @@
+"""
+Benchmark suite: parse, consolidation and display on a synthetic passbook corpus.
+
+Writes a deterministic corpus of member folders with synthetic_passbook, then runs
+each scenario (extraction backend, mode and streaming) in its own process: every
+member folder is parsed with process_member_folder and rendered with
+display_epfo_result (output discarded) while the stage profiler is on. For each
+scenario it reports PDFs/s and transactions/s, peak RSS and the per-stage timings.
+
+Results are saved as JSON with --output; --baseline compares a run against an
+earlier results file and exits non-zero if any scenario's throughput dropped by
+more than --tolerance (or a scenario's transaction count changed).
+
+Usage: python benchmarks/bench_suite.py [--members N] [--years N] [--rows N] [--scenarios NAME ...] [--output FILE] [--baseline FILE]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# name -> EPFOMultiYearParser options
+SCENARIOS = {
+    "pdfplumber": {"backend": "pdfplumber"},
+    "pdfminer": {"backend": "pdfminer"},
+    "pdfminer-stream": {"backend": "pdfminer", "streaming": True},
+    "pdfminer-columns": {"backend": "pdfminer", "mode": "columns"},
+}
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child_run(scenario: str, corpus: str) -> dict:
+    from display_epfo import display_epfo_result
+    from epfo_parser_final import EPFOMultiYearParser, find_member_folders
+    from epfo_profile import PROFILER
+
+    folders = find_member_folders(corpus)
+    rss_before = peak_rss_mb()
+    PROFILER.enabled = True
+    pdfs = transactions = 0
+    parse_seconds = render_seconds = 0.0
+    for folder in folders:
+        parser = EPFOMultiYearParser(**SCENARIOS[scenario])
+        start = time.perf_counter()
+        result = parser.process_member_folder(str(folder))
+        parse_seconds += time.perf_counter() - start
+        pdfs += result["extraction_metadata"]["total_files_processed"]
+        transactions += len(result["all_transactions"])
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            display_epfo_result(result)
+        render_seconds += time.perf_counter() - start
+    return {
+        "members": len(folders),
+        "pdfs": pdfs,
+        "transactions": transactions,
+        "parse_seconds": round(parse_seconds, 4),
+        "render_seconds": round(render_seconds, 4),
+        "pdfs_per_s": round(pdfs / parse_seconds, 2),
+        "transactions_per_s": round(transactions / parse_seconds, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "rss_growth_mb": round(peak_rss_mb() - rss_before, 1),
+        "stages": PROFILER.summary(),
+    }
+
+
+def run_child(scenario: str, corpus: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", scenario, corpus],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> int:
+    """Print throughput and memory against a baseline results file; return the regression count."""
+    regressions = 0
+    print(f"\nAgainst baseline (tolerance {tolerance:.0%}):")
+    for scenario, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(scenario)
+        if previous is None:
+            print(f"  {scenario:<18} not in baseline")
+            continue
+        ratio = current["pdfs_per_s"] / previous["pdfs_per_s"]
+        slower = ratio < 1 - tolerance
+        changed = current["transactions"] != previous["transactions"]
+        regressions += slower or changed
+        print(
+            f"  {scenario:<18} throughput {ratio:5.2f}x, peak RSS "
+            f"{current['peak_rss_mb'] - previous['peak_rss_mb']:+6.1f} MB"
+            + ("  REGRESSION" if slower else "")
+            + (f"  transactions {previous['transactions']} -> {current['transactions']}" if changed else "")
+        )
+    return regressions
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        print(json.dumps(child_run(sys.argv[2], sys.argv[3])))
+        return
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--members", type=int, default=3, help="Member folders in the corpus")
+    arg_parser.add_argument("--years", type=int, default=5, help="Passbook years per member")
+    arg_parser.add_argument("--rows", type=int, default=200, help="Transactions per year")
+    arg_parser.add_argument(
+        "--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS),
+        help="Parser configurations to run",
+    )
+    arg_parser.add_argument("--output", help="Write the results to this JSON file")
+    arg_parser.add_argument("--baseline", help="Compare against an earlier --output file")
+    arg_parser.add_argument(
+        "--tolerance", type=float, default=0.2,
+        help="Allowed throughput drop against the baseline (default: %(default)s)",
+    )
+    args = arg_parser.parse_args()
+
+    from epfo_parser_final import PARSER_VERSION
+    from synthetic_passbook import write_corpus
+
+    results = {
+        "corpus": {"members": args.members, "years": args.years, "rows_per_year": args.rows},
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "parser_version": PARSER_VERSION,
+        },
+        "scenarios": {},
+    }
+    with tempfile.TemporaryDirectory() as corpus:
+        write_corpus(corpus, args.members, args.years, args.rows, claim_interest=True)
+        print(
+            f"{args.members} members x {args.years} years x {args.rows} rows "
+            f"({os.cpu_count()} CPUs)"
+        )
+        print(
+            f"  {'scenario':<18} {'PDFs/s':>8} {'tx/s':>9} {'parse s':>8} "
+            f"{'render s':>9} {'peak MB':>8}  slowest stages (self time)"
+        )
+        for scenario in args.scenarios:
+            res = results["scenarios"][scenario] = run_child(scenario, corpus)
+            slowest = ", ".join(
+                f"{name} {stat['self_seconds']:.2f}s"
+                for name, stat in list(res["stages"].items())[:3]
+            )
+            print(
+                f"  {scenario:<18} {res['pdfs_per_s']:8.1f} {res['transactions_per_s']:9.0f} "
+                f"{res['parse_seconds']:8.2f} {res['render_seconds']:9.2f} "
+                f"{res['peak_rss_mb']:8.1f}  {slowest}"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
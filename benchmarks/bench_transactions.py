@@ -0,0 +1,39 @@
+"""
+Micro-benchmark for EPFOMultiYearParser.extract_transactions_from_text.
+
+Usage: python benchmarks/bench_transactions.py [--lines N] [--repeat R]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from epfo_parser_final import EPFOMultiYearParser  # noqa: E402
+from synthetic_passbook import passbook_text  # noqa: E402
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--lines", type=int, default=500, help="Transaction rows per passbook")
+    arg_parser.add_argument("--repeat", type=int, default=20, help="Timed runs (best is reported)")
+    args = arg_parser.parse_args()
+
+    parser = EPFOMultiYearParser()
+    text = passbook_text(2023, args.lines)
+    parsed = len(parser.extract_transactions_from_text(text, "2023"))
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        parser.extract_transactions_from_text(text, "2023")
+        best = min(best, time.perf_counter() - start)
+
+    print(f"rows: {args.lines}  transactions parsed: {parsed}")
+    print(f"best of {args.repeat}: {best * 1000:.2f} ms  ->  {args.lines / best:,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
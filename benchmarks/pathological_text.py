@@ -0,0 +1,99 @@
+"""
+Generators of pathological cleaned passbook text for the regex extractors.
+
+Each generator takes a repeat count n and returns text whose length grows linearly
+with n. They aim at the patterns' lazy `.*?` and DOTALL fallbacks: long
+descriptions, rows with missing amounts, labels with no amounts after them, and
+repeated "Int."/transfer keywords. A parser that stays linear on these takes
+proportionally longer as n grows; catastrophic backtracking shows up as a blow-up.
+"""
+from typing import Callable, Dict
+
+ROW = "Apr-2022 15-05-2022"
+
+
+def long_description(n: int) -> str:
+    """One transfer row whose description runs for n words before its amounts."""
+    words = " ".join(f"WORD{i % 97}" for i in range(n))
+    return f"{ROW} CR TRANSFER IN - {words} 0 0 1,000 2,000 3,000 {ROW} CR Cont. For Due-Month 042022 15,000"
+
+
+def long_description_no_amounts(n: int) -> str:
+    """A transfer row whose n-word description is never followed by five amounts."""
+    words = " ".join(f"Old Member {i}" for i in range(n))
+    return f"{ROW} CR TRANSFER IN - {words}"
+
+
+def missing_amounts(n: int) -> str:
+    """n rows of each kind with only two of their five amounts."""
+    rows = []
+    for i in range(n):
+        rows.append(f"{ROW} CR Cont. For Due-Month 042022 15,000 15,000")
+        rows.append(f"{ROW} DR Claim: Against PARA 68J 0 0")
+        rows.append(f"{ROW} CR TRANSFER IN - Old Member Id: MHBAN{i:017d} 0 0")
+    return " ".join(rows)
+
+
+def unclosed_office(n: int) -> str:
+    """An OFFICE( transfer whose parenthesis never closes, with n Old Member Id tokens."""
+    ids = " ".join(f"Old Member Id {i}" for i in range(n))
+    return f"{ROW} CR OFFICE({ids} 0 0 1,000 2,000 3,000"
+
+
+def transfer_keywords(n: int) -> str:
+    """A credit row made of n repetitions of the transfer keywords and no amounts."""
+    return f"{ROW} CR " + "TRANSFER OFFICE Old Member " * n
+
+
+def repeated_int(n: int) -> str:
+    """n bare "Int." tokens, then an interest label with no amounts after it."""
+    return "Int. " * n + "Int. Updated upto 31/03/2023 Interest " * n
+
+
+def labels_without_amounts(n: int) -> str:
+    """Year-total, claim-interest and balance labels with no amounts after them."""
+    return (
+        "Total Contributions for the year [ 2023 ] "
+        "Int. given against Claim: "
+        "OB Int. Updated upto 31/03/2022 "
+        "Closing Balance as on 31/03/2023 "
+    ) * n
+
+
+def member_labels(n: int) -> str:
+    """Member and establishment labels that never have a valid value after them."""
+    return (
+        "Establishment ID/Name MHBAN0012345 "
+        "Member ID/Name MHBAN001 / "
+        "Date of Birth 01-01 UAN 1234 "
+    ) * n
+
+
+def amounts_only(n: int) -> str:
+    """n amounts with no labels or rows around them."""
+    return " ".join(f"{(i * 7919) % 1000000:,}" for i in range(n))
+
+
+def dates_only(n: int) -> str:
+    """n wage-month/date pairs with no type, description or amounts."""
+    return f"{ROW} " * n
+
+
+def raw_hindi(n: int) -> str:
+    """Uncleaned page text: Hindi labels, line breaks and runs of spaces (for clean_text)."""
+    return "सदस्य आईडी Member ID/Name\n   MHBAN00123450000012345 /  TEST   MEMBER\n\t" * n
+
+
+GENERATORS: Dict[str, Callable[[int], str]] = {
+    "long_description": long_description,
+    "long_description_no_amounts": long_description_no_amounts,
+    "missing_amounts": missing_amounts,
+    "unclosed_office": unclosed_office,
+    "transfer_keywords": transfer_keywords,
+    "repeated_int": repeated_int,
+    "labels_without_amounts": labels_without_amounts,
+    "member_labels": member_labels,
+    "amounts_only": amounts_only,
+    "dates_only": dates_only,
+    "raw_hindi": raw_hindi,
+}
@@ -0,0 +1,354 @@
+"""
+Deterministic synthetic EPFO passbook content for benchmarks.
+
+The generated lines follow the layout the regexes in epfo_parser_final expect, and
+the PDFs use the passbook table grid the "columns" extraction mode expects, but they
+contain no real member data. Run as a script to write a corpus of member folders:
+
+Usage: python benchmarks/synthetic_passbook.py OUT_DIR [--members N] [--years N] [--rows N]
+"""
+import argparse
+import os
+import random
+import sys
+import textwrap
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from epfo_parser_final import PASSBOOK_COLUMNS, EPFOMultiYearParser  # noqa: E402
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def _fmt(amount: int) -> str:
+    return f"{amount:,}"
+
+
+MEMBER_ID = "MHBAN00123450000012345"
+# Employee, employer and pension opening balance of a member's first year
+OPENING_BALANCE = (100000, 80000, 50000)
+
+
+def transaction_rows(
+    year: int,
+    count: int,
+    seed: int = 0,
+    transfer_rate: float = 0.05,
+    withdrawal_rate: float = 0.05,
+) -> List[Tuple[str, ...]]:
+    """
+    Return `count` transaction rows for the financial year ending in March of `year`.
+
+    Each row is a tuple of the nine passbook columns: wage month, transaction date,
+    type, particulars, EPF wages, EPS wages, employee, employer and pension share.
+    About transfer_rate of the rows are transfers-in from an old member id and
+    withdrawal_rate are DR claim settlements; the rest are monthly contributions.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        month_idx = (3 + i) % 12
+        wage_year = year - 1 if month_idx >= 3 else year
+        credit_month = (month_idx + 1) % 12
+        credit_year = wage_year + 1 if month_idx == 11 else wage_year
+        month = f"{MONTHS[month_idx]}-{wage_year}"
+        date = f"{rng.randint(10, 28):02d}-{credit_month + 1:02d}-{credit_year}"
+
+        kind = rng.random()
+        if kind < transfer_rate:
+            amounts = [rng.randint(1000, 90000) for _ in range(3)]
+            rows.append((
+                month, date, "CR",
+                f"TRANSFER IN - Old Member Id: MHBAN{rng.randint(0, 10**17 - 1):017d}",
+                "0", "0", _fmt(amounts[0]), _fmt(amounts[1]), _fmt(amounts[2]),
+            ))
+        elif kind < transfer_rate + withdrawal_rate:
+            amounts = [rng.randint(1000, 90000) for _ in range(2)]
+            rows.append((
+                month, date, "DR", "Claim: Against PARA 68J",
+                "0", "0", _fmt(amounts[0]), _fmt(amounts[1]), "0",
+            ))
+        else:
+            wages = rng.randint(15000, 90000)
+            eps_wages = min(wages, 15000)
+            employee = wages * 12 // 100
+            pension = eps_wages * 833 // 10000
+            employer = employee - pension
+            rows.append((
+                month, date, "CR", f"Cont. For Due-Month {month_idx + 1:02d}{wage_year}",
+                _fmt(wages), _fmt(eps_wages), _fmt(employee), _fmt(employer), _fmt(pension),
+            ))
+    return rows
+
+
+def transaction_lines(year: int, count: int, seed: int = 0, **rates) -> List[str]:
+    """Return `count` transaction rows for the financial year ending in March of `year`."""
+    return [" ".join(row) for row in transaction_rows(year, count, seed, **rates)]
+
+
+def _amounts(values) -> str:
+    return " ".join(_fmt(value) for value in values)
+
+
+def year_totals(rows: List[Tuple[str, ...]]) -> Dict[str, List[int]]:
+    """Employee/employer/pension totals of the rows, as the passbook footer prints them."""
+    totals = {"contributions": [0, 0, 0], "transfer_ins": [0, 0, 0], "withdrawals": [0, 0, 0]}
+    for row in rows:
+        if row[2] == "DR":
+            field = "withdrawals"
+        elif row[3].startswith("TRANSFER"):
+            field = "transfer_ins"
+        else:
+            field = "contributions"
+        for i, cell in enumerate(row[6:]):
+            totals[field][i] += int(cell.replace(",", ""))
+    return totals
+
+
+def closing_balance(
+    rows: List[Tuple[str, ...]], opening: Tuple[int, int, int] = OPENING_BALANCE
+) -> Tuple[int, int, int]:
+    """Closing balance after the rows and the year's interest (8% of the opening balance)."""
+    totals = year_totals(rows)
+    return tuple(
+        opening[i] + totals["contributions"][i] + totals["transfer_ins"][i]
+        - totals["withdrawals"][i] + opening[i] * 8 // 100
+        for i in range(3)
+    )
+
+
+def header_lines(
+    year: int,
+    opening: Tuple[int, int, int] = OPENING_BALANCE,
+    member_id: str = MEMBER_ID,
+) -> List[str]:
+    """Member details and opening balance printed above the transaction table."""
+    return [
+        "Establishment ID/Name MHBAN0012345000 / SYNTHETIC SOFTWARE PRIVATE LIMITED",
+        f"Member ID/Name {member_id} / TEST MEMBER",
+        "Date of Birth 01-01-1990 UAN 100000000001",
+        f"OB Int. Updated upto 31/03/{year - 1} {_amounts(opening)}",
+    ]
+
+
+def footer_lines(
+    year: int,
+    rows: List[Tuple[str, ...]],
+    opening: Tuple[int, int, int] = OPENING_BALANCE,
+    claim_interest: bool = False,
+) -> List[str]:
+    """
+    Year totals, interest and closing balance printed below the transaction table.
+
+    The totals are those of `rows`. With claim_interest, an "Int. given against
+    Claim" line for the interest paid out with the year's withdrawals comes first.
+    """
+    totals = year_totals(rows)
+    lines = []
+    if claim_interest:
+        lines.append(
+            f"Int. given against Claim: 31-03-{year} "
+            f"{_amounts(amount // 100 for amount in totals['withdrawals'])}"
+        )
+    return lines + [
+        f"Total Contributions for the year [ {year} ] {_amounts(totals['contributions'])}",
+        f"Total Transfer-Ins/VDRs for the year [ {year} ] {_amounts(totals['transfer_ins'])}",
+        f"Total Withdrawals for the year [ {year} ] {_amounts(totals['withdrawals'])}",
+        f"Int. Updated upto 31/03/{year} {_amounts(amount * 8 // 100 for amount in opening)}",
+        f"Closing Balance as on 31/03/{year} {_amounts(closing_balance(rows, opening))}",
+    ]
+
+
+def passbook_text(year: int, transactions: int, seed: int = 0, **rates) -> str:
+    """Return the cleaned text of a one-year passbook with the given number of rows."""
+    rows = transaction_rows(year, transactions, seed, **rates)
+    return " ".join(
+        header_lines(year) + [" ".join(row) for row in rows] + footer_lines(year, rows)
+    )
+
+
+TABLE_HEADER = (
+    "Wage Month", "Transaction Date", "Type", "Particulars", "EPF Wages",
+    "EPS Wages", "Employee Share", "Employer Share", "Pension",
+)
+# Column start positions come from the parser's passbook grid; the amount columns
+# are right-aligned against the start of the next column
+COLUMN_X = tuple(x for _, x in PASSBOOK_COLUMNS) + (820,)
+RIGHT_ALIGNED = (False, False, False, False, True, True, True, True, True)
+
+
+def write_passbook_pdf(
+    path: str,
+    year: int,
+    transactions: int,
+    seed: int = 0,
+    rows_per_page: int = 40,
+    wrap_particulars: int = 0,
+    opening: Tuple[int, int, int] = OPENING_BALANCE,
+    member_id: str = MEMBER_ID,
+    claim_interest: bool = False,
+    **rates,
+) -> str:
+    """
+    Write a one-year synthetic passbook PDF and return its path.
+
+    Like the real passbook, every table cell is drawn as its own string at a fixed
+    column position, and the table header is repeated on each page. With
+    wrap_particulars > 0, descriptions longer than that many characters wrap onto
+    continuation lines below their row. rates (transfer_rate, withdrawal_rate) are
+    passed to transaction_rows.
+    """
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.pdfgen import canvas
+
+    pdf = canvas.Canvas(path, pagesize=landscape(A4))
+    _, height = landscape(A4)
+    top = height - 30
+    line_height = 12
+
+    def new_page():
+        pdf.showPage()
+        pdf.setFont("Helvetica", 7)
+        draw_table_header(top)
+        return top - line_height
+
+    def draw_table_header(y):
+        for col, label in enumerate(TABLE_HEADER):
+            pdf.drawString(COLUMN_X[col], y, label)
+
+    def draw_row(row, y):
+        particulars = [row[3]]
+        if wrap_particulars:
+            particulars = textwrap.wrap(row[3], wrap_particulars)
+        for col, cell in enumerate(row):
+            if col == 3:
+                for offset, part in enumerate(particulars):
+                    pdf.drawString(COLUMN_X[col], y - offset * line_height, part)
+            elif RIGHT_ALIGNED[col]:
+                pdf.drawRightString(COLUMN_X[col + 1] - 6, y, cell)
+            else:
+                pdf.drawString(COLUMN_X[col], y, cell)
+        return y - len(particulars) * line_height
+
+    pdf.setFont("Helvetica", 7)
+    y = top
+    for line in header_lines(year, opening, member_id):
+        pdf.drawString(COLUMN_X[0], y, line)
+        y -= line_height
+    draw_table_header(y)
+    y -= line_height
+
+    rows = transaction_rows(year, transactions, seed, **rates)
+    for index, row in enumerate(rows):
+        if index and index % rows_per_page == 0:
+            y = new_page()
+        y = draw_row(row, y)
+
+    for line in footer_lines(year, rows, opening, claim_interest):
+        if y < 30:
+            y = new_page()
+        pdf.drawString(COLUMN_X[0], y, line)
+        y -= line_height
+
+    pdf.save()
+    return path
+
+
+def consolidated_result(transactions: int, per_year: int = 5000, seed: int = 0):
+    """
+    Parse synthetic passbook text for consecutive years into a consolidated result.
+
+    `transactions` passbook rows are generated in total, at most `per_year` per
+    financial year starting with 2001. Returns (parser, parser.consolidated_data).
+    """
+    parser = EPFOMultiYearParser()
+    year = 2001
+    while transactions > 0:
+        count = min(transactions, per_year)
+        member_info, balances, rows = parser.parse_pages(
+            [passbook_text(year, count, seed=seed + year)], str(year)
+        )
+        parser.add_year_data(
+            {"year": str(year), "balances": balances, "transactions": rows}, member_info
+        )
+        transactions -= count
+        year += 1
+    parser.consolidate_data()
+    return parser, parser.consolidated_data
+
+
+def write_member_folder(
+    root: str,
+    member_id: str = MEMBER_ID,
+    years: int = 5,
+    transactions: int = 200,
+    seed: int = 0,
+    last_year: int = 2024,
+    **options,
+) -> str:
+    """
+    Write one member folder of <member_id>_<year>.pdf passbooks and return its path.
+
+    Each year's opening balance is the previous year's closing balance, so the
+    member passes the parser's balance continuity check. options are passed to
+    write_passbook_pdf (e.g. claim_interest, transfer_rate, withdrawal_rate).
+    """
+    folder = os.path.join(root, member_id)
+    os.makedirs(folder, exist_ok=True)
+    opening = OPENING_BALANCE
+    for year in range(last_year - years + 1, last_year + 1):
+        year_seed = seed * 10000 + year
+        write_passbook_pdf(
+            os.path.join(folder, f"{member_id}_{year}.pdf"), year, transactions,
+            seed=year_seed, opening=opening, member_id=member_id, **options,
+        )
+        rows = transaction_rows(
+            year, transactions, year_seed,
+            **{k: v for k, v in options.items() if k.endswith("_rate")},
+        )
+        opening = closing_balance(rows, opening)
+    return folder
+
+
+def member_id_for(index: int) -> str:
+    """Synthetic member id number `index` (MHBAN + 17 digits)."""
+    return f"MHBAN{index:017d}"
+
+
+def write_corpus(
+    root: str, members: int = 3, years: int = 5, transactions: int = 200, **options
+) -> List[str]:
+    """Write `members` member folders under root and return their paths."""
+    return [
+        write_member_folder(
+            root, member_id_for(index + 1), years, transactions, seed=index + 1, **options
+        )
+        for index in range(members)
+    ]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("out_dir", help="Directory to write the member folders into")
+    arg_parser.add_argument("--members", type=int, default=3, help="Member folders")
+    arg_parser.add_argument("--years", type=int, default=5, help="Passbook years per member")
+    arg_parser.add_argument("--rows", type=int, default=200, help="Transactions per year")
+    arg_parser.add_argument("--transfer-rate", type=float, default=0.05, help="Share of transfer-in rows")
+    arg_parser.add_argument("--withdrawal-rate", type=float, default=0.05, help="Share of DR withdrawal rows")
+    arg_parser.add_argument(
+        "--claim-interest", action="store_true", help="Add an \"Int. given against Claim\" line each year"
+    )
+    args = arg_parser.parse_args()
+
+    folders = write_corpus(
+        args.out_dir, args.members, args.years, args.rows,
+        transfer_rate=args.transfer_rate, withdrawal_rate=args.withdrawal_rate,
+        claim_interest=args.claim_interest,
+    )
+    for folder in folders:
+        print(folder)
+
+
+if __name__ == "__main__":
+    main()
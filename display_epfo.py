@@ -1,11 +1,208 @@
+import gzip
+import itertools
 import json
-from tabulate import tabulate
+import unicodedata
 from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 
-def display_epfo_console(json_path):
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+from epfo_profile import profiled
+
+RENDERERS = ("tabulate", "fast")
+
+
+def open_consolidated(path):
+    """Open a consolidated output file for reading as text (gzip by .gz suffix)."""
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def _decode_rows(lines, batch_size=1024):
+    """Decode one-object-per-line JSON, a batch of lines per json.loads call."""
+    batch = []
+    for line in lines:
+        if line:
+            batch.append(line)
+            if len(batch) == batch_size:
+                yield from json.loads("[" + ",".join(batch) + "]")
+                batch = []
+    if batch:
+        yield from json.loads("[" + ",".join(batch) + "]")
+
+
+def _iter_consolidated(path):
+    """
+    Yield the header of a consolidated output file, then its transactions one by one.
+
+    The header is every top-level key except all_transactions. The streamed layouts
+    written by epfo_parser_final.dump_consolidated (compact JSON and NDJSON) are read
+    a line at a time; any other JSON (e.g. indented output) is loaded whole.
+    """
+    with open_consolidated(path) as f:
+        first = f.readline()
+        if ".ndjson" in str(path):
+            yield json.loads(first)
+            yield from _decode_rows(line.rstrip() for line in f)
+            return
+
+        line = first.rstrip()
+        if not (line.startswith('{"') and line.endswith((",", "["))):
+            f.seek(0)
+            data = json.load(f)
+            transactions = data.pop("all_transactions", [])
+            yield data
+            yield from transactions
+            return
+
+        header = {}
+        line = line[1:]
+        while line != '"all_transactions":[':
+            header.update(json.loads("{" + line.rstrip(",") + "}"))
+            line = f.readline().rstrip()
+            if not line:
+                raise ValueError(f"Truncated consolidated output: {path}")
+        yield header
+        yield from _decode_rows(
+            itertools.takewhile(
+                lambda line: not line.startswith("]"),
+                (line.rstrip().rstrip(",") for line in f),
+            )
+        )
+
+
+def load_consolidated_header(path):
+    """Read everything but all_transactions from a consolidated output file."""
+    records = _iter_consolidated(path)
+    try:
+        return next(records)
+    finally:
+        records.close()
+
+
+def iter_transactions(path):
+    """Iterate the transactions of a consolidated output file without loading it whole."""
+    records = _iter_consolidated(path)
+    next(records)
+    return records
+
+
+def load_consolidated(path):
+    """Load a consolidated output file (any layout, optionally gzipped) into a dict."""
+    records = _iter_consolidated(path)
+    data = next(records)
+    data["all_transactions"] = list(records)
+    return data
+
+
+@lru_cache(maxsize=4096)
+def _wide_text_width(text):
+    width = last = 0
+    for ch in text:
+        if ch == "\ufe0f":
+            # Emoji presentation selector: the preceding symbol is drawn double width
+            width += 2 - last if last == 1 else 0
+            last = 2
+        elif unicodedata.combining(ch) or ch in "\u200d\ufe0e":
+            continue
+        else:
+            last = 2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1
+            width += last
+    return width
+
+
+def _text_width(text):
+    """Terminal columns taken by text (emoji and CJK characters count double)."""
+    return len(text) if text.isascii() else _wide_text_width(text)
+
+
+def fast_table(rows, headers=(), colalign=(), **_tabulate_options):
+    """
+    Render rows as a fancy_grid style box table, like tabulate(tablefmt="fancy_grid").
+
+    Cells are converted to text and column widths measured in a single pass, with
+    only non-ASCII cells going through the (cached) display width lookup, and the
+    table is returned as one string ready for a single write. Unlike tabulate, no
+    number parsing or per-cell width normalisation is done: cells are expected to
+    be formatted already. Extra tabulate keyword options are accepted and ignored.
+    """
+    headers = list(headers)
+    widths = [_text_width(h) + 2 for h in headers]
+    cells = []
+    for row in rows:
+        row = ["" if c is None else c if isinstance(c, str) else str(c) for c in row]
+        if len(row) > len(widths):
+            widths.extend([0] * (len(row) - len(widths)))
+        row_widths = [_text_width(cell) for cell in row]
+        for i, width in enumerate(row_widths):
+            if width > widths[i]:
+                widths[i] = width
+        cells.append((row, row_widths))
+    aligns = list(colalign) + ["left"] * (len(widths) - len(colalign))
+
+    def rule(left, fill, middle, right):
+        return left + middle.join(fill * (w + 2) for w in widths) + right
+
+    def line(row, row_widths):
+        parts = []
+        for i, width in enumerate(widths):
+            cell = row[i] if i < len(row) else ""
+            fill = width - (row_widths[i] if i < len(row) else 0)
+            align = aligns[i]
+            if align == "right":
+                parts.append(" " * fill + cell)
+            elif align == "center":
+                parts.append(" " * (fill // 2) + cell + " " * (fill - fill // 2))
+            else:
+                parts.append(cell + " " * fill)
+        return "│ " + " │ ".join(parts) + " │"
+
+    out = [rule("╒", "═", "╤", "╕")]
+    if headers:
+        out.append(line(headers, [_text_width(h) for h in headers]))
+        out.append(rule("╞", "═", "╪", "╡"))
+    separator = rule("├", "─", "┼", "┤")
+    for i, (row, row_widths) in enumerate(cells):
+        if i:
+            out.append(separator)
+        out.append(line(row, row_widths))
+    out.append(rule("╘", "═", "╧", "╛"))
+    return "\n".join(out)
+
+
+def display_epfo_console(json_path, max_rows=None, years=None, renderer="tabulate"):
+    """Render a consolidated output file, streaming its transactions from disk."""
+    data = load_consolidated_header(json_path)
+    data["all_transactions"] = iter_transactions(json_path)
+    display_epfo_result(data, max_rows=max_rows, years=years, renderer=renderer)
+
+
+@profiled("console_render")
+def display_epfo_result(result, max_rows=None, years=None, renderer="tabulate"):
+    """
+    Render a consolidated result held in memory.
+
+    result is a consolidated dict (as returned by process_member_folder) or an
+    EPFOMultiYearParser instance, so no JSON round trip is needed after parsing.
+    all_transactions may be a list, a TransactionStore or any iterable of dicts.
+
+    max_rows limits the transactions listed per year and years restricts the
+    yearly summary and transaction details to the given years; yearly totals
+    always cover every transaction of a year.
+
+    renderer selects the table renderer: "tabulate" (fancy_grid) or "fast"
+    (fast_table, the same box layout at a fraction of the cost for large reports).
+    """
+    if renderer == "fast":
+        tabulate = fast_table
+    elif renderer == "tabulate":
+        # Imported here: tabulate is slow to import and only needed for rendering
+        from tabulate import tabulate
+    else:
+        raise ValueError(f"Unknown renderer {renderer!r} (choose from {', '.join(RENDERERS)})")
+
+    data = getattr(result, "consolidated_data", result)
+    selected_years = {str(year) for year in years} if years else None
 
     def fmt(val):
         try:
@@ -13,15 +210,6 @@ def display_epfo_console(json_path):
         except Exception:
             return str(val)
 
-    def unfmt(val):
-        """Remove ₹ and commas for summation"""
-        if val == "-" or val is None:
-            return 0
-        try:
-            return int(str(val).replace("₹", "").replace(",", "").replace("-", "").strip())
-        except:
-            return 0
-
     # --- Header ---
     print("\n" + "🏛️ EPFO ACCOUNT STATEMENT 🏛️".center(100))
     print("=" * 100)
@@ -51,6 +239,8 @@ def display_epfo_console(json_path):
     print("=" * 100)
     summary_rows = []
     for y in data.get("yearly_summaries", []):
+        if selected_years is not None and y["year"] not in selected_years:
+            continue
         summary_rows.append([
             y["year"],
             y["transactions_count"],
@@ -139,67 +329,80 @@ def display_epfo_console(json_path):
     # --- Monthly Transactions (Enhanced) ---
     print("\n" + "🧾 Monthly Transaction Details".center(100))
     print("=" * 100)
+    # Rows keep raw amounts (withdrawals negated); formatting happens at print time
     transactions_by_year = defaultdict(list)
-    
-    for tx in data.get("all_transactions", []):
-        # Handle different transaction types
-        if tx.get("type") == "CR":  # Credit transactions
-            row = [
-                tx.get("month", "-"),
-                tx.get("date", "-"),
-                tx.get("description", "-")[:40] + "..." if len(tx.get("description", "")) > 40 else tx.get("description", "-"),
-                fmt(tx.get("wages", 0)),
-                fmt(tx.get("basic_wages", 0)),
-                fmt(tx.get("employee_contribution", 0)),
-                fmt(tx.get("employer_contribution", 0)),
-                fmt(tx.get("pension_contribution", 0)),
-            ]
-        elif tx.get("type") == "DR":  # Debit/Withdrawal transactions
-            row = [
-                tx.get("month", "-"),
-                tx.get("date", "-"),
-                tx.get("description", "-")[:40] + "..." if len(tx.get("description", "")) > 40 else tx.get("description", "-"),
-                "-",  # No wages for withdrawals
-                "-",  # No basic wages for withdrawals
-                fmt(-tx.get("employee_withdrawal", 0)) if tx.get("employee_withdrawal") else "₹0",
-                fmt(-tx.get("employer_withdrawal", 0)) if tx.get("employer_withdrawal") else "₹0",
-                fmt(-tx.get("pension_withdrawal", 0)) if tx.get("pension_withdrawal") else "₹0",
-            ]
+    totals_by_year = {}
+    hidden_by_year = defaultdict(int)
+
+    transactions = data.get("all_transactions", [])
+    # TransactionStore rows are read faster as plain dicts than through row views
+    if hasattr(transactions, "iter_dicts"):
+        transactions = transactions.iter_dicts()
+    for tx in transactions:
+        year = tx["year"]
+        if selected_years is not None and year not in selected_years:
+            continue
+
+        tx_type = tx.get("type")
+        if tx_type == "CR":  # Credit transactions
+            wages, basic_wages = tx.get("wages", 0), tx.get("basic_wages", 0)
+            amounts = (
+                tx.get("employee_contribution", 0),
+                tx.get("employer_contribution", 0),
+                tx.get("pension_contribution", 0),
+            )
+        elif tx_type == "DR":  # Debit/Withdrawal transactions
+            wages = basic_wages = None  # No wages for withdrawals
+            amounts = (
+                -(tx.get("employee_withdrawal") or 0),
+                -(tx.get("employer_withdrawal") or 0),
+                -(tx.get("pension_withdrawal") or 0),
+            )
         else:  # Unknown transaction type - handle gracefully
-            row = [
-                tx.get("month", "-"),
-                tx.get("date", "-"),
-                tx.get("description", "-")[:40] + "..." if len(tx.get("description", "")) > 40 else tx.get("description", "-"),
-                fmt(tx.get("wages", 0)),
-                fmt(tx.get("basic_wages", 0)),
-                fmt(tx.get("employee_contribution", tx.get("employee_withdrawal", 0))),
-                fmt(tx.get("employer_contribution", tx.get("employer_withdrawal", 0))),
-                fmt(tx.get("pension_contribution", tx.get("pension_withdrawal", 0))),
-            ]
-        
-        transactions_by_year[tx["year"]].append(row)
-
-    for year in sorted(transactions_by_year.keys()):
+            wages, basic_wages = tx.get("wages", 0), tx.get("basic_wages", 0)
+            amounts = (
+                tx.get("employee_contribution", tx.get("employee_withdrawal", 0)),
+                tx.get("employer_contribution", tx.get("employer_withdrawal", 0)),
+                tx.get("pension_contribution", tx.get("pension_withdrawal", 0)),
+            )
+
+        totals = totals_by_year.setdefault(year, [0, 0, 0])
+        for i, amount in enumerate(amounts):
+            if isinstance(amount, int):
+                totals[i] += amount
+
         rows = transactions_by_year[year]
-        
-        # Compute totals (skip wages, basic_wages columns for totals)
-        totals = [0, 0, 0]  # For: Employee, Employer, Pension
-        for row in rows:
-            # Only sum the last 3 columns (employee, employer, pension)
-            for i in range(3):
-                val = unfmt(row[5 + i])  # columns 5, 6, 7
-                totals[i] += val
-
-        # Append a TOTAL row
-        rows.append([
-            "💰 TOTAL", "", "", 
+        if max_rows is not None and len(rows) >= max_rows:
+            hidden_by_year[year] += 1
+            continue
+        description = tx.get("description", "-")
+        if len(description) > 40:
+            description = description[:40] + "..."
+        rows.append((tx.get("month", "-"), tx.get("date", "-"), description, wages, basic_wages, *amounts))
+
+    for year in sorted(totals_by_year):
+        table = [
+            [month, date, description,
+             "-" if wages is None else fmt(wages),
+             "-" if basic_wages is None else fmt(basic_wages),
+             fmt(employee), fmt(employer), fmt(pension)]
+            for month, date, description, wages, basic_wages, employee, employer, pension
+            in transactions_by_year[year]
+        ]
+        if hidden_by_year[year]:
+            table.append(["...", "", f"{hidden_by_year[year]:,} more transaction(s) not shown", "", "", "", "", ""])
+
+        # Append a TOTAL row (net of withdrawals, over every transaction of the year)
+        totals = totals_by_year[year]
+        table.append([
+            "💰 TOTAL", "", "",
             "", "",  # Empty for wages, basic
             fmt(totals[0]), fmt(totals[1]), fmt(totals[2])
         ])
-        
+
         print("\n" + f"📅 Year: {year}".center(100))
         print(tabulate(
-            rows,
+            table,
             headers = [
                 "🗓️ Month",
                 "📅 Date",
@@ -211,7 +414,9 @@ def display_epfo_console(json_path):
                 "🏦 Pension"
             ],
             tablefmt="fancy_grid",
-            colalign=("center", "center", "left", "right", "right", "right", "right", "right")
+            colalign=("center", "center", "left", "right", "right", "right", "right", "right"),
+            # Every cell is already a formatted string; skip tabulate's number sniffing
+            disable_numparse=True,
         ))
 
     # --- Metadata ---
@@ -0,0 +1,294 @@
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+
+from epfo_profile import PROFILER
+
+# pdfplumber and pdfminer are imported by the backends on first use, so importing
+# this module (and the parser) stays cheap for callers that never extract text
+
+# pdfplumber's default extract_text() tolerances, in points
+X_TOLERANCE = 3
+Y_TOLERANCE = 3
+
+# A glyph is (top, x0, x1, text) and a word is (x0, x1, text), in page points
+Char = Tuple[float, float, float, str]
+Word = Tuple[float, float, str]
+# A half-open (start, stop) range of 0-based page numbers
+PageRange = Tuple[int, int]
+
+
+class TextBackend:
+    """
+    Text extraction engine used by EPFOMultiYearParser.
+
+    A backend turns a PDF into the raw text of each page. The parser only ever looks
+    at the cleaned (whitespace-collapsed) text, so a backend must reproduce the
+    reference backend's words in the same order, but not its exact line breaks.
+    Backends also expose each page's glyph positions, from which the positioned word
+    lines used by the "columns" extraction mode are built.
+
+    Every iterator takes an optional page range, so separate processes can each
+    open the PDF and extract a slice of its pages.
+    """
+
+    name = ""
+
+    def warm_up(self):
+        """Import the extraction library now rather than on the first PDF."""
+        from pdfminer import pdfinterp, pdfpage  # noqa: F401
+
+    def page_count(self, pdf_path: str) -> int:
+        """Number of pages in the PDF (walks the page tree without interpreting pages)."""
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfparser import PDFParser
+
+        with open(pdf_path, "rb") as f:
+            return sum(1 for _ in PDFPage.create_pages(PDFDocument(PDFParser(f))))
+
+    def iter_page_texts(
+        self, pdf_path: str, pages: Optional[PageRange] = None
+    ) -> Iterator[str]:
+        """Yield the raw text of each non-empty page, in order."""
+        for chars in self.iter_page_chars(pdf_path, pages):
+            with PROFILER.stage("collate_page", len(chars)):
+                page_text = collate_chars(chars)
+            if page_text:
+                yield page_text
+
+    def iter_page_chars(
+        self, pdf_path: str, pages: Optional[PageRange] = None
+    ) -> Iterator[List[Char]]:
+        """Yield the (top, x0, x1, text) glyphs of each page, in order."""
+        raise NotImplementedError
+
+    def iter_page_lines(
+        self, pdf_path: str, pages: Optional[PageRange] = None
+    ) -> Iterator[List[List[Word]]]:
+        """Yield each non-empty page as top-to-bottom lines of (x0, x1, text) words."""
+        for chars in self.iter_page_chars(pdf_path, pages):
+            with PROFILER.stage("collate_page", len(chars)):
+                lines = chars_to_lines(chars)
+            if lines:
+                yield lines
+
+
+def _select(pages, page_range: Optional[PageRange]):
+    """The pages (a sequence or an iterator) within page_range, or all of them."""
+    if page_range is None:
+        return pages
+    return islice(pages, *page_range)
+
+
+class PdfplumberBackend(TextBackend):
+    """Reference backend: pdfplumber's page.extract_text()."""
+
+    name = "pdfplumber"
+
+    def warm_up(self):
+        import pdfplumber  # noqa: F401
+
+    def iter_page_texts(
+        self, pdf_path: str, pages: Optional[PageRange] = None
+    ) -> Iterator[str]:
+        import pdfplumber
+
+        with PROFILER.stage("pdf_open"):
+            pdf = pdfplumber.open(pdf_path)
+        with pdf:
+            for page in _select(pdf.pages, pages):
+                with PROFILER.stage("extract_page") as stage:
+                    page_text = page.extract_text()
+                    # Release the page's layout and object caches before the next page
+                    page.flush_cache()
+                    stage.nbytes = len(page_text or "")
+                if page_text:
+                    yield page_text
+
+    def iter_page_chars(
+        self, pdf_path: str, pages: Optional[PageRange] = None
+    ) -> Iterator[List[Char]]:
+        import pdfplumber
+
+        with PROFILER.stage("pdf_open"):
+            pdf = pdfplumber.open(pdf_path)
+        with pdf:
+            for page in _select(pdf.pages, pages):
+                with PROFILER.stage("extract_page") as stage:
+                    chars = [(c["top"], c["x0"], c["x1"], c["text"]) for c in page.chars]
+                    page.flush_cache()
+                    stage.nbytes = len(chars)
+                yield chars
+
+
+@lru_cache(maxsize=None)
+def _char_collector_class():
+    """Build the pdfminer glyph-collecting device class (pdfminer is imported lazily)."""
+    from pdfminer.pdfdevice import PDFTextDevice
+    from pdfminer.pdffont import PDFUnicodeNotDefined
+
+    class _CharCollector(PDFTextDevice):
+        """pdfminer device that records each glyph as a (top, x0, x1, text) tuple."""
+
+        def __init__(self, rsrcmgr):
+            super().__init__(rsrcmgr)
+            self.chars: List[Char] = []
+            # (font, cid) -> (text, width); fonts are shared via the resource manager cache
+            self._glyphs: Dict[tuple, Tuple[str, float]] = {}
+
+        def _glyph(self, font, cid: int) -> Tuple[str, float]:
+            try:
+                text = font.to_unichr(cid)
+            except PDFUnicodeNotDefined:
+                text = f"(cid:{cid})"
+            glyph = self._glyphs[(font, cid)] = (text, font.char_width(cid))
+            return glyph
+
+        def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate):
+            glyph = self._glyphs.get((font, cid))
+            if glyph is None:
+                glyph = self._glyph(font, cid)
+            text, width = glyph
+            adv = width * fontsize * scaling
+
+            # Same glyph box pdfminer's LTChar computes for horizontal text
+            a, b, c, d, e, f = matrix
+            bottom = font.get_descent() * fontsize + rise
+            top = bottom + fontsize
+            x0 = c * bottom + e
+            x1 = a * adv + c * top + e
+            y0 = d * bottom + f
+            y1 = b * adv + d * top + f
+            if x1 < x0:
+                x0, x1 = x1, x0
+            self.chars.append((-max(y0, y1), x0, x1, text))
+            return adv
+
+    return _CharCollector
+
+
+def _cluster_lines(chars: List[Char]) -> List[List[Char]]:
+    """Cluster glyphs into lines by top edge (as pdfplumber does), each sorted by x0."""
+    line_of = {}
+    line_count = 0
+    last = None
+    for value in sorted({char[0] for char in chars}):
+        if last is not None and value > last + Y_TOLERANCE:
+            line_count += 1
+        line_of[value] = line_count
+        last = value
+
+    lines: List[List[Char]] = [[] for _ in range(line_count + 1)] if chars else []
+    for char in chars:
+        lines[line_of[char[0]]].append(char)
+    for line in lines:
+        line.sort(key=lambda char: char[1])
+    return lines
+
+
+def collate_chars(chars: List[Char]) -> str:
+    """
+    Join (top, x0, x1, text) glyphs into page text the way pdfplumber does.
+
+    Glyphs are clustered into lines by their top edge, each line is read left to
+    right, and a space is inserted wherever the gap to the previous glyph is wider
+    than X_TOLERANCE.
+    """
+    out = []
+    for line in _cluster_lines(chars):
+        parts = []
+        last_x1 = None
+        for _, x0, x1, text in line:
+            if last_x1 is not None and x0 > last_x1 + X_TOLERANCE:
+                parts.append(" ")
+            parts.append(text)
+            last_x1 = x1
+        out.append("".join(parts))
+    return "\n".join(out)
+
+
+def chars_to_lines(chars: List[Char]) -> List[List[Word]]:
+    """
+    Group (top, x0, x1, text) glyphs into lines of (x0, x1, text) words.
+
+    Words break at whitespace glyphs and wherever the gap to the previous glyph is
+    wider than X_TOLERANCE, so joining a line's words with spaces gives the same
+    tokens as collate_chars.
+    """
+    lines = []
+    for line in _cluster_lines(chars):
+        words = []
+        start = end = None
+        parts = []
+        for _, x0, x1, text in line:
+            if text.isspace() or (parts and x0 > end + X_TOLERANCE):
+                if parts:
+                    words.append((start, end, "".join(parts)))
+                    parts = []
+                if text.isspace():
+                    continue
+            if not parts:
+                start = x0
+            parts.append(text)
+            end = x1
+        if parts:
+            words.append((start, end, "".join(parts)))
+        if words:
+            lines.append(words)
+    return lines
+
+
+class PdfminerBackend(TextBackend):
+    """
+    Fast backend: walks the page content streams' text operators with pdfminer.
+
+    This is the same interpretation step pdfplumber runs, but glyphs are kept as
+    plain tuples instead of LTChar objects and attribute dicts, and lines are
+    assembled directly with pdfplumber's clustering rules. No layout analysis is
+    done, which suits the fixed, machine-generated passbook layout.
+    """
+
+    name = "pdfminer"
+
+    def warm_up(self):
+        _char_collector_class()
+        super().warm_up()
+
+    def iter_page_chars(
+        self, pdf_path: str, pages: Optional[PageRange] = None
+    ) -> Iterator[List[Char]]:
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfparser import PDFParser
+
+        with open(pdf_path, "rb") as f:
+            with PROFILER.stage("pdf_open"):
+                document = PDFDocument(PDFParser(f))
+                rsrcmgr = PDFResourceManager(caching=True)
+                device = _char_collector_class()(rsrcmgr)
+                interpreter = PDFPageInterpreter(rsrcmgr, device)
+            for page in _select(PDFPage.create_pages(document), pages):
+                with PROFILER.stage("extract_page") as stage:
+                    device.chars = []
+                    interpreter.process_page(page)
+                    stage.nbytes = len(device.chars)
+                yield device.chars
+
+
+BACKENDS: Dict[str, Type[TextBackend]] = {
+    PdfplumberBackend.name: PdfplumberBackend,
+    PdfminerBackend.name: PdfminerBackend,
+}
+DEFAULT_BACKEND = PdfplumberBackend.name
+
+
+def get_backend(name: str) -> TextBackend:
+    """Return a new instance of the named text extraction backend."""
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown extraction backend {name!r} (choose from {', '.join(BACKENDS)})"
+        ) from None
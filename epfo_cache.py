@@ -0,0 +1,158 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "EPFOPARSER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "epfoparser")
+)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Return the hex SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: str) -> Dict[str, Any]:
+    """Return the size, modification time and SHA-256 of a file, to detect changed PDFs."""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": file_sha256(path)}
+
+
+class PDFResultCache:
+    """
+    Persistent cache of parsed passbook PDFs.
+
+    Entries are keyed by the PDF's content hash, the passbook year and the parser
+    version, so a byte-identical PDF is never re-parsed while a parser upgrade
+    invalidates everything. Each entry holds the cleaned text, the member info and
+    the year's balances/transactions. When the cache grows past max_bytes the least
+    recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        version: str = "",
+    ):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.version = version
+        self._size_estimate = None
+        self._written_since_scan = 0
+
+    def key_for(
+        self,
+        pdf_path: str,
+        year: str,
+        variant: str = "",
+        content_hash: Optional[str] = None,
+    ) -> str:
+        """
+        Build the cache key for a PDF: content hash + year + parser version.
+
+        variant distinguishes results produced with different extraction settings
+        (e.g. the text backend) for the same PDF. Pass content_hash if the PDF's
+        SHA-256 is already known to avoid hashing it again.
+        """
+        content_hash = content_hash or file_sha256(pdf_path)
+        return hashlib.sha256(
+            f"{content_hash}:{year}:{self.version}:{variant}".encode("utf-8")
+        ).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for key, or None on a miss or unreadable entry."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+        # Touch the entry so eviction drops the least recently used files first
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]):
+        """Store an entry atomically, evicting old entries if the cache is over budget."""
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {path}: {e}")
+            return
+
+        size = path.stat().st_size
+        self._written_since_scan += size
+        if self._size_estimate is not None:
+            self._size_estimate += size
+
+        # Re-scan the directory only after the first write, or once enough new data has
+        # been written that the budget may have been crossed (other processes write too)
+        if (
+            self._size_estimate is None
+            or self._size_estimate > self.max_bytes
+            or self._written_since_scan > self.max_bytes // 20
+        ):
+            self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total > self.max_bytes:
+            # Trim to 90% of the budget so we don't evict again on the very next write
+            target = self.max_bytes * 9 // 10
+            for _, size, path in sorted(entries, key=lambda e: e[0]):
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                    total -= size
+                except OSError:
+                    pass
+
+        self._size_estimate = total
+        self._written_since_scan = 0
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        self._size_estimate = 0
+        self._written_since_scan = 0
@@ -0,0 +1,180 @@
+import csv
+import gzip
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from epfo_excel import (
+    MEMBER_SHEET_COLUMNS,
+    SUMMARY_SHEET_COLUMNS,
+    TRANSACTION_SHEET_COLUMNS,
+    member_row,
+    summary_rows,
+    transaction_rows,
+)
+from epfo_parser_final import YEARLY_SUMMARY_FIELDS
+
+# Rows per CSV shard of a batch export, header excluded
+DEFAULT_ROWS_PER_SHARD = 1_000_000
+
+
+def _open_csv(path: str, compress: bool = False):
+    """Open a CSV file for writing as text (gzip when compress is set)."""
+    if compress:
+        return gzip.open(path, "wt", newline="", encoding="utf-8")
+    return open(path, "w", newline="", encoding="utf-8")
+
+
+def write_member_csvs(
+    result: Dict[str, Any], output_dir: str, member_id: str, timestamp: str
+) -> List[Optional[str]]:
+    """
+    Write one member's CSV reports and return their paths: member info, yearly
+    summary, transactions (None if there are none) and total withdrawals, each
+    named <member_id>_<report>_<timestamp>.csv.
+
+    Values are quoted by the csv module, so descriptions holding commas or quotes
+    stay in their column. Transactions use the fixed TRANSACTION_SHEET_COLUMNS
+    schema (without member_id): contributions, transfers and withdrawals share one
+    header, with blank cells for fields a row does not have.
+    """
+    paths = []
+
+    def write(report: str, headers: Sequence[str], rows: Iterable[Sequence[Any]]) -> str:
+        path = os.path.join(output_dir, f"{member_id}_{report}_{timestamp}.csv")
+        with _open_csv(path) as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            writer.writerows(rows)
+        return path
+
+    member_info = result["member_info"]
+    paths.append(write(
+        "member_info", list(member_info), [list(member_info.values())] if member_info else []
+    ))
+    paths.append(write(
+        "yearly_summary", YEARLY_SUMMARY_FIELDS, (row[1:] for row in summary_rows(result))
+    ))
+    paths.append(
+        write(
+            "transactions", TRANSACTION_SHEET_COLUMNS[1:],
+            (row[1:] for row in transaction_rows(result)),
+        )
+        if len(result["all_transactions"]) else None
+    )
+    withdrawals = result["total_withdrawals"]
+    paths.append(write(
+        "total_withdrawals", list(withdrawals), [list(withdrawals.values())] if withdrawals else []
+    ))
+    return paths
+
+
+class _ShardedCSV:
+    """
+    Rows of one table written to <name>-00001.csv, <name>-00002.csv... each with the
+    header and at most rows_per_shard rows.
+    """
+
+    def __init__(
+        self, directory: Path, name: str, headers: Sequence[str],
+        rows_per_shard: int, compress: bool,
+    ):
+        if rows_per_shard < 1:
+            raise ValueError(f"rows_per_shard must be at least 1, got {rows_per_shard}")
+        self.directory = directory
+        self.name = name
+        self.headers = list(headers)
+        self.rows_per_shard = rows_per_shard
+        self.compress = compress
+        self.paths: List[str] = []
+        self._file = None
+        self._writer = None
+        self._rows = 0
+
+    def writerows(self, rows: List[Sequence[Any]]):
+        start = 0
+        while start < len(rows):
+            if self._file is None or self._rows == self.rows_per_shard:
+                self._next_shard()
+            stop = start + self.rows_per_shard - self._rows
+            chunk = rows[start:stop] if start or stop < len(rows) else rows
+            self._writer.writerows(chunk)
+            self._rows += len(chunk)
+            start += len(chunk)
+
+    def _next_shard(self):
+        self.close()
+        path = self.directory / (
+            f"{self.name}-{len(self.paths) + 1:05d}.csv" + (".gz" if self.compress else "")
+        )
+        self._file = _open_csv(str(path), self.compress)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.headers)
+        self._rows = 0
+        self.paths.append(str(path))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class CSVBatchWriter:
+    """
+    CSV export of many members (e.g. a batch) into one set of sharded files.
+
+    output_dir gets members-NNNNN.csv (member info, final balances and total
+    withdrawals, one row per member), yearly_summaries-NNNNN.csv and
+    transactions-NNNNN.csv, with the same fixed columns as the batch Excel workbook
+    and a member_id column. Each member's rows are written with one writerows call
+    per table into the open shard, and a new shard is started every rows_per_shard
+    rows, so a batch creates a handful of files instead of four per member.
+    compress=True gzips every shard (.csv.gz). Shards a previous export left in
+    output_dir are removed when the writer is opened.
+    """
+
+    label = "CSV Files"
+    TABLES = (
+        ("members", MEMBER_SHEET_COLUMNS),
+        ("yearly_summaries", SUMMARY_SHEET_COLUMNS),
+        ("transactions", TRANSACTION_SHEET_COLUMNS),
+    )
+
+    def __init__(
+        self,
+        output_dir: str,
+        rows_per_shard: int = DEFAULT_ROWS_PER_SHARD,
+        compress: bool = False,
+    ):
+        if rows_per_shard < 1:
+            raise ValueError(f"rows_per_shard must be at least 1, got {rows_per_shard}")
+        self.path = Path(output_dir)
+        self.path.mkdir(parents=True, exist_ok=True)
+        for name, _ in self.TABLES:
+            for stale in self.path.glob(f"{name}-[0-9]*.csv*"):
+                stale.unlink()
+        self.tables = {
+            name: _ShardedCSV(self.path, name, headers, rows_per_shard, compress)
+            for name, headers in self.TABLES
+        }
+
+    def __enter__(self) -> "CSVBatchWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self.close()
+        return False
+
+    def add_result(self, result: Dict[str, Any], source: Optional[str] = None):
+        """Append a consolidated result's member row, yearly summaries and transactions."""
+        self.tables["members"].writerows([member_row(result)])
+        self.tables["yearly_summaries"].writerows(list(summary_rows(result)))
+        self.tables["transactions"].writerows(list(transaction_rows(result)))
+
+    @property
+    def paths(self) -> List[str]:
+        return [path for table in self.tables.values() for path in table.paths]
+
+    def close(self):
+        for table in self.tables.values():
+            table.close()
@@ -0,0 +1,200 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from epfo_parser_final import (
+    TRANSACTION_AMOUNT_FIELDS,
+    TRANSACTION_DATE_FIELDS,
+    YEARLY_SUMMARY_FIELDS,
+    TransactionRange,
+    TransactionStore,
+)
+
+# Rows an Excel worksheet can hold, header included
+MAX_SHEET_ROWS = 1_048_576
+
+# Sheet columns of the multi-member workbook
+MEMBER_SHEET_COLUMNS = (
+    "member_id", "uan", "member_name", "establishment_id", "establishment_name",
+    "date_of_birth", "is_active", "last_transaction_date",
+    "final_employee", "final_employer", "final_pension", "final_total",
+    "withdrawals_employee", "withdrawals_employer", "withdrawals_pension", "withdrawals_total",
+    "years_covered", "total_transactions",
+)
+SUMMARY_SHEET_COLUMNS = ("member_id",) + YEARLY_SUMMARY_FIELDS
+TRANSACTION_SHEET_COLUMNS = (
+    "member_id", "year", "month", "date", "type", "description", "due_month_code",
+    "old_member_id",
+) + TRANSACTION_AMOUNT_FIELDS
+
+
+def member_row(result: Dict[str, Any]) -> list:
+    """A consolidated result's MEMBER_SHEET_COLUMNS values."""
+    member_info = result.get("member_info", {})
+    final_balances = result.get("final_balances", {})
+    withdrawals = result.get("total_withdrawals", {})
+    metadata = result.get("extraction_metadata", {})
+    return (
+        [member_info.get(c) for c in MEMBER_SHEET_COLUMNS[:8]]
+        + [final_balances.get(fund) for fund in ("employee", "employer", "pension", "total")]
+        + [withdrawals.get(fund) for fund in ("employee", "employer", "pension", "total")]
+        + [", ".join(metadata.get("years_covered", [])), metadata.get("total_transactions")]
+    )
+
+
+def summary_rows(result: Dict[str, Any]) -> Iterator[list]:
+    """A consolidated result's yearly summaries as SUMMARY_SHEET_COLUMNS values."""
+    member_id = result.get("member_info", {}).get("member_id")
+    for summary in result.get("yearly_summaries", []):
+        yield [member_id] + [summary.get(c) for c in YEARLY_SUMMARY_FIELDS]
+
+
+def transaction_rows(result: Dict[str, Any]) -> Iterator[list]:
+    """
+    A consolidated result's transactions as TRANSACTION_SHEET_COLUMNS values: one
+    fixed schema for contributions, transfers and withdrawals, blank where a kind
+    of row has no such field.
+    """
+    member_id = result.get("member_info", {}).get("member_id")
+    transactions = result.get("all_transactions", [])
+    if isinstance(transactions, (TransactionStore, TransactionRange)):
+        transactions = transactions.iter_dicts()
+    columns = TRANSACTION_SHEET_COLUMNS[1:]
+    for transaction in transactions:
+        yield [member_id] + list(map(transaction.get, columns))
+
+
+def _workbook():
+    # Imported here: openpyxl is an optional dependency, only needed for Excel output
+    from openpyxl import Workbook
+
+    return Workbook(write_only=True)
+
+
+def _header_cells(sheet, headers: Sequence[str]) -> list:
+    """Header row styled like pandas' to_excel: bold, thin border, centred."""
+    # Imported here: openpyxl is an optional dependency, only needed for Excel output
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+
+    font = Font(bold=True)
+    side = Side(style="thin")
+    border = Border(left=side, right=side, top=side, bottom=side)
+    alignment = Alignment(horizontal="center", vertical="top")
+    cells = []
+    for header in headers:
+        cell = WriteOnlyCell(sheet, value=header)
+        cell.font, cell.border, cell.alignment = font, border, alignment
+        cells.append(cell)
+    return cells
+
+
+class _SheetWriter:
+    """
+    Appends rows to a write-only worksheet, continuing on "<title> (2)", "<title> (3)"...
+    with the same header once a sheet reaches Excel's row limit.
+    """
+
+    def __init__(self, workbook, title: str, headers: Sequence[str]):
+        self.workbook = workbook
+        self.title = title
+        self.headers = list(headers)
+        self.sheets = 0
+        self._new_sheet()
+
+    def _new_sheet(self):
+        self.sheets += 1
+        title = self.title if self.sheets == 1 else f"{self.title} ({self.sheets})"
+        self.sheet = self.workbook.create_sheet(title)
+        if self.headers:
+            self.sheet.append(_header_cells(self.sheet, self.headers))
+        self.rows = 1
+
+    def append(self, values: Iterable[Any]):
+        if self.rows == MAX_SHEET_ROWS:
+            self._new_sheet()
+        self.sheet.append(values)
+        self.rows += 1
+
+
+def _field_names(records: Iterable[Any]) -> List[str]:
+    """Every key of the records, in order of first appearance (as DataFrame columns are)."""
+    if isinstance(records, (TransactionStore, TransactionRange)):
+        return records.field_names()
+    names = {}
+    for record in records:
+        names.update(dict.fromkeys(record))
+    return list(names)
+
+
+def _write_records(workbook, title: str, records: Sequence[Any]):
+    """
+    One sheet holding records (dicts) under the union of their keys, leaving out
+    the date_ordinal / wage_month_key sort keys (the sheet has the dates as shown).
+    """
+    headers = [name for name in _field_names(records) if name not in TRANSACTION_DATE_FIELDS]
+    sheet = _SheetWriter(workbook, title, headers)
+    if isinstance(records, (TransactionStore, TransactionRange)):
+        records = records.iter_dicts()
+    for record in records:
+        sheet.append(list(map(record.get, headers)))
+
+
+def write_member_workbook(result: Dict[str, Any], output_path: str):
+    """
+    Write one member's Excel report: Member Info, Yearly Summary, All Transactions
+    (if any), Final Balances and Total Withdrawals sheets.
+
+    The workbook is written in openpyxl's write-only mode: rows are streamed to
+    the file as they are read from the result, so memory does not grow with the
+    number of transactions. Raises ImportError if openpyxl is not installed.
+    """
+    workbook = _workbook()
+    _write_records(workbook, "Member Info", [result["member_info"]])
+    _write_records(workbook, "Yearly Summary", result["yearly_summaries"])
+    if len(result["all_transactions"]):
+        _write_records(workbook, "All Transactions", result["all_transactions"])
+    _write_records(workbook, "Final Balances", [result["final_balances"]])
+    _write_records(workbook, "Total Withdrawals", [result["total_withdrawals"]])
+    workbook.save(output_path)
+
+
+class ExcelWorkbookWriter:
+    """
+    One Excel workbook for many members, e.g. a whole batch.
+
+    Sheets: Members (member info, final balances and total withdrawals, one row per
+    member), Yearly Summaries and Transactions, each with a member_id column and
+    the fixed columns above (transaction keys outside TRANSACTION_SHEET_COLUMNS
+    are left out). Rows are streamed to temporary sheet files as members are added
+    and the workbook is assembled by close(), so memory stays flat however many
+    members and transactions are written; sheets past Excel's row limit continue
+    on "<sheet> (2)" and so on. Raises ImportError if openpyxl is not installed.
+    """
+
+    label = "Excel Workbook"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.workbook = _workbook()
+        self.members = _SheetWriter(self.workbook, "Members", MEMBER_SHEET_COLUMNS)
+        self.summaries = _SheetWriter(self.workbook, "Yearly Summaries", SUMMARY_SHEET_COLUMNS)
+        self.transactions = _SheetWriter(self.workbook, "Transactions", TRANSACTION_SHEET_COLUMNS)
+
+    def __enter__(self) -> "ExcelWorkbookWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self.close()
+        return False
+
+    def add_result(self, result: Dict[str, Any], source: Optional[str] = None):
+        """Append a consolidated result's member row, yearly summaries and transactions."""
+        self.members.append(member_row(result))
+        for row in summary_rows(result):
+            self.summaries.append(row)
+        for row in transaction_rows(result):
+            self.transactions.append(row)
+
+    def close(self):
+        if self.workbook is not None:
+            self.workbook.save(self.path)
+            self.workbook = None
@@ -0,0 +1,277 @@
+import logging
+import os
+import uuid
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from epfo_parser_final import (
+    TRANSACTION_AMOUNT_FIELDS,
+    YEARLY_SUMMARY_FIELDS,
+    TransactionRange,
+    TransactionStore,
+    with_date_keys,
+)
+
+logger = logging.getLogger(__name__)
+
+TABLES = ("transactions", "yearly_summaries")
+# Rows a partition buffers before they are written out as one file
+DEFAULT_ROWS_PER_FILE = 500_000
+# Rows buffered over all partitions before every partition is written out
+DEFAULT_MAX_BUFFERED_ROWS = 2_000_000
+# Partition directory name of rows without an establishment id (as pyarrow writes it)
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+# datetime.toordinal() of 1970-01-01: Arrow date32 values count days from there
+_EPOCH_ORDINAL = 719163
+
+# Column order of each table's files; year and establishment_id live in the paths
+TRANSACTION_FILE_COLUMNS = (
+    "member_id", "uan", "seq", "date", "wage_month", "type", "description",
+    "due_month_code", "old_member_id",
+) + TRANSACTION_AMOUNT_FIELDS
+SUMMARY_FILE_COLUMNS = ("member_id", "uan") + YEARLY_SUMMARY_FIELDS[1:]
+_DICTIONARY_COLUMNS = frozenset(("member_id", "uan", "type", "description"))
+
+
+@lru_cache(maxsize=None)
+def schemas():
+    """
+    Arrow schemas: {"partition": year/establishment_id, "transactions": ...,
+    "yearly_summaries": ...}, each table's schema holding its file columns followed
+    by the partition columns.
+    """
+    # Imported here: pyarrow is an optional dependency, only needed for Parquet export
+    import pyarrow as pa
+
+    partition = pa.schema([("year", pa.int16()), ("establishment_id", pa.string())])
+
+    def column_type(name: str):
+        if name in _DICTIONARY_COLUMNS:
+            return pa.dictionary(pa.int32(), pa.string())
+        if name in ("date", "wage_month"):
+            return pa.date32()
+        if name == "seq":
+            return pa.int32()
+        if name in TRANSACTION_AMOUNT_FIELDS or name in YEARLY_SUMMARY_FIELDS:
+            return pa.int64()
+        return pa.string()
+
+    return {
+        "partition": partition,
+        "transactions": pa.schema(
+            [(name, column_type(name)) for name in TRANSACTION_FILE_COLUMNS] + list(partition)
+        ),
+        "yearly_summaries": pa.schema(
+            [(name, column_type(name)) for name in SUMMARY_FILE_COLUMNS] + list(partition)
+        ),
+    }
+
+
+@lru_cache(maxsize=4096)
+def _month_date32(key: int) -> Optional[int]:
+    """date32 of the first day of the wage month with this wage_month_key (None for 0)."""
+    if not key:
+        return None
+    year, month = divmod(key, 12)
+    return datetime(year, month + 1, 1).toordinal() - _EPOCH_ORDINAL
+
+
+class ParquetExporter:
+    """
+    Exports consolidated results as a typed, partitioned Parquet dataset.
+
+    output_dir gets two hive-partitioned datasets, transactions/ and
+    yearly_summaries/, laid out as <table>/year=<YYYY>/establishment_id=<id>/ so a
+    reader filtering on year (or establishment) only opens those directories.
+    Columns have a fixed type (schemas()): dates and wage months are date32 (from
+    the parsed date_ordinal / wage_month_key, never re-parsed), amounts int64, and
+    member_id, uan, type and description are dictionary encoded. Rows are buffered
+    per partition across results and written in files of up to rows_per_file rows,
+    so a batch of many members produces few, large files.
+
+    Files are named <basename>-<run>-<n>.parquet and are written under hidden
+    (dot) names, which dataset readers skip, until close(). close() then removes the
+    rows of every member this export added from the files earlier exports left (in
+    any partition), and moves the new files into place: exporting a member again
+    replaces its rows rather than duplicating them, and other members' rows are
+    kept. If the export is abandoned (an exception inside a with block, or
+    discard()) the new files are deleted and the dataset is left as it was. Raises
+    ImportError if pyarrow is not installed.
+    """
+
+    label = "Parquet Dataset"
+
+    def __init__(
+        self,
+        output_dir: str,
+        basename: str = "part",
+        rows_per_file: int = DEFAULT_ROWS_PER_FILE,
+        max_buffered_rows: int = DEFAULT_MAX_BUFFERED_ROWS,
+    ):
+        # Imported here: pyarrow is an optional dependency, only needed for Parquet export
+        import pyarrow.parquet  # noqa: F401
+
+        self.path = Path(output_dir)
+        self.basename = basename
+        self.rows_per_file = rows_per_file
+        self.max_buffered_rows = max_buffered_rows
+        self._buffers: Dict[Tuple[str, int, Optional[str]], List[tuple]] = {}
+        self._buffered = 0
+        self._files = 0
+        self.files: List[str] = []
+        # Distinguishes this export's files from those of earlier runs with the same basename
+        self._run = uuid.uuid4().hex[:8]
+        self._staged: List[Tuple[Path, Path]] = []
+        self._members = set()
+
+    def __enter__(self) -> "ParquetExporter":
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> bool:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+        return False
+
+    def add_result(self, result: Dict[str, Any], source: Optional[str] = None):
+        """Buffer a consolidated result's yearly summaries and transactions."""
+        member_info = result.get("member_info", {})
+        member_id = member_info.get("member_id")
+        uan = member_info.get("uan")
+        establishment_id = member_info.get("establishment_id")
+        if member_id is not None:
+            self._members.add(member_id)
+
+        for summary in result.get("yearly_summaries", []):
+            self._add(
+                "yearly_summaries", summary["year"], establishment_id,
+                (member_id, uan) + tuple(summary.get(c) for c in SUMMARY_FILE_COLUMNS[2:]),
+            )
+
+        transactions = result.get("all_transactions", [])
+        if isinstance(transactions, (TransactionStore, TransactionRange)):
+            transactions = transactions.iter_dicts()
+        for seq, transaction in enumerate(transactions):
+            transaction = with_date_keys(transaction)
+            self._add(
+                "transactions", transaction.get("year"), establishment_id,
+                (
+                    member_id, uan, seq,
+                    transaction["date_ordinal"] - _EPOCH_ORDINAL if transaction["date_ordinal"] else None,
+                    _month_date32(transaction["wage_month_key"]),
+                    transaction.get("type"), transaction.get("description"),
+                    transaction.get("due_month_code"), transaction.get("old_member_id"),
+                ) + tuple(transaction.get(c) for c in TRANSACTION_AMOUNT_FIELDS),
+            )
+        if self._buffered >= self.max_buffered_rows:
+            self.flush()
+
+    def _remove_members(self):
+        """Drop the added members' rows from the files earlier exports left, in every partition."""
+        # Imported here: pyarrow is an optional dependency (already loaded by __init__)
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        if not self._members:
+            return
+        members = pa.array(sorted(self._members), pa.string())
+        for table in TABLES:
+            for path in (self.path / table).glob("*/*/*.parquet"):
+                ids = pq.ParquetFile(path).read(columns=["member_id"])["member_id"]
+                keep = pc.invert(pc.is_in(ids.cast(pa.string()), value_set=members))
+                keep = keep.fill_null(True)
+                if pc.all(keep).as_py():
+                    continue
+                data = pq.ParquetFile(path).read().filter(keep)
+                if data.num_rows:
+                    tmp_path = path.parent / f".{path.name}.tmp"
+                    pq.write_table(data, str(tmp_path))
+                    os.replace(tmp_path, path)
+                else:
+                    path.unlink()
+
+    def _add(self, table: str, year: Any, establishment_id: Optional[str], row: tuple):
+        key = (table, int(year), establishment_id)
+        rows = self._buffers.get(key)
+        if rows is None:
+            rows = self._buffers[key] = []
+        rows.append(row)
+        self._buffered += 1
+        if len(rows) >= self.rows_per_file:
+            self._write(key, self._buffers.pop(key))
+
+    def flush(self):
+        """Write every buffered partition out."""
+        for key in sorted(self._buffers, key=lambda k: (k[0], k[1], k[2] or "")):
+            self._write(key, self._buffers[key])
+        self._buffers.clear()
+        self._buffered = 0
+
+    def close(self):
+        """Write the buffered rows and replace the added members' earlier rows with them."""
+        self.flush()
+        self._remove_members()
+        for tmp_path, path in self._staged:
+            os.replace(tmp_path, path)
+        self._staged.clear()
+        self._members.clear()
+
+    def discard(self):
+        """Abandon the export: drop buffered rows and delete the files not yet moved into place."""
+        for tmp_path, _ in self._staged:
+            tmp_path.unlink(missing_ok=True)
+        self._staged.clear()
+        self._buffers.clear()
+        self._buffered = 0
+        self.files.clear()
+
+    def _write(self, key: Tuple[str, int, Optional[str]], rows: List[tuple]):
+        # Imported here: pyarrow is an optional dependency (already loaded by __init__)
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table, year, establishment_id = key
+        schema = schemas()[table]
+        file_schema = pa.schema(list(schema)[:-2])
+        columns = list(zip(*rows))
+        arrays = []
+        for field, values in zip(file_schema, columns):
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array(values, pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, field.type))
+
+        directory = self.path / table / f"year={year}" / (
+            f"establishment_id={establishment_id or NULL_PARTITION}"
+        )
+        directory.mkdir(parents=True, exist_ok=True)
+        self._files += 1
+        path = directory / f"{self.basename}-{self._run}-{self._files:05d}.parquet"
+        # Written under a dot name, which dataset readers skip, and moved into place by close()
+        tmp_path = directory / f".{path.name}.tmp"
+        pq.write_table(pa.Table.from_arrays(arrays, schema=file_schema), str(tmp_path))
+        self._staged.append((tmp_path, path))
+        self.files.append(str(path))
+        self._buffered -= len(rows)
+
+
+def open_dataset(output_dir: str, table: str = "transactions"):
+    """
+    Open an exported table as a pyarrow.dataset.Dataset with its fixed schema.
+
+    Filters on year / establishment_id only read the matching partitions, e.g.
+    open_dataset(out).to_table(filter=pyarrow.dataset.field("year") == 2023).
+    """
+    # Imported here: pyarrow is an optional dependency, only needed for Parquet export
+    import pyarrow.dataset as ds
+
+    return ds.dataset(
+        os.path.join(output_dir, table),
+        schema=schemas()[table],
+        format="parquet",
+        partitioning=ds.partitioning(schemas()["partition"], flavor="hive"),
+    )
@@ -1,43 +1,1009 @@
 #python epfo_parser_final.py "C:\Users\virch\CascadeProjects\epfo_pdf_parser\PF\GJAHD14545890000000015"  "C:\Users\virch\CascadeProjects\epfo_pdf_parser\output"
 #epfoparser "C:\Users\virch\CascadeProjects\epfo_pdf_parser\PF\MHBAN01266700000011961"  "C:\Users\virch\CascadeProjects\epfo_pdf_parser\output"
-import pdfplumber
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import (
-    SimpleDocTemplate,
-    Table,
-    TableStyle,
-    Paragraph,
-    Spacer,
-    PageBreak,
-)
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
+import argparse
+import bisect
+import gzip
 import json
 import os
 import re
+import sys
+import time
+from array import array
+from collections.abc import Mapping
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple, Union
 import logging
 from pathlib import Path
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+from display_epfo import load_consolidated
+from epfo_backends import BACKENDS, DEFAULT_BACKEND, get_backend
+from epfo_cache import (
+    PDFResultCache,
+    DEFAULT_CACHE_DIR,
+    DEFAULT_MAX_BYTES,
+    file_fingerprint,
+    file_sha256,
 )
+from epfo_profile import PROFILER, StageProfiler, profiled
+
+# Bump whenever extraction output changes so cached parse results are invalidated
+PARSER_VERSION = "1.0.10"
+
 logger = logging.getLogger(__name__)
 
+# Compiled pattern table. Every regex the parser uses is compiled once here rather
+# than inside the per-line loops.
+
+# Text cleanup / filenames
+HINDI_CHARS_RE = re.compile(r"[\u0900-\u097F]")
+WHITESPACE_RE = re.compile(r"\s+")
+FILENAME_YEAR_RE = re.compile(r"_(\d{4})\.pdf$")
+
+# Member information
+ESTABLISHMENT_RE = re.compile(
+    r"Establishment ID/Name\s+([A-Z]{5}\d{10})\s*/\s*(.*?)(?=\s+lnL; vkbZMh@uke|Member ID/Name|$)",
+    re.DOTALL,
+)
+MEMBER_RE = re.compile(r"Member ID/Name\s+([A-Z]{5}\d{17})\s*/\s*([A-Z\s]+)")
+DOB_RE = re.compile(r"Date of Birth\s+(\d{2}-\d{2}-\d{4})")
+UAN_RE = re.compile(r"UAN\s+(\d{12})")
+
+# Balances
+OPENING_BALANCE_RE = re.compile(
+    r"OB Int\. Updated upto\s+\d{2}/\d{2}/\d{4}\s+([0-9,]+)\s+([0-9,]+)\s+([0-9,]+)",
+    re.DOTALL | re.IGNORECASE,
+)
+CLOSING_BALANCE_RE = re.compile(
+    r"Closing Balance as on\s+\d{2}/\d{2}/\d{4}\s+([0-9,]+)\s+([0-9,]+)\s+([0-9,]+)",
+    re.DOTALL | re.IGNORECASE,
+)
+CLAIM_INTEREST_RE = re.compile(
+    r"Int\.\s*given\s*against\s*Claim\s*:?\s*(?:\S+\s+)?"
+    r"(\d{1,3}(?:,\d{3})*|\d+)\s+"
+    r"(\d{1,3}(?:,\d{3})*|\d+)\s+"
+    r"(\d{1,3}(?:,\d{3})*|\d+)",
+    re.DOTALL | re.IGNORECASE,
+)
+INTEREST_RE = re.compile(
+    r"(?<!OB\s)Int\. Updated upto\s+\d{2}/\d{2}/\d{4}\s+([0-9,]+)\s+([0-9,]+)\s+([0-9,]+)(?=\s*Closing Balance)",
+    re.DOTALL | re.IGNORECASE,
+)
+INTEREST_FALLBACK_RE = re.compile(
+    r"(?<!OB\s)(?<!Taxable Data)Int\. Updated upto\s+\d{2}/\d{2}/\d{4}\s+([0-9,]+)\s+([0-9,]+)\s+([0-9,]+)",
+    re.DOTALL | re.IGNORECASE,
+)
+
+# Transactions
+TRANSACTION_SPLIT_RE = re.compile(r"(?=[A-Za-z]{3}-\d{4}\s+\d{2}-\d{2}-\d{4})")
+TRANSACTION_START_RE = re.compile(r"^[A-Za-z]{3}-\d{4}\s+\d{2}-\d{2}-\d{4}", re.IGNORECASE)
+
+# One classifying match per consolidated line: the CR/DR token, plus the first
+# transfer keyword if the line has one. Only the patterns that can possibly match
+# that combination are tried afterwards.
+TRANSACTION_DISPATCH_RE = re.compile(
+    r"[A-Za-z]{3}-\d{4}\s+\d{2}-\d{2}-\d{4}\s+(?:(?P<cr>CR)|(?P<dr>DR))\s+"
+    r"(?:.*?(?P<keyword>TRANSFER|OFFICE|Old\s+Member))?",
+    re.IGNORECASE,
+)
+
+# Standard TRANSFER IN format
+TRANSFER_IN_RE = re.compile(r'''
+    ([A-Za-z]{3}-\d{4})\s+                # Month-Year
+    (\d{2}-\d{2}-\d{4})\s+                # Date
+    CR\s+                                 # Credit Type
+    (TRANSFER\s+IN\s+-\s+.*?)\s+          # Description
+    (\d+(?:,\d{3})*|0)\s+                 # Wages
+    (\d+(?:,\d{3})*|0)\s+                 # Basic Wages
+    (\d+(?:,\d{3})*|0)\s+                 # Employee Contribution
+    (\d+(?:,\d{3})*|0)\s+                 # Employer Contribution
+    (\d+(?:,\d{3})*|0)                    # Pension Contribution
+''', re.IGNORECASE | re.VERBOSE)
+
+# OFFICE format with Old Member ID at the end
+OFFICE_TRANSFER_RE = re.compile(r'''
+    ([A-Za-z]{3}-\d{4})\s+                # Month-Year
+    (\d{2}-\d{2}-\d{4})\s+                # Date
+    CR\s+                                 # Credit Type
+    (OFFICE\((?:(?!Old\s+Member\s+Id)[^)])*  # Description part before amounts
+     Old\s+Member\s+Id[^)]*\s+)            #   (only the first "Old Member Id" is tried)
+    (\d+(?:,\d{3})*|0)\s+                 # Wages
+    (\d+(?:,\d{3})*|0)\s+                 # Basic Wages
+    (\d+(?:,\d{3})*|0)\s+                 # Employee Contribution
+    (\d+(?:,\d{3})*|0)\s+                 # Employer Contribution
+    (\d+(?:,\d{3})*|0)\s+                 # Pension Contribution
+    :([A-Z0-9]+)\s*\)                     # Old Member ID at the end
+''', re.IGNORECASE | re.VERBOSE)
+
+# Generic transfer pattern (catches other variations)
+GENERIC_TRANSFER_RE = re.compile(r'''
+    ([A-Za-z]{3}-\d{4})\s+                # Month-Year
+    (\d{2}-\d{2}-\d{4})\s+                # Date
+    CR\s+                                 # Credit Type
+    ((?:(?!TRANSFER|OFFICE|Old\s+Member).)*   # Any description with transfer keywords
+     (?:TRANSFER|OFFICE|Old\s+Member).*?)\s+ #   (only the first keyword is tried)
+    (\d+(?:,\d{3})*|0)\s+                 # Wages
+    (\d+(?:,\d{3})*|0)\s+                 # Basic Wages
+    (\d+(?:,\d{3})*|0)\s+                 # Employee Contribution
+    (\d+(?:,\d{3})*|0)\s+                 # Employer Contribution
+    (\d+(?:,\d{3})*|0)                    # Pension Contribution
+    (?:.*?:([A-Z0-9]+).*?)?               # Optional Old Member ID anywhere
+''', re.IGNORECASE | re.VERBOSE)
+
+# Regular CR (contribution) format
+CR_RE = re.compile(r'''
+    ([A-Za-z]{3}-\d{4})\s+                # Month-Year
+    (\d{2}-\d{2}-\d{4})\s+                # Date
+    CR\s+                                 # Credit Type
+    (?!TRANSFER)
+    (.*?)\s+                              # Description
+    (\d{6})\s+                            # Due Month Code
+    ([\d,]+)\s+                           # Wages
+    ([\d,]+)\s+                           # Basic Wages
+    ([\d,]+)\s+                           # Employee Contribution
+    ([\d,]+)\s+                           # Employer Contribution
+    ([\d,]+)                              # Pension Contribution
+''', re.IGNORECASE | re.VERBOSE)
+
+# DR (withdrawal) format
+DR_RE = re.compile(r'''
+    ([A-Za-z]{3}-\d{4})\s+                # Month-Year
+    (\d{2}-\d{2}-\d{4})\s+                # Date
+    DR\s+                                 # Debit Type
+    (.*?)\s+                              # Description
+    (\d+(?:,\d{3})*)\s+                   # Wages
+    (\d+(?:,\d{3})*)\s+                   # Basic Wages
+    ([\d,]+)\s+                           # Employee Withdrawal
+    ([\d,]+)\s+                           # Employer Withdrawal
+    ([\d,]+)                              # Pension Withdrawal
+''', re.IGNORECASE | re.VERBOSE)
+
+# Old member ID inside a TRANSFER IN description
+OLD_MEMBER_ID_RES = [
+    re.compile(r"Old\s+Member\s+Id\s*[:-]?\s*([A-Z0-9]+)", re.IGNORECASE),
+    re.compile(r"Old\s+A/c\s+No\s*[:-]?\s*([A-Z0-9]+)", re.IGNORECASE),
+    re.compile(r"Previous\s+Member\s+Id\s*[:-]?\s*([A-Z0-9]+)", re.IGNORECASE),
+]
+
+# Old member ID anywhere in a generic transfer line
+LINE_OLD_MEMBER_ID_RES = [
+    re.compile(r":([A-Z0-9]{20,})", re.IGNORECASE),  # Colon followed by long alphanumeric
+    re.compile(r"([A-Z]{2}[A-Z0-9]{18,})", re.IGNORECASE),  # State code + long alphanumeric
+    # Scans from the last "Old Member Id" before each colon only (same ID, linear time)
+    re.compile(r"Old\s+Member\s+Id(?:(?!Old\s+Member\s+Id)[^:])*:\s*([A-Z0-9]+)", re.IGNORECASE),
+]
+
+# Transaction grid of the passbook, used by the "columns" extraction mode: each
+# column's name and the x (in points on the landscape A4 page) where it starts. A word
+# belongs to the column its horizontal centre falls in. These are only the defaults:
+# each page's table header (PASSBOOK_HEADER_RES) gives the actual column positions.
+PASSBOOK_COLUMNS = (
+    ("month", 20),
+    ("date", 70),
+    ("type", 130),
+    ("particulars", 160),
+    ("wages", 470),
+    ("basic_wages", 540),
+    ("employee", 610),
+    ("employer", 680),
+    ("pension", 750),
+)
+# Label of each grid column in the table header, in column order; a column starts at
+# the first word of its label
+PASSBOOK_HEADER_RES = tuple(
+    (name, re.compile(pattern, re.IGNORECASE))
+    for name, pattern in (
+        ("month", r"Wage\s+Month"),
+        ("date", r"(?:Transaction\s+)?Date"),
+        ("type", r"(?:Transaction\s+)?Type"),
+        ("particulars", r"Particulars"),
+        ("wages", r"(?:EPF\s+)?Wages"),
+        ("basic_wages", r"(?:EPS\s+)?Wages"),
+        ("employee", r"Employee"),
+        ("employer", r"Employer"),
+        ("pension", r"Pension"),
+    )
+)
+# A line whose text reads like a transaction row: wage month, date, CR/DR
+GRID_ROW_TEXT_RE = re.compile(
+    r"[A-Za-z]{3}-\d{4}\s+\d{2}-\d{2}-\d{4}\s+(?:CR|DR)\b", re.IGNORECASE
+)
+WAGE_MONTH_CELL_RE = re.compile(r"[A-Za-z]{3}-\d{4}")
+DATE_CELL_RE = re.compile(r"\d{2}-\d{2}-\d{4}")
+TRANSFER_KEYWORD_RE = re.compile(r"TRANSFER|OFFICE|Old\s+Member", re.IGNORECASE)
+
+# "text": regexes over the whitespace-collapsed document text (the default).
+# "columns": transaction rows are cut into cells by PASSBOOK_COLUMNS.
+EXTRACTION_MODES = ("text", "columns")
+
+
+# Amount runs used by the "label .*? N N N" style rules. RUN_WIDE_RE is the grammar of
+# the "Total ... for the year" and claim-interest rows, RUN_STRICT_RE that of the
+# generic "Int."/"Interest" fallbacks.
+RUN_WIDE_RE = re.compile(
+    r"(\d{1,3}(?:,\d{3})*|\d+)\s+(\d{1,3}(?:,\d{3})*|\d+)\s+(\d{1,3}(?:,\d{3})*|\d+)"
+)
+RUN_STRICT_RE = re.compile(
+    r"(\d{1,3}(?:,\d{3})*)\s+(\d{1,3}(?:,\d{3})*)\s+(\d{1,3}(?:,\d{3})*)"
+)
+
+# Phrases that open a "Total ... for the year" row, keyed by the balances field they fill
+YEAR_TOTAL_PHRASES = {
+    "Contributions": "contributions",
+    "Withdrawals": "withdrawals",
+    "Transfer-Ins/VDRs": "transfer_ins",
+}
+
+
+class BalanceScanner:
+    """
+    Single pass, linear-time scanner for the balance section of a passbook.
+
+    The text is split into whitespace tokens once and walked left to right. Fixed-shape
+    rows (opening/closing balance, "Int. Updated upto", claim interest) are matched
+    with their compiled pattern on a short window of tokens starting at a label token.
+    Rules of the form "label .*? amount amount amount" instead wait for the first run of
+    three amounts after their label, so no rule ever rescans the document. Text can
+    be fed in several chunks (e.g. one per page); only a few tokens of lookahead are
+    buffered between them.
+    """
+
+    # Tokens a window may need after its first token (claim row: 9 tokens + prev)
+    LOOKAHEAD = 12
+
+    def __init__(self):
+        self._tokens = []
+        self._base = 0  # absolute index of self._tokens[0]
+        self._next = 0  # absolute index of the next token to process
+        self._prev = ""  # token before self._tokens[0]
+
+        # First match of each fixed-shape rule (tuple of three amount strings)
+        self.opening = None
+        self.closing = None
+        self.claim_interest = None
+        self.interest = None
+        self.interest_fallback = None
+        # "Total ... for the year": label -> (token index, char offset) while waiting
+        self.year_totals = {}
+        self._total_waiters = {}
+        # Generic "Int."/"Interest" rules: the first match and the last of a findall
+        self.generic_interest = None
+        self.last_interest = None
+        self._generic_waiter = None
+        self._keyword_resume = (0, 0)
+
+    def feed(self, text: str):
+        """Add a chunk of cleaned text and scan every token with enough lookahead."""
+        self._tokens.extend(text.split())
+        self._scan_until(self._base + len(self._tokens) - self.LOOKAHEAD)
+
+        # Drop tokens that no window can reach any more
+        drop = self._next - self._base - 1
+        if drop > 0:
+            self._prev = self._tokens[drop - 1]
+            del self._tokens[:drop]
+            self._base += drop
+
+    def feed_all(self, text: str) -> "BalanceScanner":
+        """Scan a complete document in one call."""
+        self.feed(text)
+        return self.finish()
+
+    def finish(self) -> "BalanceScanner":
+        """Scan the remaining buffered tokens at end of input."""
+        self._scan_until(self._base + len(self._tokens))
+        return self
+
+    def _scan_until(self, end: int):
+        tokens = self._tokens
+        base = self._base
+        waiting = bool(self._total_waiters) or self._generic_waiter is not None
+        for index in range(self._next, end):
+            token = tokens[index - base]
+            # Every label contains an "n" or ends in "b"/"l" ("OB", "Total"); other
+            # tokens only matter as amounts while some label is waiting for a run
+            if (
+                "n" in token
+                or "N" in token
+                or token[-1] in "bBl"
+                or (waiting and token[-1].isdigit())
+            ):
+                self._scan(index)
+                waiting = bool(self._total_waiters) or self._generic_waiter is not None
+        self._next = max(self._next, end)
+
+    def _window(self, index: int, count: int):
+        start = index - self._base
+        return self._tokens[start:start + count]
+
+    def _match_at(self, pattern, index: int, count: int, with_prev: bool = False):
+        """Match pattern in a window of tokens, accepting only matches that start in the first token."""
+        window = self._window(index, count)
+        prefix = ""
+        if with_prev:
+            prev = self._tokens[index - self._base - 1] if index > self._base else self._prev
+            if prev:
+                prefix = prev + " "
+        text = prefix + " ".join(window)
+        match = pattern.search(text, len(prefix))
+        if match and match.start() < len(prefix) + len(window[0]):
+            return match
+        return None
+
+    def _run_at(self, pattern, index: int, offset: int = 0):
+        """Return the amount run starting inside token `index` (at or after offset), if any."""
+        window = self._window(index, 3)
+        if len(window) < 3:
+            return None
+        text = " ".join(window)
+        match = pattern.search(text, offset)
+        if match and match.start() < len(window[0]):
+            return match
+        return None
+
+    def _scan(self, index: int):
+        token = self._tokens[index - self._base]
+        lower = token.lower()
+
+        # --- Fixed-shape rows, matched once at their label token ---
+        if self.opening is None and lower.endswith("ob"):
+            match = self._match_at(OPENING_BALANCE_RE, index, 8)
+            if match:
+                self.opening = match.groups()
+        if self.closing is None and lower.endswith("closing"):
+            match = self._match_at(CLOSING_BALANCE_RE, index, 8)
+            if match:
+                self.closing = match.groups()
+        if "int." in lower:
+            if self.claim_interest is None:
+                match = self._match_at(CLAIM_INTEREST_RE, index, 10)
+                if match:
+                    self.claim_interest = match.groups()
+            if self.interest is None:
+                match = self._match_at(INTEREST_RE, index, 10, with_prev=True)
+                if match:
+                    self.interest = match.groups()
+            if self.interest_fallback is None:
+                match = self._match_at(INTEREST_FALLBACK_RE, index, 7, with_prev=True)
+                if match:
+                    self.interest_fallback = match.groups()
+
+        # --- "Total ... for the year" labels start waiting for an amount run ---
+        if token.endswith("Total"):
+            window = self._window(index, 5)
+            if (
+                len(window) == 5
+                and window[1] in YEAR_TOTAL_PHRASES
+                and window[2] == "for"
+                and window[3] == "the"
+                and window[4].startswith("year")
+            ):
+                field = YEAR_TOTAL_PHRASES[window[1]]
+                if field not in self.year_totals and field not in self._total_waiters:
+                    self._total_waiters[field] = (index + 4, 4)
+
+        # --- Generic "Int."/"Interest" keywords (non-overlapping, like re.findall) ---
+        resume_index, resume_offset = self._keyword_resume
+        if self._generic_waiter is None and index >= resume_index and "int" in lower:
+            start = resume_offset if index == resume_index else 0
+            hits = [
+                pos + len(keyword)
+                for keyword in ("int.", "interest")
+                for pos in (lower.find(keyword, start),)
+                if pos >= 0
+            ]
+            if hits:
+                self._generic_waiter = (index, min(hits))
+
+        # --- Resolve waiting labels with the first amount run after them ---
+        if not token[-1].isdigit():
+            return
+        if self._total_waiters:
+            default_run = None
+            for field, (wait_index, wait_offset) in list(self._total_waiters.items()):
+                if index < wait_index:
+                    continue
+                if index == wait_index:
+                    run = self._run_at(RUN_WIDE_RE, index, wait_offset)
+                else:
+                    if default_run is None:
+                        default_run = self._run_at(RUN_WIDE_RE, index) or False
+                    run = default_run
+                if run:
+                    self.year_totals[field] = run.groups()
+                    del self._total_waiters[field]
+        if self._generic_waiter is not None:
+            wait_index, wait_offset = self._generic_waiter
+            if index >= wait_index:
+                run = self._run_at(
+                    RUN_STRICT_RE, index, wait_offset if index == wait_index else 0
+                )
+                if run:
+                    if self.generic_interest is None:
+                        self.generic_interest = run.groups()
+                    self.last_interest = run.groups()
+                    self._generic_waiter = None
+                    # Keyword search resumes where the run ended, inside token index + 2
+                    window = self._window(index, 3)
+                    self._keyword_resume = (
+                        index + 2,
+                        run.end() - len(window[0]) - len(window[1]) - 2,
+                    )
+
+
+class TransactionStream:
+    """
+    Incremental transaction parser.
+
+    Text is fed in chunks (e.g. one cleaned page at a time). Complete rows, each starting
+    with "Mon-YYYY DD-MM-YYYY", are parsed as soon as the next row start is seen; only
+    the last, possibly unfinished, row is carried over to the next chunk.
+    """
+
+    def __init__(self, parser: "EPFOMultiYearParser", year: str):
+        self.parser = parser
+        self.year = year
+        self.transactions = []
+        self._carry = ""
+        self._in_rows = False
+
+    def feed(self, text: str):
+        """Add a chunk of text and parse every row it completes."""
+        # Normalize spaces to avoid broken patterns due to extra whitespace
+        text = WHITESPACE_RE.sub(" ", text.strip())
+        if not text:
+            return
+        buffer = f"{self._carry} {text}" if self._carry else text
+
+        # Every split segment after the first starts with "Mon-YYYY DD-MM-YYYY"; the
+        # first one is either empty (we were inside a row) or header text to drop
+        rows = TRANSACTION_SPLIT_RE.split(buffer)[1:]
+        if not rows:
+            # Keep the last two tokens, in case a row start straddles the chunk boundary
+            self._carry = " ".join(buffer.rsplit(" ", 2)[-2:])
+            return
+
+        self._in_rows = True
+        for row in rows[:-1]:
+            self._parse_row(row)
+        self._carry = rows[-1].rstrip()
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """Parse the final carried-over row and return all transactions."""
+        if self._in_rows and self._carry:
+            self._parse_row(self._carry)
+        self._carry = ""
+        return self.transactions
+
+    def _parse_row(self, row: str):
+        line = row.strip()
+        if line and TRANSACTION_START_RE.match(line):
+            self.parser.parse_transaction_line(line, self.year, self.transactions)
+
+
+class ColumnLayoutError(ValueError):
+    """A passbook page whose transaction rows do not fit the column grid."""
+
+
+class ColumnRowStream:
+    """
+    Incremental transaction parser for the "columns" extraction mode.
+
+    Lines of positioned words are fed page by page. Each line is cut into the passbook
+    columns by x position, so a row's fields come straight from its cells and no regex
+    has to find where the description ends and the amounts begin. A line with text
+    only in the particulars column continues the description of the row above it,
+    which is how wrapped descriptions are printed.
+
+    The column positions are read from the table header of each page (the defaults
+    are used until a header is seen). A page with a line that reads like a
+    transaction but does not land in the month / date / type cells raises
+    ColumnLayoutError, rather than the row being dropped.
+    """
+
+    def __init__(
+        self,
+        parser: "EPFOMultiYearParser",
+        year: str,
+        columns: Tuple[Tuple[str, float], ...] = PASSBOOK_COLUMNS,
+    ):
+        self.parser = parser
+        self.year = year
+        self.transactions = []
+        self._names = [name for name, _ in columns]
+        self._bounds = [x for _, x in columns[1:]]
+        self._particulars = self._names.index("particulars")
+        self._open = None
+        self._pages = 0
+
+    def feed(self, lines: Iterable[List[Tuple[float, float, str]]]):
+        """Add one page of (x0, x1, text) word lines, top to bottom."""
+        self._pages += 1
+        missed = 0
+        for words in lines:
+            cells = [[] for _ in self._names]
+            for x0, x1, text in words:
+                cells[bisect.bisect_right(self._bounds, (x0 + x1) / 2)].append(text)
+            cells = [" ".join(cell) for cell in cells]
+
+            if (
+                WAGE_MONTH_CELL_RE.fullmatch(cells[0])
+                and DATE_CELL_RE.fullmatch(cells[1])
+                and cells[2].upper() in ("CR", "DR")
+            ):
+                self._close()
+                self._open = cells
+                continue
+
+            line = " ".join(word[2] for word in words)
+            if GRID_ROW_TEXT_RE.match(line):
+                missed += 1
+                self._close()
+            elif self._open is not None and cells[self._particulars] and not any(
+                cell for i, cell in enumerate(cells) if i != self._particulars
+            ):
+                open_cell = self._open[self._particulars]
+                continued = cells[self._particulars]
+                self._open[self._particulars] = (
+                    f"{open_cell} {continued}" if open_cell else continued
+                )
+            else:
+                self._close()
+                if "particulars" in line.lower():
+                    self._read_header(words, line)
+
+        if missed:
+            raise ColumnLayoutError(
+                f"page {self._pages}: {missed} transaction line(s) do not fit the column layout"
+            )
+
+    def _read_header(self, words: List[Tuple[float, float, str]], line: str):
+        """Take the column positions from a table header line, if it is one."""
+        starts = []
+        offset = 0
+        for word in words:
+            starts.append(offset)
+            offset += len(word[2]) + 1
+
+        xs = {}
+        pos = 0
+        for name, pattern in PASSBOOK_HEADER_RES:
+            match = pattern.search(line, pos)
+            if match is None:
+                return
+            xs[name] = words[bisect.bisect_right(starts, match.start()) - 1][0]
+            pos = match.end()
+
+        columns = [xs.get(name) for name in self._names]
+        if None not in columns and all(a < b for a, b in zip(columns, columns[1:])):
+            self._bounds = columns[1:]
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """Emit the last open row and return all transactions."""
+        self._close()
+        return self.transactions
+
+    def _close(self):
+        if self._open is not None:
+            cells = dict(zip(self._names, self._open))
+            self.transactions.append(self.parser.transaction_from_cells(cells, self.year))
+            self._open = None
+
+
+# Fields a TransactionStore keeps in typed columns: interned strings and 64-bit integers
+TRANSACTION_TEXT_FIELDS = frozenset((
+    "year", "month", "date", "type", "description", "due_month_code", "old_member_id",
+))
+TRANSACTION_AMOUNT_FIELDS = (
+    "wages", "basic_wages", "employee_contribution", "employer_contribution",
+    "pension_contribution", "employee_withdrawal", "employer_withdrawal",
+    "pension_withdrawal", "total_withdrawal",
+)
+# Parsed forms of "date" and "month", stored next to the display strings
+TRANSACTION_DATE_FIELDS = ("date_ordinal", "wage_month_key")
+TRANSACTION_INT_FIELDS = frozenset(TRANSACTION_AMOUNT_FIELDS + TRANSACTION_DATE_FIELDS)
+_TEXT, _AMOUNT, _EXTRA = 0, 1, 2
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+# Description of monthly contribution rows, whose latest date decides is_active
+CONTRIBUTION_DESCRIPTION = "Cont. For Due-Month"
+# Keys of each yearly_summaries entry, in the order consolidate_data writes them
+YEARLY_SUMMARY_FIELDS = ("year",) + tuple(
+    f"{part}_{fund}"
+    for part in ("opening", "contributions", "transfer_ins", "withdrawals", "interest", "closing")
+    for fund in ("employee", "employer", "pension", "total")
+) + ("transactions_count",)
+MONTH_NUMBERS = {
+    name: number for number, name in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1
+    )
+}
+
+
+@lru_cache(maxsize=4096)
+def date_ordinal(date: str) -> int:
+    """Day number (datetime.toordinal) of a DD-MM-YYYY date, or 0 if it is not a valid date."""
+    try:
+        day, month, year = date.split("-")
+        return datetime(int(year), int(month), int(day)).toordinal()
+    except (AttributeError, ValueError):
+        return 0
+
+
+@lru_cache(maxsize=1024)
+def wage_month_key(month: str) -> int:
+    """Sortable year * 12 + month - 1 key of a Mon-YYYY wage month, or 0 if unrecognised."""
+    try:
+        name, year = month.split("-")
+        return int(year) * 12 + MONTH_NUMBERS[name.lower()] - 1
+    except (AttributeError, KeyError, ValueError):
+        return 0
+
+
+def with_date_keys(record: Mapping) -> Mapping:
+    """
+    A transaction with date_ordinal and wage_month_key, placed after its "date" as the
+    extractors do; records that already have both are returned as they are.
+    """
+    if "date_ordinal" in record and "wage_month_key" in record:
+        return record
+    out = {}
+    for key, value in record.items():
+        if key not in TRANSACTION_DATE_FIELDS:
+            out[key] = value
+        if key == "date":
+            out["date_ordinal"] = date_ordinal(value)
+            out["wage_month_key"] = wage_month_key(record.get("month"))
+    if "date" not in record:
+        out["date_ordinal"] = 0
+        out["wage_month_key"] = wage_month_key(record.get("month"))
+    return out
+
+
+class InternTable:
+    """Maps hashable values (strings, row shapes) to dense integer codes; code 0 is None."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self):
+        self.values: List[Any] = [None]
+        self._codes: Dict[Any, int] = {}
+
+    def code(self, value: Any) -> int:
+        if value is None:
+            return 0
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def find(self, value: Any) -> Optional[int]:
+        """Return the code of value, or None if it was never interned."""
+        return 0 if value is None else self._codes.get(value)
+
+
+class TransactionRow(Mapping):
+    """Read-only, dict-like view of one row of a TransactionStore."""
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "TransactionStore", index: int):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return self._store._value(self._index, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key, _ in self._store._shape(self._index))
+
+    def __len__(self) -> int:
+        return len(self._store._shape(self._index))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._store._row_dict(self._index)
+
+    def __repr__(self) -> str:
+        return f"TransactionRow({self.to_dict()!r})"
+
+
+class _ShapePartition:
+    """The rows of a TransactionStore that share one shape, one column per key."""
+
+    __slots__ = ("keys", "columns", "index")
+
+    def __init__(self, shape: Tuple[Tuple[str, int], ...]):
+        self.keys = shape
+        self.columns = [
+            array("I") if kind == _TEXT else array("q") if kind == _AMOUNT else []
+            for _, kind in shape
+        ]
+        self.index = {key: (position, kind) for position, (key, kind) in enumerate(shape)}
+
+
+def _shape_field_names(table: InternTable, shape_codes: Iterable[int]) -> List[str]:
+    """Keys of the given row shapes, in order of first appearance."""
+    names = {}
+    for code in dict.fromkeys(shape_codes):
+        for key, _ in table.values[code]:
+            names[key] = None
+    return list(names)
+
+
+class TransactionStore:
+    """
+    Compact, column-oriented container for transaction records.
+
+    A row's shape is the ordered (key, kind) pairs it was appended with; a
+    contribution, a transfer and a withdrawal each have their own. Rows are kept in
+    one partition per shape, which holds a typed column per key: known string fields
+    as array('I') codes into an InternTable shared by all stores of a parser, amount
+    fields as array('q'), and anything that does not fit a typed column as a plain
+    list. Two small arrays record each row's shape and position, so insertion order
+    is preserved and conversion back to dicts is lossless.
+
+    A typical row costs well under a hundred bytes instead of a dict of boxed values.
+    Iterating yields TransactionRow views that behave like read-only dicts.
+    """
+
+    def __init__(
+        self,
+        table: Optional[InternTable] = None,
+        records: Optional[Iterable[Any]] = None,
+    ):
+        self.table = table if table is not None else InternTable()
+        self._partitions: Dict[int, _ShapePartition] = {}
+        self._shapes = array("I")
+        self._positions = array("I")
+        if records is not None:
+            self.extend(records)
+
+    def __len__(self) -> int:
+        return len(self._shapes)
+
+    def __iter__(self) -> Iterator[TransactionRow]:
+        return (TransactionRow(self, index) for index in range(len(self._shapes)))
+
+    def __getitem__(self, index: int) -> TransactionRow:
+        if index < 0:
+            index += len(self._shapes)
+        if not 0 <= index < len(self._shapes):
+            raise IndexError("transaction index out of range")
+        return TransactionRow(self, index)
+
+    def append(self, record: Union[Dict[str, Any], Mapping]):
+        """Append one transaction record (a dict or a row view)."""
+        code = self.table.code
+        shape = []
+        values = []
+        for key, value in record.items():
+            if key in TRANSACTION_TEXT_FIELDS and (value is None or type(value) is str):
+                shape.append((key, _TEXT))
+                values.append(code(value))
+            elif (
+                type(value) is int
+                and key in TRANSACTION_INT_FIELDS
+                and _INT64_MIN <= value <= _INT64_MAX
+            ):
+                shape.append((key, _AMOUNT))
+                values.append(value)
+            else:
+                shape.append((key, _EXTRA))
+                values.append(value)
+
+        shape_code = code(tuple(shape))
+        partition = self._partition(shape_code)
+        self._shapes.append(shape_code)
+        self._positions.append(len(partition.columns[0]) if values else 0)
+        for column, value in zip(partition.columns, values):
+            column.append(value)
+
+    def extend(self, records: Iterable[Any]):
+        """Append many records; another store sharing this one's table is copied column-wise."""
+        if not (isinstance(records, TransactionStore) and records.table is self.table):
+            for record in records:
+                self.append(record)
+            return
+
+        offsets = {}
+        for shape_code, other in records._partitions.items():
+            partition = self._partition(shape_code)
+            offsets[shape_code] = len(partition.columns[0]) if partition.columns else 0
+            for column, other_column in zip(partition.columns, other.columns):
+                column.extend(other_column)
+        self._positions.extend(
+            position + offsets[shape_code]
+            for shape_code, position in zip(records._shapes, records._positions)
+        )
+        self._shapes.extend(records._shapes)
+
+    def column_sum(self, field: str, transaction_type: Optional[str] = None) -> int:
+        """Sum an amount column, optionally over rows of one transaction type ("CR"/"DR")."""
+        type_code = None
+        if transaction_type is not None:
+            type_code = self.table.find(transaction_type)
+            if type_code is None:
+                return 0
+
+        total = 0
+        for partition in self._partitions.values():
+            position, kind = partition.index.get(field, (None, None))
+            if kind != _AMOUNT:
+                continue
+            column = partition.columns[position]
+            if type_code is None:
+                total += sum(column)
+                continue
+            type_position, type_kind = partition.index.get("type", (None, None))
+            if type_kind != _TEXT:
+                continue
+            types = partition.columns[type_position]
+            total += sum(value for value, code in zip(column, types) if code == type_code)
+        return total
+
+    def column_sums(self, fields: Iterable[str] = TRANSACTION_AMOUNT_FIELDS) -> Dict[str, int]:
+        """Sum several amount columns at once."""
+        return {field: self.column_sum(field) for field in fields}
+
+    def column_max(
+        self, field: str, where_field: str, where_value: Optional[str]
+    ) -> Optional[int]:
+        """Largest value of an integer column among rows whose text where_field equals where_value."""
+        code = self.table.find(where_value)
+        if code is None:
+            return None
+        best = None
+        for partition in self._partitions.values():
+            position, kind = partition.index.get(field, (None, None))
+            where_position, where_kind = partition.index.get(where_field, (None, None))
+            if kind != _AMOUNT or where_kind != _TEXT:
+                continue
+            codes = partition.columns[where_position]
+            values = [value for value, c in zip(partition.columns[position], codes) if c == code]
+            if values and (best is None or max(values) > best):
+                best = max(values)
+        return best
+
+    def count(self, field: str, value: Optional[str]) -> int:
+        """Count rows whose text field equals value (e.g. count("type", "DR"))."""
+        code = self.table.find(value)
+        if code is None:
+            return 0
+        total = 0
+        for partition in self._partitions.values():
+            position, kind = partition.index.get(field, (None, None))
+            if kind == _TEXT:
+                total += partition.columns[position].count(code)
+        return total
+
+    def field_names(self) -> List[str]:
+        """Every key the rows use, in order of first appearance (as DataFrame columns are)."""
+        return _shape_field_names(self.table, self._shapes)
+
+    def iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        """Yield every row as a plain dict, in the shape it was appended with."""
+        for index in range(len(self._shapes)):
+            yield self._row_dict(index)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Return the rows as a list of dicts (the consolidated JSON shape)."""
+        return list(self.iter_dicts())
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the typed columns (excluding the shared table)."""
+        total = self._shapes.itemsize * len(self._shapes) * 2
+        for partition in self._partitions.values():
+            for column in partition.columns:
+                if isinstance(column, array):
+                    total += column.itemsize * len(column)
+        return total
+
+    def _partition(self, shape_code: int) -> _ShapePartition:
+        partition = self._partitions.get(shape_code)
+        if partition is None:
+            partition = self._partitions[shape_code] = _ShapePartition(
+                self.table.values[shape_code]
+            )
+        return partition
+
+    def _shape(self, index: int) -> Tuple[Tuple[str, int], ...]:
+        return self.table.values[self._shapes[index]]
+
+    def _value(self, index: int, key: str) -> Any:
+        partition = self._partitions[self._shapes[index]]
+        position, kind = partition.index[key]
+        value = partition.columns[position][self._positions[index]]
+        return self.table.values[value] if kind == _TEXT else value
+
+    def _row_dict(self, index: int) -> Dict[str, Any]:
+        values = self.table.values
+        partition = self._partitions[self._shapes[index]]
+        row_position = self._positions[index]
+        row = {}
+        for (key, kind), column in zip(partition.keys, partition.columns):
+            value = column[row_position]
+            row[key] = values[value] if kind == _TEXT else value
+        return row
+
+
+class TransactionRange:
+    """A contiguous run of rows of a TransactionStore, e.g. one year of all_transactions."""
+
+    __slots__ = ("store", "start", "stop")
+
+    def __init__(self, store: TransactionStore, start: int, stop: int):
+        self.store = store
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __iter__(self) -> Iterator[TransactionRow]:
+        store = self.store
+        return (TransactionRow(store, index) for index in range(self.start, self.stop))
+
+    def __getitem__(self, index: int) -> TransactionRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("transaction index out of range")
+        return TransactionRow(self.store, self.start + index)
+
+    def count(self, field: str, value: Optional[str]) -> int:
+        """Count rows whose text field equals value (e.g. count("type", "DR"))."""
+        return sum(1 for row in self if row.get(field) == value)
+
+    def column_max(
+        self, field: str, where_field: str, where_value: Optional[str]
+    ) -> Optional[int]:
+        """Largest value of an integer column among rows whose text where_field equals where_value."""
+        return max(
+            (row[field] for row in self if field in row and row.get(where_field) == where_value),
+            default=None,
+        )
+
+    def field_names(self) -> List[str]:
+        return _shape_field_names(self.store.table, self.store._shapes[self.start:self.stop])
+
+    def iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        for index in range(self.start, self.stop):
+            yield self.store._row_dict(index)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return list(self.iter_dicts())
+
 
 class EPFOMultiYearParser:
     """Enhanced EPFO PDF parser for processing multiple years and generating consolidated reports."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[PDFResultCache] = None,
+        streaming: bool = False,
+        backend: str = DEFAULT_BACKEND,
+        mode: str = "text",
+        page_jobs: int = 1,
+    ):
+        if mode not in EXTRACTION_MODES:
+            raise ValueError(
+                f"Unknown extraction mode {mode!r} (choose from {', '.join(EXTRACTION_MODES)})"
+            )
+        self.cache = cache
+        self.streaming = streaming
+        self.backend = get_backend(backend)
+        self.mode = mode
+        # Worker processes each PDF's pages are extracted in (1: in this process)
+        self.page_jobs = page_jobs
         self.member_info = {}
         self.yearly_data = {}
+        # Shared by every TransactionStore of this parser so stores merge column-wise
+        self.intern_table = InternTable()
         self.consolidated_data = {
             "member_info": {},
             "yearly_summaries": [],
-            "all_transactions": [],
+            "all_transactions": TransactionStore(self.intern_table),
             "final_balances": {},
             "total_withdrawals": {
                 "employee": 0,
@@ -68,57 +1034,58 @@ class EPFOMultiYearParser:
         except (ValueError, TypeError):
             return 0
 
+    @profiled("clean_text", size_arg=1)
     def clean_text(self, text: str) -> str:
         """Remove Hindi characters and clean up text."""
         if not text:
             return ""
         # Remove Hindi unicode characters
-        cleaned = re.sub(r"[\u0900-\u097F]", "", text)
+        cleaned = HINDI_CHARS_RE.sub("", text)
         # Remove extra spaces and special characters
-        cleaned = re.sub(r"\s+", " ", cleaned).strip()
+        cleaned = WHITESPACE_RE.sub(" ", cleaned).strip()
         return cleaned
 
     def extract_year_from_filename(self, filename: str) -> Optional[str]:
         """Extract year from filename like MHBAN20138650000010289_2021.pdf"""
-        match = re.search(r"_(\d{4})\.pdf$", filename)
+        match = FILENAME_YEAR_RE.search(filename)
         return match.group(1) if match else None
 
+    @profiled("extract_member_info_from_text", size_arg=1)
     def extract_member_info_from_text(self, text: str) -> Dict[str, Any]:
         """Extract member information from EPFO PDF plain text."""
         info = {}
 
         # Establishment ID and Name (stop at newline or "Member ID")
-        est_match = re.search(
-            r"Establishment ID/Name\s+([A-Z]{5}\d{10})\s*/\s*(.*?)(?=\s+lnL; vkbZMh@uke|Member ID/Name|$)",
-            text,
-            re.DOTALL,
-        )
+        est_match = ESTABLISHMENT_RE.search(text)
         if est_match:
             info["establishment_id"] = est_match.group(1).strip()
             info["establishment_name"] = est_match.group(2).strip()
 
         # Member ID and Name
-        member_match = re.search(
-            r"Member ID/Name\s+([A-Z]{5}\d{17})\s*/\s*([A-Z\s]+)", text
-        )
+        member_match = MEMBER_RE.search(text)
         if member_match:
             info["member_id"] = member_match.group(1).strip()
             info["member_name"] = member_match.group(2).strip()
 
         # Date of Birth
-        dob_match = re.search(r"Date of Birth\s+(\d{2}-\d{2}-\d{4})", text)
+        dob_match = DOB_RE.search(text)
         if dob_match:
             info["date_of_birth"] = dob_match.group(1).strip()
 
         # UAN
-        uan_match = re.search(r"UAN\s+(\d{12})", text)
+        uan_match = UAN_RE.search(text)
         if uan_match:
             info["uan"] = uan_match.group(1).strip()
 
         return info
 
+    @profiled("extract_balances_from_text", size_arg=1)
     def extract_balances_from_text(self, text: str, year: str) -> Dict[str, Any]:
         """Extract opening and closing balances from text."""
+        return self.balances_from_scanner(BalanceScanner().feed_all(text), year)
+
+    def balances_from_scanner(self, scanner: BalanceScanner, year: str) -> Dict[str, Any]:
+        """Build the balances dict for a year from a finished BalanceScanner."""
         balances = {
             "year": year,
             "opening_balance": {"employee": 0, "employer": 0, "pension": 0},
@@ -129,256 +1096,93 @@ class EPFOMultiYearParser:
             "interest": {"employee": 0, "employer": 0, "pension": 0},
         }
 
-        # Extract Opening Balance
-        ob_match = re.search(
-            r"OB Int\. Updated upto\s+\d{2}/\d{2}/\d{4}\s+([0-9,]+)\s+([0-9,]+)\s+([0-9,]+)",
-            text,
-            re.DOTALL | re.IGNORECASE,
-        )
-
-        if ob_match:
-            balances["opening_balance"]["employee"] = self.parse_amount(
-                ob_match.group(1)
-            )
-            balances["opening_balance"]["employer"] = self.parse_amount(
-                ob_match.group(2)
-            )
-            balances["opening_balance"]["pension"] = self.parse_amount(
-                ob_match.group(3)
-            )
-
-        # Extract Closing Balance
-        cb_match = re.search(
-            r"Closing Balance as on\s+\d{2}/\d{2}/\d{4}\s+([0-9,]+)\s+([0-9,]+)\s+([0-9,]+)",
-            text,
-            re.DOTALL | re.IGNORECASE,
-        )
-        if cb_match:
-            balances["closing_balance"]["employee"] = self.parse_amount(
-                cb_match.group(1)
-            )
-            balances["closing_balance"]["employer"] = self.parse_amount(
-                cb_match.group(2)
-            )
-            balances["closing_balance"]["pension"] = self.parse_amount(
-                cb_match.group(3)
-            )
-
-        # Extract Total Contributions
-        contrib_match = re.search(
-            r"Total Contributions for the year.*?(\d{1,3}(?:,\d{3})*|\d+)\s+(\d{1,3}(?:,\d{3})*|\d+)\s+(\d{1,3}(?:,\d{3})*|\d+)",
-            text,
-            re.DOTALL,
-        )
-        if contrib_match:
-            balances["contributions"]["employee"] = self.parse_amount(
-                contrib_match.group(1)
-            )
-            balances["contributions"]["employer"] = self.parse_amount(
-                contrib_match.group(2)
-            )
-            balances["contributions"]["pension"] = self.parse_amount(
-                contrib_match.group(3)
-            )
-
-        # Extract Total Withdrawals for the year
-        withdrawal_match = re.search(
-            r"Total Withdrawals for the year.*?(\d{1,3}(?:,\d{3})*|\d+)\s+(\d{1,3}(?:,\d{3})*|\d+)\s+(\d{1,3}(?:,\d{3})*|\d+)",
-            text,
-            re.DOTALL,
-        )
-        if withdrawal_match:
-            balances["withdrawals"]["employee"] = self.parse_amount(
-                withdrawal_match.group(1)
-            )
-            balances["withdrawals"]["employer"] = self.parse_amount(
-                withdrawal_match.group(2)
-            )
-            balances["withdrawals"]["pension"] = self.parse_amount(
-                withdrawal_match.group(3)
-            )
-        
-        # --- Total Transfer-Ins/VDRs ---
-        transfer_match = re.search(
-        r"Total Transfer-Ins/VDRs for the year.*?(\d{1,3}(?:,\d{3})*|\d+)\s+(\d{1,3}(?:,\d{3})*|\d+)\s+(\d{1,3}(?:,\d{3})*|\d+)",
-        text, re.DOTALL
-        )
-        if transfer_match:
-            balances["transfer_ins"]["employee"] = self.parse_amount(
-                transfer_match.group(1)
-            )
-            balances["transfer_ins"]["employer"] = self.parse_amount(
-                transfer_match.group(2)
-            )
-            balances["transfer_ins"]["pension"] = self.parse_amount(
-                transfer_match.group(3)
-            )
-
-        # FIXED: Extract Interest - Handle multiple patterns
-        interest_found = False
-    
-        # Pattern 1: "Int. given against Claim" format (HIGHEST PRIORITY - most specific)
-        claim_int_match = re.search(
-            r"Int\.\s*given\s*against\s*Claim\s*:?\s*(?:\S+\s+)?"
-            r"(\d{1,3}(?:,\d{3})*|\d+)\s+"
-            r"(\d{1,3}(?:,\d{3})*|\d+)\s+"
-            r"(\d{1,3}(?:,\d{3})*|\d+)",
-            text,
-            re.DOTALL | re.IGNORECASE,
-        )
-        if claim_int_match:
-            balances["interest"]["employee"] = self.parse_amount(claim_int_match.group(1))
-            balances["interest"]["employer"] = self.parse_amount(claim_int_match.group(2))
-            balances["interest"]["pension"] = self.parse_amount(claim_int_match.group(3))
-            interest_found = True
-            #print(f"DEBUG: Found claim interest pattern (PRIORITY) - Employee: {balances['interest']['employee']}, Employer: {balances['interest']['employer']}, Pension: {balances['interest']['pension']}")
-
-        # Pattern 2: Standard "Int. Updated upto" format (exclude OB lines) - LOWER PRIORITY
-        if not interest_found:
-            # More specific pattern to avoid taxable data section
-            int_match = re.search(
-                r"(?<!OB\s)Int\. Updated upto\s+\d{2}/\d{2}/\d{4}\s+([0-9,]+)\s+([0-9,]+)\s+([0-9,]+)(?=\s*Closing Balance)",
-                text,
-                re.DOTALL | re.IGNORECASE,
-            )
-            if int_match:
-                balances["interest"]["employee"] = self.parse_amount(int_match.group(1))
-                balances["interest"]["employer"] = self.parse_amount(int_match.group(2))
-                balances["interest"]["pension"] = self.parse_amount(int_match.group(3))
-                interest_found = True
-                #print(f"DEBUG: Found standard interest pattern - Employee: {balances['interest']['employee']}, Employer: {balances['interest']['employer']}, Pension: {balances['interest']['pension']}")
-
-            # Fallback for standard pattern without "Closing Balance" lookahead
-            if not interest_found:
-                int_match_fallback = re.search(
-                    r"(?<!OB\s)(?<!Taxable Data)Int\. Updated upto\s+\d{2}/\d{2}/\d{4}\s+([0-9,]+)\s+([0-9,]+)\s+([0-9,]+)",
-                    text,
-                    re.DOTALL | re.IGNORECASE,
-                )
-                if int_match_fallback:
-                    balances["interest"]["employee"] = self.parse_amount(int_match_fallback.group(1))
-                    balances["interest"]["employer"] = self.parse_amount(int_match_fallback.group(2))
-                    balances["interest"]["pension"] = self.parse_amount(int_match_fallback.group(3))
-                    interest_found = True
-                    #print(f"DEBUG: Found standard interest pattern (fallback) - Employee: {balances['interest']['employee']}, Employer: {balances['interest']['employer']}, Pension: {balances['interest']['pension']}")
-
-        # Pattern 3: Generic interest pattern (fallback)
-        if not interest_found:
-            generic_int_match = re.search(
-                r"(?:Int\.|Interest)(?:.*?)(\d{1,3}(?:,\d{3})*)\s+(\d{1,3}(?:,\d{3})*)\s+(\d{1,3}(?:,\d{3})*)",
-                text,
-                re.DOTALL | re.IGNORECASE,
-            )
-            if generic_int_match:
-                # Only use this if the amounts seem reasonable (not too large)
-                emp_int = self.parse_amount(generic_int_match.group(1))
-                empr_int = self.parse_amount(generic_int_match.group(2))
-                pen_int = self.parse_amount(generic_int_match.group(3))
-            
-                # Sanity check - interest shouldn't be larger than contributions typically
+        def fill(field, amounts):
+            balances[field]["employee"] = self.parse_amount(amounts[0])
+            balances[field]["employer"] = self.parse_amount(amounts[1])
+            balances[field]["pension"] = self.parse_amount(amounts[2])
+
+        if scanner.opening:
+            fill("opening_balance", scanner.opening)
+        if scanner.closing:
+            fill("closing_balance", scanner.closing)
+        for field, amounts in scanner.year_totals.items():
+            fill(field, amounts)
+
+        # Interest sources, in priority order:
+        # 1. "Int. given against Claim" (most specific)
+        # 2. "Int. Updated upto" followed by Closing Balance, then without that lookahead
+        # 3. Generic "Int."/"Interest" amounts, if they pass a sanity check
+        # 4. The last generic interest amounts in the document (last resort)
+        interest_found = True
+        if scanner.claim_interest:
+            fill("interest", scanner.claim_interest)
+        elif scanner.interest:
+            fill("interest", scanner.interest)
+        elif scanner.interest_fallback:
+            fill("interest", scanner.interest_fallback)
+        else:
+            interest_found = False
+            if scanner.generic_interest:
+                amounts = [self.parse_amount(a) for a in scanner.generic_interest]
+                # Interest shouldn't be more than 50% of contributions
                 total_contrib = sum(balances["contributions"].values())
-                total_int = emp_int + empr_int + pen_int
-            
-                if total_contrib == 0 or total_int <= total_contrib * 0.5:  # Interest shouldn't be more than 50% of contributions
-                    balances["interest"]["employee"] = emp_int
-                    balances["interest"]["employer"] = empr_int
-                    balances["interest"]["pension"] = pen_int
+                if total_contrib == 0 or sum(amounts) <= total_contrib * 0.5:
+                    fill("interest", scanner.generic_interest)
                     interest_found = True
-                    #print(f"DEBUG: Found generic interest pattern - Employee: {balances['interest']['employee']}, Employer: {balances['interest']['employer']}, Pension: {balances['interest']['pension']}")
-
-        # Pattern 4: Look for interest in individual transaction lines (last resort)
-        if not interest_found:
-            # Search for any line that mentions interest with amounts
-            int_transaction_matches = re.findall(
-                r"(?:Interest|Int\.).*?(\d{1,3}(?:,\d{3})*)\s+(\d{1,3}(?:,\d{3})*)\s+(\d{1,3}(?:,\d{3})*)",
-                text,
-                re.IGNORECASE | re.DOTALL
-            )
-        
-            if int_transaction_matches:
-                # Take the last match (usually the summary)
-                last_match = int_transaction_matches[-1]
-                balances["interest"]["employee"] = self.parse_amount(last_match[0])
-                balances["interest"]["employer"] = self.parse_amount(last_match[1])
-                balances["interest"]["pension"] = self.parse_amount(last_match[2])
-                #print(f"DEBUG: Found interest from transaction lines - Employee: {balances['interest']['employee']}, Employer: {balances['interest']['employer']}, Pension: {balances['interest']['pension']}")
-
-        # Debug output if no interest found
+            if not interest_found and scanner.last_interest:
+                fill("interest", scanner.last_interest)
+
         if not interest_found and sum(balances["interest"].values()) == 0:
-            #print(f"DEBUG: No interest patterns matched for year {year}")
-            # Print relevant lines for debugging
-            lines = text.split('\n')
-            interest_lines = [line for line in lines if 'int' in line.lower() and any(c.isdigit() for c in line)]
-            #print(f"DEBUG: Lines containing 'int' and numbers:")
-            for line in interest_lines[:5]:  # Show first 5 matches
-                print(f"  {line.strip()}")
+            logger.debug(f"No interest patterns matched for year {year}")
 
         return balances
 
+    @profiled("extract_transactions_from_text", size_arg=1)
     def extract_transactions_from_text(self, text: str, year: str) -> List[Dict[str, Any]]:
-        """Extract transactions from EPFO passbook text with detailed debug logging."""
-        transactions = []
-
-        # print("\n--- DEBUG: Starting transaction extraction ---")
-        # print(f"Input year: {year}")
-        # print(f"Total raw characters: {len(text)}")
-        # print(f"Total raw lines: {len(text.splitlines())}")
-
-        # Normalize spaces to avoid broken patterns due to extra whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
-
-        # Step 1: Consolidate transactions line-by-line
-        consolidated_lines = []
-        current_transaction = ""
-        lines = re.split(r'(?=[A-Za-z]{3}-\d{4}\s+\d{2}-\d{2}-\d{4})', text)
-
-        # print("\n--- DEBUG: Consolidating lines ---")
-        for idx, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
-
-            if re.match(r'^[A-Za-z]{3}-\d{4}\s+\d{2}-\d{2}-\d{4}', line, re.IGNORECASE):
-                if current_transaction:
-                    consolidated_lines.append(current_transaction.strip())
-                    #print(f"  >> Saved transaction [{len(consolidated_lines)-1}]: {current_transaction.strip()}")
-                current_transaction = line
-                #print(f"  New transaction start at split segment {idx}")
-            else:
-                if current_transaction:
-                    current_transaction += " " + line
-                    #print(f"    Continuation: {line}")
-
-        if current_transaction:
-            consolidated_lines.append(current_transaction.strip())
-            #print(f"  >> Saved final transaction [{len(consolidated_lines)-1}]: {current_transaction.strip()}")
-
-        #print(f"\n--- DEBUG: Total consolidated transactions: {len(consolidated_lines)} ---")
+        """Extract transactions from EPFO passbook text."""
+        stream = TransactionStream(self, year)
+        stream.feed(text)
+        return stream.finish()
+
+    def parse_transaction_line(self, line: str, year: str, transactions: list):
+        """Parse one consolidated "Mon-YYYY DD-MM-YYYY ..." row and append what it yields."""
+        parse_amount = self.parse_amount
+
+        # Classify the line once, then try only the patterns that can match
+        dispatch = TRANSACTION_DISPATCH_RE.match(line)
+        if not dispatch:
+            return
+
+        if dispatch.group("dr"):
+            dr_match = DR_RE.match(line)
+            if dr_match:
+                employee = parse_amount(dr_match.group(6))
+                employer = parse_amount(dr_match.group(7))
+                pension = parse_amount(dr_match.group(8))
+                transactions.append({
+                    "year": year,
+                    "month": dr_match.group(1),
+                    "date": dr_match.group(2),
+                    "date_ordinal": date_ordinal(dr_match.group(2)),
+                    "wage_month_key": wage_month_key(dr_match.group(1)),
+                    "type": "DR",
+                    "description": dr_match.group(3).strip(),
+                    "employee_withdrawal": employee,
+                    "employer_withdrawal": employer,
+                    "pension_withdrawal": pension,
+                    "total_withdrawal": employee + employer + pension,
+                })
+            return
 
-        # Step 3: Pattern matching
-        for line_num, line in enumerate(consolidated_lines):
+        if dispatch.group("keyword"):
             self.extract_transfer_transactions(line, year, transactions)
-            if not re.match(r'^[A-Za-z]{3}-\d{4}\s+\d{2}-\d{2}-\d{4}', line, re.IGNORECASE):
-                continue
 
             # --- Transfer Pattern ---
-            transfer_pattern = re.compile(r'''
-                ([A-Za-z]{3}-\d{4})\s+               
-                (\d{2}-\d{2}-\d{4})\s+               
-                CR\s+                                  
-                (TRANSFER\s+IN\s+-\s+.*?)\s+          
-                (\d+(?:,\d{3})*|0)\s+                   
-                (\d+(?:,\d{3})*|0)\s+                   
-                (\d+(?:,\d{3})*|0)\s+                   
-                (\d+(?:,\d{3})*|0)\s+                   
-                (\d+(?:,\d{3})*|0)                      
-            ''', re.IGNORECASE | re.VERBOSE)
-
-            transfer_match = transfer_pattern.search(line)
+            transfer_match = TRANSFER_IN_RE.match(line)
             if transfer_match:
                 desc = transfer_match.group(3).strip()
                 old_member_id = None
-                old_id_match = re.search(r'Old\s+Member\s+Id\s*[:-]?\s*([A-Z0-9]+)', desc, re.IGNORECASE)
+                old_id_match = OLD_MEMBER_ID_RES[0].search(desc)
                 if old_id_match:
                     old_member_id = old_id_match.group(1)
 
@@ -386,168 +1190,113 @@ class EPFOMultiYearParser:
                     "year": year,
                     "month": transfer_match.group(1),
                     "date": transfer_match.group(2),
+                    "date_ordinal": date_ordinal(transfer_match.group(2)),
+                    "wage_month_key": wage_month_key(transfer_match.group(1)),
                     "type": "CR",
                     "description": desc,
                     "old_member_id": old_member_id,
-                    "wages": self.parse_amount(transfer_match.group(4)),
-                    "basic_wages": self.parse_amount(transfer_match.group(5)),
-                    "employee_contribution": self.parse_amount(transfer_match.group(6)),
-                    "employer_contribution": self.parse_amount(transfer_match.group(7)),
-                    "pension_contribution": self.parse_amount(transfer_match.group(8))
-                })
-                continue
-            #else:
-                #print("  ✗ TRANSFER pattern did not match.")
-
-            # --- Regular CR Pattern ---
-            cr_pattern = re.compile(r'''
-                ([A-Za-z]{3}-\d{4})\s+               
-                (\d{2}-\d{2}-\d{4})\s+               
-                CR\s+                                  
-                (?!TRANSFER)                           
-                (.*?)\s+                               
-                (\d{6})\s+                             
-                ([\d,]+)\s+                            
-                ([\d,]+)\s+                            
-                ([\d,]+)\s+                            
-                ([\d,]+)\s+                            
-                ([\d,]+)                               
-            ''', re.IGNORECASE | re.VERBOSE)
-
-            cr_match = cr_pattern.search(line)
-            if cr_match:
-                transactions.append({
-                    "year": year,
-                    "month": cr_match.group(1),
-                    "date": cr_match.group(2),
-                    "type": "CR",
-                    "description": cr_match.group(3).strip(),
-                    "due_month_code": cr_match.group(4),
-                    "wages": self.parse_amount(cr_match.group(5)),
-                    "basic_wages": self.parse_amount(cr_match.group(6)),
-                    "employee_contribution": self.parse_amount(cr_match.group(7)),
-                    "employer_contribution": self.parse_amount(cr_match.group(8)),
-                    "pension_contribution": self.parse_amount(cr_match.group(9))
+                    "wages": parse_amount(transfer_match.group(4)),
+                    "basic_wages": parse_amount(transfer_match.group(5)),
+                    "employee_contribution": parse_amount(transfer_match.group(6)),
+                    "employer_contribution": parse_amount(transfer_match.group(7)),
+                    "pension_contribution": parse_amount(transfer_match.group(8))
                 })
-                continue
-            #else:
-                #print("  ✗ Regular CR pattern did not match.")
-
-            # --- DR Pattern ---
-            dr_pattern = re.compile(r'''
-                ([A-Za-z]{3}-\d{4})\s+               
-                (\d{2}-\d{2}-\d{4})\s+               
-                DR\s+                                  
-                (.*?)\s+                               
-                (\d+(?:,\d{3})*)\s+                   
-                (\d+(?:,\d{3})*)\s+                   
-                ([\d,]+)\s+                            
-                ([\d,]+)\s+                            
-                ([\d,]+)                               
-            ''', re.IGNORECASE | re.VERBOSE)
-
-            dr_match = dr_pattern.search(line)
-            if dr_match:
-                transactions.append({
-                    "year": year,
-                    "month": dr_match.group(1),
-                    "date": dr_match.group(2),
-                    "type": "DR",
-                    "description": dr_match.group(3).strip(),
-                    "employee_withdrawal": self.parse_amount(dr_match.group(6)),
-                    "employer_withdrawal": self.parse_amount(dr_match.group(7)),
-                    "pension_withdrawal": self.parse_amount(dr_match.group(8)),
-                    "total_withdrawal": (
-                        self.parse_amount(dr_match.group(6)) +
-                        self.parse_amount(dr_match.group(7)) +
-                        self.parse_amount(dr_match.group(8))
-                    )
-                })
-                continue
-            #else:
-                #print("  ✗ DR pattern did not match.")
+                return
+
+        # --- Regular CR Pattern ---
+        cr_match = CR_RE.match(line)
+        if cr_match:
+            transactions.append({
+                "year": year,
+                "month": cr_match.group(1),
+                "date": cr_match.group(2),
+                "date_ordinal": date_ordinal(cr_match.group(2)),
+                "wage_month_key": wage_month_key(cr_match.group(1)),
+                "type": "CR",
+                "description": cr_match.group(3).strip(),
+                "due_month_code": cr_match.group(4),
+                "wages": parse_amount(cr_match.group(5)),
+                "basic_wages": parse_amount(cr_match.group(6)),
+                "employee_contribution": parse_amount(cr_match.group(7)),
+                "employer_contribution": parse_amount(cr_match.group(8)),
+                "pension_contribution": parse_amount(cr_match.group(9))
+            })
 
-        #print(f"\n--- DEBUG: Total transactions found: {len(transactions)} ---")
-        return transactions
+    def transaction_from_cells(self, cells: Dict[str, str], year: str) -> Dict[str, Any]:
+        """Build a transaction from one grid row's cells (the "columns" extraction mode)."""
+        parse_amount = self.parse_amount
+        description = cells["particulars"]
+        transaction = {
+            "year": year,
+            "month": cells["month"],
+            "date": cells["date"],
+            "date_ordinal": date_ordinal(cells["date"]),
+            "wage_month_key": wage_month_key(cells["month"]),
+            "type": cells["type"].upper(),
+        }
 
-    # ///
+        if transaction["type"] == "DR":
+            employee = parse_amount(cells["employee"])
+            employer = parse_amount(cells["employer"])
+            pension = parse_amount(cells["pension"])
+            transaction.update({
+                "description": description,
+                "employee_withdrawal": employee,
+                "employer_withdrawal": employer,
+                "pension_withdrawal": pension,
+                "total_withdrawal": employee + employer + pension,
+            })
+            return transaction
 
-    def extract_transfer_transactions(self, line: str, year: str, transactions: list):
-        #"""Extract transfer transactions with flexible pattern matching."""
-        #print(f"***************************************************")
-        #print(f"Full line: {line}")
-        #print(f"***************************************************")
-
-        # Pattern 1: Standard TRANSFER IN format
-        transfer_in_pattern = re.compile(r'''
-            ([A-Za-z]{3}-\d{4})\s+                # Month-Year
-            (\d{2}-\d{2}-\d{4})\s+                # Date
-            CR\s+                                 # Credit Type
-            (TRANSFER\s+IN\s+-\s+.*?)\s+          # Description
-            (\d+(?:,\d{3})*|0)\s+                 # Wages
-            (\d+(?:,\d{3})*|0)\s+                 # Basic Wages
-            (\d+(?:,\d{3})*|0)\s+                 # Employee Contribution
-            (\d+(?:,\d{3})*|0)\s+                 # Employer Contribution
-            (\d+(?:,\d{3})*|0)                    # Pension Contribution
-        ''', re.IGNORECASE | re.VERBOSE)
-
-        # Pattern 2: OFFICE format with Old Member ID at the end
-        office_transfer_pattern = re.compile(r'''
-            ([A-Za-z]{3}-\d{4})\s+                # Month-Year
-            (\d{2}-\d{2}-\d{4})\s+                # Date
-            CR\s+                                 # Credit Type
-            (OFFICE\([^)]*Old\s+Member\s+Id[^)]*\s+) # Description part before amounts
-            (\d+(?:,\d{3})*|0)\s+                 # Wages
-            (\d+(?:,\d{3})*|0)\s+                 # Basic Wages
-            (\d+(?:,\d{3})*|0)\s+                 # Employee Contribution
-            (\d+(?:,\d{3})*|0)\s+                 # Employer Contribution
-            (\d+(?:,\d{3})*|0)\s+                 # Pension Contribution
-            :([A-Z0-9]+)\s*\)                     # Old Member ID at the end
-        ''', re.IGNORECASE | re.VERBOSE)
-
-        # Pattern 3: Generic transfer pattern (catches other variations)
-        generic_transfer_pattern = re.compile(r'''
-            ([A-Za-z]{3}-\d{4})\s+                # Month-Year
-            (\d{2}-\d{2}-\d{4})\s+                # Date
-            CR\s+                                 # Credit Type
-            (.*?(?:TRANSFER|OFFICE|Old\s+Member).*?)\s+ # Any description with transfer keywords
-            (\d+(?:,\d{3})*|0)\s+                 # Wages
-            (\d+(?:,\d{3})*|0)\s+                 # Basic Wages
-            (\d+(?:,\d{3})*|0)\s+                 # Employee Contribution
-            (\d+(?:,\d{3})*|0)\s+                 # Employer Contribution
-            (\d+(?:,\d{3})*|0)                    # Pension Contribution
-            (?:.*?:([A-Z0-9]+).*?)?               # Optional Old Member ID anywhere
-        ''', re.IGNORECASE | re.VERBOSE)
+        if TRANSFER_KEYWORD_RE.search(description):
+            old_member_id = None
+            for pattern in OLD_MEMBER_ID_RES + LINE_OLD_MEMBER_ID_RES:
+                id_match = pattern.search(description)
+                if id_match:
+                    old_member_id = id_match.group(1)
+                    break
+            transaction["description"] = description
+            transaction["old_member_id"] = old_member_id
+        else:
+            # "Cont. For Due-Month 042022": the trailing code is the due month
+            head, _, code = description.rpartition(" ")
+            if len(code) == 6 and code.isdigit():
+                transaction["description"] = head
+                transaction["due_month_code"] = code
+            else:
+                transaction["description"] = description
+                transaction["due_month_code"] = None
+
+        transaction.update({
+            "wages": parse_amount(cells["wages"]),
+            "basic_wages": parse_amount(cells["basic_wages"]),
+            "employee_contribution": parse_amount(cells["employee"]),
+            "employer_contribution": parse_amount(cells["employer"]),
+            "pension_contribution": parse_amount(cells["pension"]),
+        })
+        return transaction
 
+    def extract_transfer_transactions(self, line: str, year: str, transactions: list):
+        """Extract transfer transactions with flexible pattern matching."""
         # Try Pattern 1: Standard TRANSFER IN
-        transfer_match = transfer_in_pattern.search(line)
+        transfer_match = TRANSFER_IN_RE.search(line)
         if transfer_match:
-            #print(f"  ✓ STANDARD TRANSFER IN match: {transfer_match.groups()}")
             desc = transfer_match.group(3).strip()
 
             # Extract Old Member ID from description
             old_member_id = None
-            old_id_patterns = [
-                r'Old\s+Member\s+Id\s*[:-]?\s*([A-Z0-9]+)',
-                r'Old\s+A/c\s+No\s*[:-]?\s*([A-Z0-9]+)',
-                r'Previous\s+Member\s+Id\s*[:-]?\s*([A-Z0-9]+)'
-            ]
-            
-            for pattern in old_id_patterns:
-                old_id_match = re.search(pattern, desc, re.IGNORECASE)
+            for pattern in OLD_MEMBER_ID_RES:
+                old_id_match = pattern.search(desc)
                 if old_id_match:
                     old_member_id = old_id_match.group(1)
                     break
 
-            # if old_member_id:
-            #     print(f"  >> Extracted Old Member ID: {old_member_id}")
-            # else:
-            #     print("  >> No Old Member ID found in description")
-
             transactions.append({
                 "year": year,
                 "month": transfer_match.group(1),
                 "date": transfer_match.group(2),
+                "date_ordinal": date_ordinal(transfer_match.group(2)),
+                "wage_month_key": wage_month_key(transfer_match.group(1)),
                 "type": "CR",
                 "description": desc,
                 "old_member_id": old_member_id,
@@ -560,18 +1309,17 @@ class EPFOMultiYearParser:
             return True
 
         # Try Pattern 2: OFFICE format with ID at end
-        office_match = office_transfer_pattern.search(line)
+        office_match = OFFICE_TRANSFER_RE.search(line)
         if office_match:
-            #print(f"  ✓ OFFICE TRANSFER match: {office_match.groups()}")
             desc = office_match.group(3).strip()
             old_member_id = office_match.group(9)  # ID captured at the end
-            
-            #print(f"  >> Extracted Old Member ID from end: {old_member_id}")
 
             transactions.append({
                 "year": year,
                 "month": office_match.group(1),
                 "date": office_match.group(2),
+                "date_ordinal": date_ordinal(office_match.group(2)),
+                "wage_month_key": wage_month_key(office_match.group(1)),
                 "type": "CR",
                 "description": desc + f":{old_member_id})",  # Complete description
                 "old_member_id": old_member_id,
@@ -584,32 +1332,25 @@ class EPFOMultiYearParser:
             return True
 
         # Try Pattern 3: Generic transfer pattern
-        generic_match = generic_transfer_pattern.search(line)
+        generic_match = GENERIC_TRANSFER_RE.search(line)
         if generic_match and any(keyword in line.upper() for keyword in ['TRANSFER', 'OFFICE', 'OLD MEMBER']):
-            #print(f"  ✓ GENERIC TRANSFER match: {generic_match.groups()}")
             desc = generic_match.group(3).strip()
             old_member_id = generic_match.group(9)  # Optional captured ID
-            
+
             # If ID not captured by pattern, try extracting from entire line
             if not old_member_id:
-                id_patterns = [
-                    r':([A-Z0-9]{20,})',  # Colon followed by long alphanumeric
-                    r'([A-Z]{2}[A-Z0-9]{18,})',  # State code + long alphanumeric
-                    r'Old\s+Member\s+Id[^:]*:\s*([A-Z0-9]+)',
-                ]
-                
-                for pattern in id_patterns:
-                    id_match = re.search(pattern, line, re.IGNORECASE)
+                for pattern in LINE_OLD_MEMBER_ID_RES:
+                    id_match = pattern.search(line)
                     if id_match:
                         old_member_id = id_match.group(1)
                         break
 
-            #print(f"  >> Extracted Old Member ID: {old_member_id if old_member_id else 'None'}")
-
             transactions.append({
                 "year": year,
                 "month": generic_match.group(1),
                 "date": generic_match.group(2),
+                "date_ordinal": date_ordinal(generic_match.group(2)),
+                "wage_month_key": wage_month_key(generic_match.group(1)),
                 "type": "CR",
                 "description": desc,
                 "old_member_id": old_member_id,
@@ -621,10 +1362,7 @@ class EPFOMultiYearParser:
             })
             return True
 
-        #print("  ✗ No TRANSFER pattern matched.")
         return False
-    # ///
-
 
     def process_single_pdf(self, pdf_path: str) -> Dict[str, Any]:
         """Process a single PDF file and extract data."""
@@ -635,38 +1373,214 @@ class EPFOMultiYearParser:
             return {}
 
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                # Extract all text
-                all_text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        all_text += page_text + "\n"
-
-                clean_text = self.clean_text(all_text)
-
-                # Extract member info (only if not already extracted)
-                if not self.member_info:
-                    self.member_info = self.extract_member_info_from_text(clean_text)
-
-                # Extract year-specific data
-                year_data = {
+            return self._parse_pdf(pdf_path, year)
+        except Exception as e:
+            logger.error(f"Error processing {pdf_path}: {e}")
+            return {}
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        """Keyword arguments that build a parser extracting exactly like this one."""
+        return {
+            "streaming": self.streaming,
+            "backend": self.backend.name,
+            "mode": self.mode,
+            "page_jobs": self.page_jobs,
+        }
+
+    def _parse_pdf(self, pdf_path: str, year: str) -> Dict[str, Any]:
+        """Parse one PDF for the given year, letting any error propagate."""
+        year_data, member_info = self.parse_pdf(pdf_path, year)
+        # Keep member info from the first PDF only
+        if not self.member_info:
+            self.member_info = member_info
+        return year_data
+
+    @profiled("parse_pdf")
+    def parse_pdf(
+        self, pdf_path: str, year: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Parse one PDF for the given year and return (year_data, member_info).
+
+        Does not touch the parser's member info or collected years (only the parse
+        cache, if any), so PDFs can be parsed in any order or in other processes and
+        merged afterwards with add_year_data. Errors propagate.
+        """
+        # Recorded in extraction_metadata so incremental runs can skip unchanged PDFs
+        source = {"file": os.path.basename(pdf_path), **file_fingerprint(pdf_path)}
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key_for(
+                pdf_path, year, f"{self.backend.name}:{self.mode}", source["sha256"]
+            )
+            entry = self.cache.get(cache_key)
+            if entry is not None:
+                return {
                     "year": year,
-                    "balances": self.extract_balances_from_text(clean_text, year),
-                    "transactions": self.extract_transactions_from_text(
-                        clean_text, year
-                    ),
+                    "balances": entry["balances"],
+                    "transactions": entry["transactions"],
                     "pdf_path": pdf_path,
-                }
+                    "source": source,
+                }, entry["member_info"]
+
+        parsed = None
+        if self.mode == "columns":
+            # Transaction rows are cut from positioned words, one page at a time
+            try:
+                parsed = self.parse_page_lines(self.iter_page_lines(pdf_path), year)
+            except ColumnLayoutError as e:
+                logger.warning(
+                    f"{os.path.basename(pdf_path)}: {e}; parsing it in text mode instead"
+                )
 
-                return year_data
+        if parsed is not None:
+            clean_text = None
+            member_info, balances, transactions = parsed
+        elif self.streaming:
+            # Pages are cleaned and parsed one at a time; the full text is never built
+            clean_text = None
+            member_info, balances, transactions = self.parse_pages(
+                self.iter_page_texts(pdf_path), year
+            )
+        else:
+            # Extract all text
+            all_text = "".join(
+                page_text + "\n" for page_text in self.iter_page_texts(pdf_path)
+            )
 
-        except Exception as e:
-            logger.error(f"Error processing {pdf_path}: {e}")
-            return {}
+            clean_text = self.clean_text(all_text)
+            member_info = self.extract_member_info_from_text(clean_text)
+            balances = self.extract_balances_from_text(clean_text, year)
+            transactions = self.extract_transactions_from_text(clean_text, year)
+
+        # Extract year-specific data
+        year_data = {
+            "year": year,
+            "balances": balances,
+            "transactions": transactions,
+            "pdf_path": pdf_path,
+            "source": source,
+        }
+
+        if cache_key is not None:
+            self.cache.put(
+                cache_key,
+                {
+                    "parser_version": PARSER_VERSION,
+                    "clean_text": clean_text,
+                    "member_info": member_info,
+                    "balances": year_data["balances"],
+                    "transactions": year_data["transactions"],
+                },
+            )
 
-    def process_member_folder(self, folder_path: str) -> Dict[str, Any]:
-        """Process all PDF files in a member's folder."""
+        return year_data, member_info
+
+    def iter_page_texts(self, pdf_path: str) -> Iterator[str]:
+        """Yield the raw text of each non-empty page using the selected extraction backend."""
+        if self.page_jobs > 1:
+            return self._iter_pages_parallel(pdf_path, lines=False)
+        return self.backend.iter_page_texts(pdf_path)
+
+    def iter_page_lines(self, pdf_path: str) -> Iterator[List[List[Tuple[float, float, str]]]]:
+        """Yield each non-empty page as positioned word lines (for the "columns" mode)."""
+        if self.page_jobs > 1:
+            return self._iter_pages_parallel(pdf_path, lines=True)
+        return self.backend.iter_page_lines(pdf_path)
+
+    def _iter_pages_parallel(self, pdf_path: str, lines: bool) -> Iterator[Any]:
+        """
+        Extract a PDF's pages in page_jobs worker processes, yielding them in page order.
+
+        The pages are split into one contiguous range per worker; each worker opens the
+        PDF itself and returns its range's page texts (or word lines), and the ranges
+        are yielded in order as they complete, so the parse sees the same page sequence
+        as a serial extraction.
+        """
+        page_count = self.backend.page_count(pdf_path)
+        jobs = min(self.page_jobs, page_count)
+        if jobs < 2:
+            pages = self.backend.iter_page_lines if lines else self.backend.iter_page_texts
+            yield from pages(pdf_path)
+            return
+
+        # Imported here: multiprocessing is only needed for parallel runs
+        from concurrent.futures import ProcessPoolExecutor
+
+        size = -(-page_count // jobs)
+        ranges = [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+        with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(_extract_pages_task, self.backend.name, pdf_path, page_range, lines)
+                for page_range in ranges
+            ]
+            for future in futures:
+                yield from future.result()
+
+    @profiled("parse_pages")
+    def parse_pages(
+        self, page_texts: Iterable[str], year: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Parse a passbook page by page and return (member_info, balances, transactions).
+
+        Each page is cleaned on its own and fed to an incremental balance scanner and
+        transaction parser, so only about one page of text is held at a time. Member
+        info is taken from the first page it can be found on.
+        """
+        member_info = {}
+        scanner = BalanceScanner()
+        stream = TransactionStream(self, year)
+        for page_text in page_texts:
+            cleaned = self.clean_text(page_text)
+            if not cleaned:
+                continue
+            if not member_info:
+                member_info = self.extract_member_info_from_text(cleaned)
+            scanner.feed(cleaned)
+            stream.feed(cleaned)
+
+        balances = self.balances_from_scanner(scanner.finish(), year)
+        return member_info, balances, stream.finish()
+
+    @profiled("parse_page_lines")
+    def parse_page_lines(
+        self, page_lines: Iterable[List[List[Tuple[float, float, str]]]], year: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Parse a passbook given as pages of positioned word lines (the "columns" mode).
+
+        Member info and balances come from each page's text as in parse_pages, while
+        transactions are read from the table grid by ColumnRowStream. Raises
+        ColumnLayoutError if a page's rows do not fit the grid.
+        """
+        member_info = {}
+        scanner = BalanceScanner()
+        rows = ColumnRowStream(self, year)
+        for lines in page_lines:
+            cleaned = self.clean_text(
+                "\n".join(" ".join(word[2] for word in line) for line in lines)
+            )
+            if not cleaned:
+                continue
+            if not member_info:
+                member_info = self.extract_member_info_from_text(cleaned)
+            scanner.feed(cleaned)
+            rows.feed(lines)
+
+        balances = self.balances_from_scanner(scanner.finish(), year)
+        return member_info, balances, rows.finish()
+
+    def process_member_folder(self, folder_path: str, jobs: int = 1) -> Dict[str, Any]:
+        """
+        Process all PDF files in a member's folder.
+
+        With jobs > 1 the PDFs are parsed by a pool of that many worker processes; the
+        years are still merged in filename order, so the result is the same as a
+        serial run.
+        """
         folder_path = Path(folder_path)
 
         if not folder_path.exists():
@@ -684,18 +1598,188 @@ class EPFOMultiYearParser:
         #logger.info(f"Found {len(pdf_files)} PDF files to process")
 
         # Process each PDF
-        for pdf_file in pdf_files:
-            year_data = self.process_single_pdf(str(pdf_file))
-            if year_data and year_data.get("year"):
-                self.yearly_data[year_data["year"]] = year_data
+        if jobs > 1 and len(pdf_files) > 1:
+            self._parse_pdfs_parallel([str(p) for p in pdf_files], jobs)
+        else:
+            for pdf_file in pdf_files:
+                year_data = self.process_single_pdf(str(pdf_file))
+                self.add_year_data(year_data)
 
         # Consolidate data
         self.consolidate_data()
 
         return self.consolidated_data
 
+    def _parse_pdfs_parallel(self, pdf_files: List[str], jobs: int):
+        """Parse pdf_files in a process pool and add their years in list order."""
+        # Imported here: multiprocessing is only needed for parallel runs
+        from concurrent.futures import ProcessPoolExecutor
+
+        cache_config = _cache_config(self.cache)
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pdf_files))) as executor:
+            futures = [
+                executor.submit(
+                    _parse_pdf_task, pdf_file, cache_config, self.options, PROFILER.enabled
+                )
+                for pdf_file in pdf_files
+            ]
+            for pdf_file, future in zip(pdf_files, futures):
+                try:
+                    res = future.result()
+                except Exception as e:
+                    res = {"pdf_path": pdf_file, "error": f"{type(e).__name__}: {e}"}
+                PROFILER.merge(res.get("profile"))
+                if "error" in res:
+                    logger.error(f"Error processing {pdf_file}: {res['error']}")
+                    continue
+                self.add_year_data(res["year_data"], res["member_info"])
+
+    def update_member_folder(
+        self, folder_path: str, previous: Dict[str, Any], jobs: int = 1
+    ) -> Dict[str, Any]:
+        """
+        Incrementally refresh a previous consolidated result for a member folder.
+
+        Years whose PDF is unchanged since the previous run are taken from the previous
+        result as they are; only new or changed PDFs are parsed. Totals, final balances
+        and active status are then recomputed over all years. jobs is as for
+        process_member_folder.
+        """
+        folder_path = Path(folder_path)
+        if not folder_path.exists():
+            logger.error(f"Folder not found: {folder_path}")
+            return {}
+
+        pdf_files = sorted(str(p) for p in folder_path.glob("*.pdf"))
+        if not pdf_files:
+            logger.error(f"No PDF files found in: {folder_path}")
+            return {}
+
+        changed = self.carry_over(pdf_files, previous)
+        logger.info(
+            f"Reusing {len(pdf_files) - len(changed)} unchanged year(s), "
+            f"parsing {len(changed)} PDF(s)"
+        )
+        if jobs > 1 and len(changed) > 1:
+            self._parse_pdfs_parallel(changed, jobs)
+        else:
+            for pdf_file in changed:
+                self.add_year_data(self.process_single_pdf(pdf_file))
+
+        self.consolidate_data()
+        return self.consolidated_data
+
+    def carry_over(self, pdf_files: List[str], previous: Dict[str, Any]) -> List[str]:
+        """
+        Seed this parser with the years of a previous result whose PDFs are unchanged.
+
+        A PDF is unchanged if its size and mtime match what the previous run recorded
+        in extraction_metadata["source_files"], or, when only the mtime differs, its
+        SHA-256 does. Results written by a different parser version are not reused.
+        Returns the PDFs that still have to be parsed.
+        """
+        metadata = previous.get("extraction_metadata", {})
+        if metadata.get("parser_version") != PARSER_VERSION:
+            return list(pdf_files)
+
+        recorded = metadata.get("source_files", {})
+        summaries = {s["year"]: s for s in previous.get("yearly_summaries", [])}
+        transactions_by_year: Dict[str, list] = {}
+        for transaction in previous.get("all_transactions", []):
+            transactions_by_year.setdefault(transaction.get("year"), []).append(transaction)
+
+        to_parse = []
+        for pdf_file in pdf_files:
+            year = self.extract_year_from_filename(os.path.basename(pdf_file))
+            source = recorded.get(year) if year else None
+            if (
+                source is None
+                or year not in summaries
+                or source.get("file") != os.path.basename(pdf_file)
+                or not self._source_unchanged(pdf_file, source)
+            ):
+                to_parse.append(pdf_file)
+                continue
+
+            self.add_year_data({
+                "year": year,
+                "balances": self.balances_from_summary(summaries[year]),
+                "transactions": transactions_by_year.get(year, []),
+                "pdf_path": pdf_file,
+                "source": source,
+            })
+
+        if self.yearly_data and previous.get("member_info"):
+            self.member_info = {
+                key: value
+                for key, value in previous["member_info"].items()
+                if key not in ("is_active", "last_transaction_date")
+            }
+        return to_parse
+
+    @staticmethod
+    def _source_unchanged(pdf_path: str, source: Dict[str, Any]) -> bool:
+        try:
+            stat = os.stat(pdf_path)
+        except OSError:
+            return False
+        if stat.st_size != source.get("size"):
+            return False
+        if stat.st_mtime == source.get("mtime"):
+            return True
+        # Touched but maybe not modified (e.g. re-downloaded): fall back to the hash
+        if file_sha256(pdf_path) != source.get("sha256"):
+            return False
+        source["mtime"] = stat.st_mtime
+        return True
+
+    @staticmethod
+    def balances_from_summary(summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Rebuild a year's balances dict from its entry in yearly_summaries."""
+        balances = {"year": summary["year"]}
+        for field, prefix in (
+            ("opening_balance", "opening"),
+            ("closing_balance", "closing"),
+            ("contributions", "contributions"),
+            ("withdrawals", "withdrawals"),
+            ("transfer_ins", "transfer_ins"),
+            ("interest", "interest"),
+        ):
+            balances[field] = {
+                part: summary[f"{prefix}_{part}"] for part in ("employee", "employer", "pension")
+            }
+        return balances
+
+    def add_year_data(
+        self, year_data: Dict[str, Any], member_info: Optional[Dict[str, Any]] = None
+    ):
+        """Merge one parsed year (and the member info found alongside it) into this parser."""
+        if member_info and not self.member_info:
+            self.member_info = member_info
+        if year_data and year_data.get("year"):
+            transactions = year_data["transactions"]
+            if not (
+                isinstance(transactions, TransactionStore)
+                and transactions.table is self.intern_table
+            ):
+                if not isinstance(transactions, (TransactionStore, TransactionRange)):
+                    # Rows from elsewhere (e.g. built by hand) get the parsed date keys
+                    transactions = map(with_date_keys, transactions)
+                year_data = dict(
+                    year_data,
+                    transactions=TransactionStore(self.intern_table, transactions),
+                )
+            self.yearly_data[year_data["year"]] = year_data
+
+    @profiled("consolidate_data")
     def consolidate_data(self):
-        """Consolidate data from all years."""
+        """
+        Consolidate data from all years.
+
+        Everything is gathered in one pass over the years in order: totals and yearly
+        summaries from each year's balances, and the latest contribution date (for
+        is_active) from the transactions' date_ordinal column; nothing is sorted.
+        """
         self.consolidated_data["member_info"] = self.member_info
         self.consolidated_data["extraction_metadata"]["extracted_at"] = (
             datetime.now().isoformat()
@@ -706,6 +1790,12 @@ class EPFOMultiYearParser:
         self.consolidated_data["extraction_metadata"]["years_covered"] = sorted(
             self.yearly_data.keys()
         )
+        self.consolidated_data["extraction_metadata"]["parser_version"] = PARSER_VERSION
+        self.consolidated_data["extraction_metadata"]["source_files"] = {
+            year: self.yearly_data[year]["source"]
+            for year in sorted(self.yearly_data)
+            if self.yearly_data[year].get("source")
+        }
         # Initialize is_active flag as False
         self.consolidated_data["member_info"]["is_active"] = False
         self.consolidated_data["member_info"]["last_transaction_date"] = None
@@ -713,6 +1803,7 @@ class EPFOMultiYearParser:
         # Initialize total withdrawals tracking
         total_withdrawals = {"employee": 0, "employer": 0, "pension": 0, "total": 0}
         total_withdrawal_transactions = 0
+        latest_contribution = 0
 
         # Create yearly summaries
         for year in sorted(self.yearly_data.keys()):
@@ -728,9 +1819,14 @@ class EPFOMultiYearParser:
             year_withdrawals["pension"] += balances["withdrawals"]["pension"]
 
             # Count DR transactions for withdrawal count
-            for trans in year_data["transactions"]:
-                if trans.get("type") == "DR":
-                    total_withdrawal_transactions += 1
+            total_withdrawal_transactions += year_data["transactions"].count("type", "DR")
+
+            # Latest monthly contribution so far (day ordinals; 0 means no valid date)
+            year_latest = year_data["transactions"].column_max(
+                "date_ordinal", "description", CONTRIBUTION_DESCRIPTION
+            )
+            if year_latest and year_latest > latest_contribution:
+                latest_contribution = year_latest
 
             year_withdrawals["total"] = (
                 year_withdrawals["employee"]
@@ -774,47 +1870,29 @@ class EPFOMultiYearParser:
             }
 
             self.consolidated_data["yearly_summaries"].append(summary)
-            self.consolidated_data["all_transactions"].extend(year_data["transactions"])
-
-        # Check for active status based on recent transactions
-        if self.consolidated_data["all_transactions"]:
-            # Sort transactions by date
-            all_transactions = sorted(
-                self.consolidated_data["all_transactions"],
-                key=lambda x: datetime.strptime(x["date"], "%d-%m-%Y"),
-                reverse=True
+
+            # Move the year's rows into all_transactions and keep only a view of them,
+            # so every transaction is held once
+            all_transactions = self.consolidated_data["all_transactions"]
+            start = len(all_transactions)
+            all_transactions.extend(year_data["transactions"])
+            year_data["transactions"] = TransactionRange(
+                all_transactions, start, len(all_transactions)
             )
-            
-            contribution_txns = [
-                t for t in self.consolidated_data["all_transactions"]
-                if t.get("description") == "Cont. For Due-Month"
-            ]
 
-            # Get the most recent transaction date
-            latest_transaction = all_transactions[0]
-            latest_date = datetime.strptime(latest_transaction["date"], "%d-%m-%Y")
-            
-            # Calculate the date 3 months ago from today
+        # Active if the latest contribution falls on or after the first day of the
+        # month two months back
+        if latest_contribution:
             today = datetime.now()
             three_months_ago = today.replace(day=1)  # First day of current month
-            three_months_ago = (three_months_ago.replace(month=three_months_ago.month - 2) 
-                              if three_months_ago.month > 2 
-                              else three_months_ago.replace(year=three_months_ago.year - 1, 
+            three_months_ago = (three_months_ago.replace(month=three_months_ago.month - 2)
+                              if three_months_ago.month > 2
+                              else three_months_ago.replace(year=three_months_ago.year - 1,
                                                          month=three_months_ago.month + 10))
-            
-            # Update member info with active status and last transaction date
-            if contribution_txns:
-                contribution_txns = sorted(
-                    contribution_txns,
-                    key=lambda x: datetime.strptime(x["date"], "%d-%m-%Y"),
-                    reverse=True
-                )
-                latest_contribution = contribution_txns[0]
-                latest_date = datetime.strptime(latest_contribution["date"], "%d-%m-%Y")
-
-                self.consolidated_data["member_info"]["last_transaction_date"] = latest_contribution["date"]
-                self.consolidated_data["member_info"]["is_active"] = latest_date >= three_months_ago
+            latest_date = datetime.fromordinal(latest_contribution)
 
+            self.consolidated_data["member_info"]["last_transaction_date"] = latest_date.strftime("%d-%m-%Y")
+            self.consolidated_data["member_info"]["is_active"] = latest_date >= three_months_ago
 
         # Set consolidated withdrawal totals
         self.consolidated_data["total_withdrawals"] = total_withdrawals
@@ -836,45 +1914,26 @@ class EPFOMultiYearParser:
         self.consolidated_data["extraction_metadata"]["total_transactions"] = len(
             self.consolidated_data["all_transactions"]
         )
+        if PROFILER.enabled:
+            # Stage totals so far (extraction and parsing; not this method or the writers)
+            self.consolidated_data["extraction_metadata"]["timings"] = PROFILER.summary()
 
+    @profiled("excel_write")
     def generate_excel_report(self, output_path: str):
-        """Generate Excel report with multiple sheets (requires pandas and openpyxl)."""
-        try:
-            import pandas as pd
-
-            with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-                # Member Info Sheet
-                member_df = pd.DataFrame([self.consolidated_data["member_info"]])
-                member_df.to_excel(writer, sheet_name="Member Info", index=False)
+        """
+        Generate Excel report with multiple sheets (requires openpyxl).
 
-                # Yearly Summary Sheet
-                summary_df = pd.DataFrame(self.consolidated_data["yearly_summaries"])
-                summary_df.to_excel(writer, sheet_name="Yearly Summary", index=False)
-
-                # All Transactions Sheet
-                if self.consolidated_data["all_transactions"]:
-                    transactions_df = pd.DataFrame(
-                        self.consolidated_data["all_transactions"]
-                    )
-                    transactions_df.to_excel(
-                        writer, sheet_name="All Transactions", index=False
-                    )
-
-                # Final Balances Sheet
-                final_df = pd.DataFrame([self.consolidated_data["final_balances"]])
-                final_df.to_excel(writer, sheet_name="Final Balances", index=False)
-
-                # Total Withdrawals Sheet
-                withdrawals_df = pd.DataFrame(
-                    [self.consolidated_data["total_withdrawals"]]
-                )
-                withdrawals_df.to_excel(
-                    writer, sheet_name="Total Withdrawals", index=False
-                )
+        Rows are streamed into a write-only workbook (see epfo_excel), so memory
+        stays flat however many transactions there are.
+        """
+        try:
+            # Imported here: openpyxl is only needed for the Excel report
+            from epfo_excel import write_member_workbook
 
+            write_member_workbook(self.consolidated_data, output_path)
         except ImportError:
             logger.warning(
-                "pandas/openpyxl not installed. Skipping Excel report generation."
+                "openpyxl not installed. Skipping Excel report generation."
             )
         except Exception as e:
             logger.error(f"Error generating Excel report: {e}")
@@ -882,56 +1941,13 @@ class EPFOMultiYearParser:
     def generate_csv_reports(self, output_dir: str, member_id: str):
         """Generate CSV reports as alternative to Excel."""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-            # Member Info CSV
-            member_csv = os.path.join(
-                output_dir, f"{member_id}_member_info_{timestamp}.csv"
-            )
-            with open(member_csv, "w", newline="", encoding="utf-8") as f:
-                if self.consolidated_data["member_info"]:
-                    headers = list(self.consolidated_data["member_info"].keys())
-                    values = list(self.consolidated_data["member_info"].values())
-                    f.write(",".join(headers) + "\n")
-                    f.write(",".join(str(v) for v in values) + "\n")
-
-            # Yearly Summary CSV
-            summary_csv = os.path.join(
-                output_dir, f"{member_id}_yearly_summary_{timestamp}.csv"
-            )
-            with open(summary_csv, "w", newline="", encoding="utf-8") as f:
-                if self.consolidated_data["yearly_summaries"]:
-                    headers = list(self.consolidated_data["yearly_summaries"][0].keys())
-                    f.write(",".join(headers) + "\n")
-                    for summary in self.consolidated_data["yearly_summaries"]:
-                        values = [str(summary.get(h, "")) for h in headers]
-                        f.write(",".join(values) + "\n")
-
-            # Transactions CSV
-            transactions_csv = None
-            if self.consolidated_data["all_transactions"]:
-                transactions_csv = os.path.join(
-                    output_dir, f"{member_id}_transactions_{timestamp}.csv"
-                )
-                with open(transactions_csv, "w", newline="", encoding="utf-8") as f:
-                    headers = list(self.consolidated_data["all_transactions"][0].keys())
-                    f.write(",".join(headers) + "\n")
-                    for trans in self.consolidated_data["all_transactions"]:
-                        values = [str(trans.get(h, "")) for h in headers]
-                        f.write(",".join(values) + "\n")
-
-            # Total Withdrawals CSV
-            withdrawals_csv = os.path.join(
-                output_dir, f"{member_id}_total_withdrawals_{timestamp}.csv"
-            )
-            with open(withdrawals_csv, "w", newline="", encoding="utf-8") as f:
-                headers = list(self.consolidated_data["total_withdrawals"].keys())
-                values = list(self.consolidated_data["total_withdrawals"].values())
-                f.write(",".join(headers) + "\n")
-                f.write(",".join(str(v) for v in values) + "\n")
+            # Imported here: epfo_csv imports this module (for its field constants)
+            from epfo_csv import write_member_csvs
 
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            paths = write_member_csvs(self.consolidated_data, output_dir, member_id, timestamp)
             logger.info(f"CSV reports generated in: {output_dir}")
-            return [member_csv, summary_csv, transactions_csv, withdrawals_csv]
+            return paths
 
         except Exception as e:
             logger.error(f"Error generating CSV reports: {e}")
@@ -975,25 +1991,391 @@ class EPFOMultiYearParser:
         return issues
 
 
-def main_entry():
-    """Main function to run the multi-year parser."""
-    import sys
+OUTPUT_FORMATS = ("json", "ndjson")
 
-    if len(sys.argv) < 2:
-        print(
-            "Usage: python epfo_multi_year_parser.py <member_folder_path> [output_directory]"
-        )
-        print(
-            "Example: python epfo_multi_year_parser.py ./PF/MHBAN20138650000010289/ ./output/"
+
+def _compact_json(value: Any) -> str:
+    return json.dumps(
+        value, ensure_ascii=False, separators=(",", ":"), default=_json_default
+    )
+
+
+def _indented_json(value: Any, level: int) -> str:
+    """value as json.dump(indent=2) writes it nested `level` spaces deep."""
+    text = json.dumps(value, ensure_ascii=False, indent=2, default=_json_default)
+    return text.replace("\n", "\n" + " " * level)
+
+
+def dump_consolidated(
+    result: Dict[str, Any], f, output_format: str = "json", compact: bool = False
+):
+    """
+    Stream a consolidated result to the text file f, one transaction at a time.
+
+    "json" writes a single JSON object indented like json.dump(indent=2), with
+    all_transactions last; compact=True instead writes it without indentation, one
+    top-level key per line and one row per line. "ndjson" writes the other keys as
+    a header object on the first line, then one transaction object per line. Rows
+    are serialized as they are read from the TransactionStore, so the document text
+    is never built in memory. display_epfo.iter_transactions reads the compact and
+    NDJSON layouts back a line at a time (indented JSON is loaded whole).
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"Unknown output format {output_format!r} (choose from {', '.join(OUTPUT_FORMATS)})"
         )
-        sys.exit(1)
+    transactions = result.get("all_transactions", [])
+    if isinstance(transactions, (TransactionStore, TransactionRange)):
+        transactions = transactions.iter_dicts()
+    header = {key: value for key, value in result.items() if key != "all_transactions"}
+
+    if output_format == "ndjson":
+        f.write(_compact_json(header) + "\n")
+        for transaction in transactions:
+            f.write(_compact_json(transaction) + "\n")
+        return
+
+    if not compact:
+        f.write("{")
+        for key, value in header.items():
+            f.write(f"\n  {_compact_json(key)}: {_indented_json(value, 2)},")
+        f.write('\n  "all_transactions": [')
+        separator = "\n    "
+        for transaction in transactions:
+            f.write(separator + _indented_json(transaction, 4))
+            separator = ",\n    "
+        f.write("]\n}\n" if separator == "\n    " else "\n  ]\n}\n")
+        return
+
+    f.write("{")
+    for key, value in header.items():
+        f.write(f"{_compact_json(key)}:{_compact_json(value)},\n")
+    f.write('"all_transactions":[')
+    separator = "\n"
+    for transaction in transactions:
+        f.write(separator + _compact_json(transaction))
+        separator = ",\n"
+    f.write("\n]}\n")
+
+
+def consolidated_filename(
+    member_id: str, output_format: str = "json", compress: bool = False
+) -> str:
+    """File name write_consolidated_json uses for a member in the given format."""
+    return f"{member_id}_consolidated.{output_format}" + (".gz" if compress else "")
+
+
+def write_consolidated_json(
+    result: Dict[str, Any],
+    output_dir: str,
+    output_format: str = "json",
+    compress: bool = False,
+    compact: bool = False,
+) -> str:
+    """
+    Write a consolidated result as <member_id>_consolidated.<format>[.gz] and return its path.
+
+    See dump_consolidated for the layouts (and compact); compress=True gzips the output.
+    """
+    member_id = result["member_info"].get("member_id", "unknown")
+    json_path = os.path.join(
+        output_dir, consolidated_filename(member_id, output_format, compress)
+    )
+    with PROFILER.stage("json_write") as stage:
+        if compress:
+            f = gzip.open(json_path, "wt", encoding="utf-8")
+        else:
+            f = open(json_path, "w", encoding="utf-8")
+        with f:
+            dump_consolidated(result, f, output_format, compact)
+            stage.nbytes = f.tell()
+    return json_path
+
+
+def load_previous_result(
+    folder: Path, output_dir: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Load the consolidated result a previous run wrote for a member folder, if any.
+
+    The file is looked up by the folder name and by the member id prefix of the PDF
+    filenames (<member_id>_<year>.pdf), in any of the formats write_consolidated_json
+    produces.
+    """
+    folder = Path(folder)
+    candidates = [folder.name] + sorted(
+        {p.name.rsplit("_", 1)[0] for p in folder.glob("*.pdf")}
+    )
+    for member_id in candidates:
+        for output_format in OUTPUT_FORMATS:
+            for compress in (False, True):
+                json_path = os.path.join(
+                    output_dir, consolidated_filename(member_id, output_format, compress)
+                )
+                if not os.path.exists(json_path):
+                    continue
+                try:
+                    return load_consolidated(json_path)
+                except (OSError, ValueError, EOFError) as e:
+                    logger.warning(f"Ignoring unreadable previous result {json_path}: {e}")
+    return None
+
+
+def _json_default(obj: Any) -> Any:
+    """json.dump hook: write TransactionStores in their per-row dict shape."""
+    if isinstance(obj, (TransactionStore, TransactionRange)):
+        return obj.to_dicts()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def find_member_folders(root_dir: str) -> List[Path]:
+    """Return the sub-folders of root_dir that contain at least one PDF, sorted by name."""
+    root = Path(root_dir)
+    return sorted(
+        p for p in root.iterdir() if p.is_dir() and any(p.glob("*.pdf"))
+    )
+
 
-    member_folder = sys.argv[1]
-    output_dir = (
-        sys.argv[2]
-        if len(sys.argv) > 2
-        else os.path.dirname(os.path.abspath(member_folder))
+def open_cache(
+    cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES
+) -> PDFResultCache:
+    """Open the on-disk parse cache for the current parser version."""
+    return PDFResultCache(cache_dir, max_bytes=max_bytes, version=PARSER_VERSION)
+
+
+# One cache handle per worker process, so eviction bookkeeping survives across tasks
+_worker_caches: Dict[tuple, PDFResultCache] = {}
+
+
+def _cache_config(cache: Optional[PDFResultCache]) -> Optional[tuple]:
+    """Picklable description of a cache, from which worker processes reopen it."""
+    return (str(cache.cache_dir), cache.max_bytes) if cache is not None else None
+
+
+def _worker_cache(cache_config: Optional[tuple]) -> Optional[PDFResultCache]:
+    """This worker process's handle on the cache described by cache_config."""
+    if cache_config is None:
+        return None
+    cache = _worker_caches.get(cache_config)
+    if cache is None:
+        cache = _worker_caches[cache_config] = open_cache(*cache_config)
+    return cache
+
+
+def _extract_pages_task(
+    backend: str, pdf_path: str, pages: Tuple[int, int], lines: bool
+) -> List[Any]:
+    """Process-pool worker: extract one page range of a PDF as texts (or word lines)."""
+    extractor = get_backend(backend)
+    if lines:
+        return list(extractor.iter_page_lines(pdf_path, pages))
+    return list(extractor.iter_page_texts(pdf_path, pages))
+
+
+def _parse_pdf_task(
+    pdf_path: str,
+    cache_config: Optional[tuple] = None,
+    parser_options: Optional[Dict[str, Any]] = None,
+    profile: bool = False,
+) -> Dict[str, Any]:
+    """
+    Process-pool worker: parse one PDF in a fresh parser and report the outcome.
+
+    With profile=True the outcome also carries this PDF's stage timings ("profile").
+    """
+    if profile:
+        PROFILER.enabled = True
+        PROFILER.reset()
+        res = _parse_pdf_task(pdf_path, cache_config, parser_options)
+        res["profile"] = PROFILER.summary()
+        return res
+    parser = EPFOMultiYearParser(
+        cache=_worker_cache(cache_config), **(parser_options or {})
     )
+    year = parser.extract_year_from_filename(os.path.basename(pdf_path))
+    if not year:
+        return {"pdf_path": pdf_path, "error": "Could not extract year from filename"}
+    try:
+        year_data, member_info = parser.parse_pdf(pdf_path, year)
+    except Exception as e:
+        return {"pdf_path": pdf_path, "error": f"{type(e).__name__}: {e}"}
+    return {"pdf_path": pdf_path, "year_data": year_data, "member_info": member_info}
+
+
+def _finish_member(
+    folder: Path,
+    results: List[Dict[str, Any]],
+    output_dir: str,
+    parser: Optional["EPFOMultiYearParser"] = None,
+    output_options: Optional[Dict[str, Any]] = None,
+    sinks: Iterable[Any] = (),
+) -> Dict[str, Any]:
+    """
+    Merge the per-PDF results of one member (in filename order) and write its JSON.
+
+    parser may already hold years carried over from a previous run (incremental mode).
+    The result is also handed to every sink's add_result (see _open_sinks).
+    """
+    report = {
+        "folder": str(folder),
+        "member_id": None,
+        "status": "failed",
+        "json_path": None,
+        "years": [],
+        "parsed_pdfs": len(results),
+        "errors": [],
+    }
+    try:
+        parser = parser or EPFOMultiYearParser()
+        for res in sorted(results, key=lambda r: r["pdf_path"]):
+            if "error" in res:
+                report["errors"].append(f"{os.path.basename(res['pdf_path'])}: {res['error']}")
+                continue
+            parser.add_year_data(res["year_data"], res["member_info"])
+
+        if not parser.yearly_data:
+            report["errors"].append("No data extracted from any PDF")
+            return report
+
+        parser.consolidate_data()
+        result = parser.consolidated_data
+        if PROFILER.enabled:
+            # This member's own stage timings, as recorded by the workers
+            member_profile = StageProfiler()
+            for res in results:
+                member_profile.merge(res.get("profile"))
+            result["extraction_metadata"]["timings"] = member_profile.summary()
+        if not result["member_info"].get("member_id"):
+            result["member_info"]["member_id"] = folder.name
+
+        report["member_id"] = result["member_info"]["member_id"]
+        report["years"] = result["extraction_metadata"]["years_covered"]
+        report["json_path"] = write_consolidated_json(
+            result, output_dir, **(output_options or {})
+        )
+        for sink in sinks:
+            sink.add_result(result, source=os.path.abspath(report["json_path"]))
+        report["status"] = "ok"
+    except Exception as e:
+        report["errors"].append(f"{type(e).__name__}: {e}")
+    return report
+
+
+def process_batch(
+    root_dir: str,
+    output_dir: str,
+    workers: Optional[int] = None,
+    cache: Optional[PDFResultCache] = None,
+    parser_options: Optional[Dict[str, Any]] = None,
+    incremental: bool = False,
+    output_options: Optional[Dict[str, Any]] = None,
+    sinks: Iterable[Any] = (),
+) -> List[Dict[str, Any]]:
+    """
+    Parse every member folder under root_dir, spreading the per-PDF work over a process pool.
+
+    Each member's years are merged and written to <member_id>_consolidated.json as soon as
+    its last PDF finishes. A failing PDF or member is recorded in the returned report list
+    (one entry per member folder) and never aborts the rest of the batch. When a cache
+    is given, unchanged PDFs are served from it instead of being re-parsed.
+    parser_options are passed to every worker's EPFOMultiYearParser (e.g. streaming=True).
+    output_options (output_format, compress, compact) are passed to write_consolidated_json.
+    With incremental=True, a member's previous JSON in output_dir is updated: only PDFs
+    that are new or changed since it was written are parsed. If that previous result
+    can't be used, the member is parsed in full and the reason is noted in its report.
+    Each member's result is also handed to every sink's add_result (e.g. an
+    epfo_store.ResultStore or epfo_parquet.ParquetExporter), in this process, as
+    soon as the member is finished.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    folders = find_member_folders(root_dir)
+    pending: Dict[Path, int] = {}
+    seeded: Dict[Path, EPFOMultiYearParser] = {}
+    # Members whose previous result could not be reused, with the reason
+    seed_errors: Dict[Path, str] = {}
+    results: Dict[Path, List[Dict[str, Any]]] = {folder: [] for folder in folders}
+    reports: Dict[Path, Dict[str, Any]] = {}
+
+    def finish(folder: Path):
+        reports[folder] = _finish_member(
+            folder, results.pop(folder), output_dir, seeded.pop(folder, None),
+            output_options, sinks,
+        )
+        if folder in seed_errors:
+            reports[folder]["errors"].insert(0, seed_errors.pop(folder))
+        if reports[folder]["status"] != "ok":
+            logger.error(
+                f"Member {folder.name} failed: {'; '.join(reports[folder]['errors'])}"
+            )
+
+    def iter_tasks():
+        # Members are planned lazily, so carried-over years are only held in memory
+        # for members whose PDFs are in flight
+        for folder in folders:
+            pdfs = sorted(str(p) for p in folder.glob("*.pdf"))
+            if incremental:
+                all_pdfs = pdfs
+                try:
+                    previous = load_previous_result(folder, output_dir)
+                    if previous is not None:
+                        seeded[folder] = EPFOMultiYearParser()
+                        pdfs = seeded[folder].carry_over(all_pdfs, previous)
+                except Exception as e:
+                    # A previous result we can't reuse only costs this member a full parse
+                    seed_errors[folder] = (
+                        f"Previous result not reused, re-parsing all PDFs: {type(e).__name__}: {e}"
+                    )
+                    logger.warning(f"Member {folder.name}: {seed_errors[folder]}")
+                    seeded.pop(folder, None)
+                    pdfs = all_pdfs
+            pending[folder] = len(pdfs)
+            if not pdfs:
+                finish(folder)
+            for pdf in pdfs:
+                yield folder, pdf
+
+    tasks = iter_tasks()
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 4
+    cache_config = _cache_config(cache)
+
+    # Imported here: multiprocessing is only needed by batch runs
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = {}
+        while True:
+            # Keep a bounded number of tasks queued so huge batches don't pile up futures
+            for folder, pdf in tasks:
+                future = executor.submit(
+                    _parse_pdf_task, pdf, cache_config, parser_options, PROFILER.enabled
+                )
+                in_flight[future] = (folder, pdf)
+                if len(in_flight) >= max_in_flight:
+                    break
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                folder, pdf = in_flight.pop(future)
+                try:
+                    res = future.result()
+                except Exception as e:
+                    res = {"pdf_path": pdf, "error": f"{type(e).__name__}: {e}"}
+                PROFILER.merge(res.get("profile"))
+                results[folder].append(res)
+                pending[folder] -= 1
+                if pending[folder] == 0:
+                    finish(folder)
+
+    return [reports[folder] for folder in folders]
+
+
+def _run_parse(args):
+    """Handle `epfoparser [parse] <member_folder> [output_dir]`."""
+    member_folder = args.member_folder
+    output_dir = args.output_dir or os.path.dirname(os.path.abspath(member_folder))
 
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
@@ -1003,8 +2385,17 @@ def main_entry():
         sys.exit(1)
 
     try:
-        parser = EPFOMultiYearParser()
-        result = parser.process_member_folder(member_folder)
+        parser = EPFOMultiYearParser(
+            cache=_cache_from_args(args), **_parser_options_from_args(args)
+        )
+        previous = (
+            load_previous_result(Path(member_folder), output_dir)
+            if args.incremental else None
+        )
+        if previous is not None:
+            result = parser.update_member_folder(member_folder, previous, jobs=args.jobs)
+        else:
+            result = parser.process_member_folder(member_folder, jobs=args.jobs)
 
         if not result:
             print("No data extracted. Please check the PDF files.")
@@ -1014,11 +2405,18 @@ def main_entry():
         member_id = result["member_info"].get("member_id", "unknown")
 
         # Save JSON
-        json_path = os.path.join(output_dir, f"{member_id}_consolidated.json")
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        json_path = write_consolidated_json(
+            result, output_dir, **_output_options_from_args(args)
+        )
+        sinks = _open_sinks(args, member_id=member_id)
+        try:
+            for sink in sinks:
+                sink.add_result(result, source=os.path.abspath(json_path))
+        finally:
+            for sink in sinks:
+                sink.close()
 
-        # Generate Excel report (if pandas is available)
+        # Generate Excel report (if openpyxl is available)
         excel_path = os.path.join(output_dir, f"{member_id}_report.xlsx")
         parser.generate_excel_report(excel_path)
 
@@ -1032,6 +2430,8 @@ def main_entry():
         print(f"📁 JSON Output: {json_path}")
         if os.path.exists(excel_path):
             print(f"📊 Excel Report: {excel_path}")
+        for sink in sinks:
+            print(f"🗄️  {sink.label}: {sink.path}")
         print(
             f"📈 Years Processed: {', '.join(result['extraction_metadata']['years_covered'])}"
         )
@@ -1045,9 +2445,11 @@ def main_entry():
             print(f"\n✅ All balance continuity checks passed!")
 
         try:
-            from display_epfo import display_epfo_console
+            from display_epfo import display_epfo_result
 
-            display_epfo_console(json_path)
+            display_epfo_result(
+                result, max_rows=args.max_rows, years=args.years, renderer=args.renderer
+            )
         except Exception as e:
             print(f"[WARN] Could not display table: {e}")
 
@@ -1056,5 +2458,487 @@ def main_entry():
         sys.exit(1)
 
 
+def _run_batch(args):
+    """Handle `epfoparser batch <root_dir> [output_dir] [--workers N]`."""
+    root_dir = args.root_dir
+    output_dir = args.output_dir or os.path.abspath(root_dir)
+
+    if not os.path.isdir(root_dir):
+        print(f"Error: Root folder not found: {root_dir}")
+        sys.exit(1)
+
+    sinks = _open_sinks(args)
+    try:
+        reports = process_batch(
+            root_dir,
+            output_dir,
+            workers=args.workers,
+            cache=_cache_from_args(args),
+            parser_options=_parser_options_from_args(args),
+            incremental=args.incremental,
+            output_options=_output_options_from_args(args),
+            sinks=sinks,
+        )
+    finally:
+        for sink in sinks:
+            sink.close()
+    if not reports:
+        print(f"No member folders with PDF files found in: {root_dir}")
+        sys.exit(1)
+
+    report_path = os.path.join(output_dir, "batch_report.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(reports, f, indent=2, ensure_ascii=False)
+
+    failed = [r for r in reports if r["status"] != "ok"]
+    print(f"\n✅ Batch completed: {len(reports) - len(failed)}/{len(reports)} members parsed")
+    print(f"📁 Output Directory: {output_dir}")
+    print(f"🧾 Batch Report: {report_path}")
+    for sink in sinks:
+        print(f"🗄️  {sink.label}: {sink.path}")
+    if failed:
+        print(f"\n⚠️  {len(failed)} member(s) failed:")
+        for r in failed:
+            print(f"   - {os.path.basename(r['folder'])}: {'; '.join(r['errors'])}")
+
+
+def _run_serve(args):
+    """Handle `epfoparser serve [--host H] [--port P] [--workers N]`."""
+    # Imported here: the service module (asyncio, email parsing) is only needed to serve
+    from epfo_service import run_service
+
+    run_service(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        cache=_cache_from_args(args),
+        parser_options=_parser_options_from_args(args),
+        max_upload_bytes=args.max_upload_mb * 1024 * 1024,
+    )
+
+
+def _run_query(args):
+    """Handle `epfoparser query [filters] [--group-by KEY ...]`."""
+    filters = {
+        "member_id": args.member_id,
+        "uan": args.uan,
+        "establishment_id": args.establishment_id,
+        "year": args.year,
+        "type": args.type,
+        "description": args.description,
+        "date_from": args.date_from,
+        "date_to": args.date_to,
+    }
+    try:
+        with _open_store(args.store) as store:
+            start = time.perf_counter()
+            columns, rows = store.query(args.of, filters, args.group_by or (), args.limit)
+            elapsed = time.perf_counter() - start
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.json:
+        for row in rows:
+            print(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+        return
+
+    from display_epfo import fast_table
+
+    def cell(value):
+        return f"{value:,}" if isinstance(value, int) and not isinstance(value, bool) else value
+
+    print(fast_table(
+        [[cell(value) for value in row] for row in rows],
+        headers=columns,
+        colalign=[
+            "right" if any(isinstance(row[i], int) for row in rows) else "left"
+            for i in range(len(columns))
+        ],
+    ))
+    print(f"{len(rows)} row(s) in {elapsed * 1000:.1f} ms")
+
+
+def _run_import(args):
+    """Handle `epfoparser import <json_file_or_dir> ... [--store PATH]`."""
+    with _open_store(args.store) as store:
+        imported, errors = store.import_paths(args.paths)
+        print(f"\n✅ Imported {len(imported)} member result(s) into {store.path}")
+    if errors:
+        print(f"\n⚠️  {len(errors)} file(s) could not be imported:")
+        for error in errors:
+            print(f"   - {error}")
+        sys.exit(1)
+
+
+SUBCOMMANDS = ("parse", "batch", "serve", "query", "import")
+
+
+def _cache_from_args(args) -> Optional[PDFResultCache]:
+    """Open the parse cache selected on the command line (None with --no-cache)."""
+    if args.no_cache:
+        return None
+    return open_cache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024)
+
+
+def _parser_options_from_args(args) -> Dict[str, Any]:
+    """EPFOMultiYearParser keyword arguments selected on the command line."""
+    return {
+        "streaming": args.stream,
+        "backend": args.backend,
+        "mode": args.mode,
+        "page_jobs": args.page_jobs,
+    }
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _non_negative_int(value: str) -> int:
+    """argparse type for limits that may be 0."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative, got {number}")
+    return number
+
+
+def _add_parser_arguments(cmd: argparse.ArgumentParser, incremental: bool = True):
+    cmd.add_argument(
+        "--stream", action="store_true",
+        help="Parse PDFs page by page instead of building the whole text in memory",
+    )
+    cmd.add_argument(
+        "--backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+        help="Text extraction backend; pdfminer skips pdfplumber's per-character "
+        "object building and is several times faster (default: %(default)s)",
+    )
+    cmd.add_argument(
+        "--mode", choices=EXTRACTION_MODES, default="text",
+        help="How transactions are extracted: 'text' runs regexes over the document "
+        "text, 'columns' cuts table rows into cells by the passbook's column positions "
+        "(handles wrapped descriptions) (default: %(default)s)",
+    )
+    cmd.add_argument(
+        "--page-jobs", type=_positive_int, default=1,
+        help="Extract each PDF's pages in this many worker processes, for very long "
+        "single-year passbooks (default: %(default)s)",
+    )
+    if incremental:
+        # Not for serve, which writes no consolidated JSON to update
+        cmd.add_argument(
+            "--incremental", action="store_true",
+            help="Update the member's existing consolidated JSON, re-parsing only PDFs "
+            "that are new or changed since it was written",
+        )
+
+
+def _output_options_from_args(args) -> Dict[str, Any]:
+    """write_consolidated_json keyword arguments selected on the command line."""
+    return {"output_format": args.format, "compress": args.gzip, "compact": args.compact}
+
+
+def _add_output_arguments(cmd: argparse.ArgumentParser):
+    cmd.add_argument(
+        "--format", choices=OUTPUT_FORMATS, default="json",
+        help="Consolidated output layout: indented JSON (see --compact), or NDJSON "
+        "with a header line followed by one transaction per line (default: %(default)s)",
+    )
+    cmd.add_argument(
+        "--compact", action="store_true",
+        help="Write --format json without indentation, one transaction per line, which "
+        "is smaller and is read back a row at a time",
+    )
+    cmd.add_argument(
+        "--gzip", action="store_true", help="Gzip the consolidated output (.gz)"
+    )
+    cmd.add_argument(
+        "--parquet", metavar="DIR",
+        help="Also export transactions and yearly summaries as a typed Parquet dataset "
+        "partitioned by year and establishment under DIR (requires pyarrow)",
+    )
+
+
+def _add_cache_arguments(cmd: argparse.ArgumentParser):
+    cmd.add_argument(
+        "--no-cache", action="store_true",
+        help="Always re-parse PDFs instead of reusing cached results",
+    )
+    cmd.add_argument(
+        "--cache-dir", default=DEFAULT_CACHE_DIR,
+        help=f"Parse cache directory (default: {DEFAULT_CACHE_DIR})",
+    )
+    cmd.add_argument(
+        "--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help="Evict least recently used cache entries beyond this size (default: %(default)s)",
+    )
+
+
+# Where epfo_store.ResultStore keeps its database unless given a path
+STORE_PATH_HELP = "$EPFOPARSER_STORE or ~/.local/share/epfoparser/results.sqlite"
+
+
+def _open_store(path: Optional[str]):
+    """Open the results store at path ("" or None for the default location)."""
+    # Imported here: the store (sqlite3) is only needed with --store, query and import
+    from epfo_store import ResultStore
+
+    return ResultStore(path or None)
+
+
+def _open_sinks(args, member_id: Optional[str] = None) -> List[Any]:
+    """
+    Open the destinations results are written to besides the JSON, as selected on
+    the command line: the results store (--store), a Parquet dataset (--parquet) and,
+    for batches, one Excel workbook (--excel) and one set of sharded CSV files
+    (--csv). member_id is that of a single-member parse, None for a batch.
+    """
+    sinks = []
+    if args.store is not None:
+        sinks.append(_open_store(args.store))
+    if args.parquet:
+        try:
+            # Imported here: Parquet export (and pyarrow) is only needed with --parquet
+            from epfo_parquet import ParquetExporter
+
+            # Replaces the rows earlier exports wrote for the members this run exports
+            sinks.append(ParquetExporter(args.parquet, basename=member_id or "batch"))
+        except ImportError:
+            logger.warning("pyarrow not installed. Skipping Parquet export.")
+    if getattr(args, "excel", None):
+        try:
+            # Imported here: the Excel writer (and openpyxl) is only needed with --excel
+            from epfo_excel import ExcelWorkbookWriter
+
+            sinks.append(ExcelWorkbookWriter(args.excel))
+        except ImportError:
+            logger.warning("openpyxl not installed. Skipping Excel workbook.")
+    if getattr(args, "csv", None):
+        # Imported here: epfo_csv imports this module (for its field constants)
+        from epfo_csv import CSVBatchWriter
+
+        sinks.append(CSVBatchWriter(
+            args.csv, rows_per_shard=args.csv_shard_rows, compress=args.csv_gzip
+        ))
+    return sinks
+
+
+def _add_store_arguments(cmd: argparse.ArgumentParser, optional: bool = True):
+    if optional:
+        cmd.add_argument(
+            "--store", nargs="?", const="", metavar="PATH",
+            help="Also write the results to the SQLite results store queried by "
+            f"`epfoparser query` (default path: {STORE_PATH_HELP})",
+        )
+    else:
+        cmd.add_argument(
+            "--store", default="", metavar="PATH",
+            help=f"SQLite results store (default: {STORE_PATH_HELP})",
+        )
+
+
+def _add_profile_arguments(cmd: argparse.ArgumentParser):
+    cmd.add_argument(
+        "--profile", action="store_true",
+        help="Time each pipeline stage (PDF open, page extraction, parsing, writing, "
+        "rendering) and print a per-stage breakdown at the end",
+    )
+    cmd.add_argument(
+        "--profile-json", metavar="PATH",
+        help="Also write the per-stage timings to this JSON file (implies --profile)",
+    )
+
+
+def _report_profile(args):
+    """Print and/or save the stage timings collected during a --profile run."""
+    print("\n⏱️  Stage timings (self time excludes nested stages):")
+    print(PROFILER.report())
+    if args.profile_json:
+        with open(args.profile_json, "w", encoding="utf-8") as f:
+            json.dump(PROFILER.summary(), f, indent=2)
+        print(f"⏱️  Timings written to: {args.profile_json}")
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Build the `epfoparser` command line interface."""
+    arg_parser = argparse.ArgumentParser(
+        prog="epfoparser",
+        description="Parse EPFO passbook PDFs into consolidated JSON reports.",
+    )
+    subparsers = arg_parser.add_subparsers(dest="command")
+
+    parse_cmd = subparsers.add_parser(
+        "parse", help="Parse one member folder (default when no subcommand is given)"
+    )
+    parse_cmd.add_argument("member_folder", help="Folder containing <member_id>_<year>.pdf files")
+    parse_cmd.add_argument("output_dir", nargs="?", help="Output directory (default: parent of member folder)")
+    _add_parser_arguments(parse_cmd)
+    _add_output_arguments(parse_cmd)
+    _add_store_arguments(parse_cmd)
+    parse_cmd.add_argument(
+        "-j", "--jobs", type=_positive_int, default=1,
+        help="Parse the member's PDFs in this many worker processes (default: %(default)s)",
+    )
+    parse_cmd.add_argument(
+        "--max-rows", type=_non_negative_int, default=None,
+        help="List at most this many transactions per year in the console report "
+        "(yearly totals still cover every transaction)",
+    )
+    parse_cmd.add_argument(
+        "--years", nargs="+", metavar="YEAR",
+        help="Only show these years in the console report",
+    )
+    parse_cmd.add_argument(
+        "--renderer", choices=("tabulate", "fast"), default="tabulate",
+        help="Console table renderer; 'fast' draws the same tables without tabulate's "
+        "per-cell width and number parsing (default: %(default)s)",
+    )
+    _add_cache_arguments(parse_cmd)
+    _add_profile_arguments(parse_cmd)
+    parse_cmd.set_defaults(func=_run_parse)
+
+    batch_cmd = subparsers.add_parser(
+        "batch", help="Parse every member folder under a root directory in parallel"
+    )
+    batch_cmd.add_argument("root_dir", help="Directory whose sub-folders are member folders")
+    batch_cmd.add_argument("output_dir", nargs="?", help="Output directory (default: root_dir)")
+    batch_cmd.add_argument(
+        "-w", "--workers", type=_positive_int, default=None,
+        help="Number of worker processes (default: CPU count)",
+    )
+    batch_cmd.add_argument(
+        "--excel", metavar="PATH",
+        help="Also write every member into one Excel workbook (Members, Yearly "
+        "Summaries and Transactions sheets; requires openpyxl)",
+    )
+    batch_cmd.add_argument(
+        "--csv", metavar="DIR",
+        help="Also write every member into one set of CSV files in DIR (members, "
+        "yearly_summaries and transactions, split into shards of --csv-shard-rows rows)",
+    )
+    batch_cmd.add_argument(
+        "--csv-shard-rows", type=_positive_int, default=1_000_000, metavar="N",
+        help="Rows per CSV shard with --csv (default: %(default)s)",
+    )
+    batch_cmd.add_argument(
+        "--csv-gzip", action="store_true", help="Gzip the --csv shards (.csv.gz)"
+    )
+    _add_parser_arguments(batch_cmd)
+    _add_output_arguments(batch_cmd)
+    _add_store_arguments(batch_cmd)
+    _add_cache_arguments(batch_cmd)
+    _add_profile_arguments(batch_cmd)
+    batch_cmd.set_defaults(func=_run_batch)
+
+    serve_cmd = subparsers.add_parser(
+        "serve", help="Serve parse requests over HTTP on localhost from a warm worker pool"
+    )
+    serve_cmd.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: %(default)s)")
+    serve_cmd.add_argument(
+        "--port", type=int, default=8765, help="Port to listen on, 0 for any free port (default: %(default)s)"
+    )
+    serve_cmd.add_argument(
+        "-w", "--workers", type=_positive_int, default=None,
+        help="Number of worker processes (default: CPU count)",
+    )
+    serve_cmd.add_argument(
+        "--queue-size", type=_positive_int, default=64,
+        help="Parse requests that may wait for a worker before new ones get 503 (default: %(default)s)",
+    )
+    serve_cmd.add_argument(
+        "--max-upload-mb", type=_positive_int, default=64,
+        help="Largest accepted request body (default: %(default)s)",
+    )
+    _add_parser_arguments(serve_cmd, incremental=False)
+    _add_cache_arguments(serve_cmd)
+    serve_cmd.set_defaults(func=_run_serve)
+
+    query_cmd = subparsers.add_parser(
+        "query", help="Query the results store across all members"
+    )
+    query_cmd.add_argument(
+        "--of", choices=("transactions", "summaries", "members"), default="transactions",
+        help="What to list: transactions, yearly summaries or members; member filters "
+        "and, for members, transaction filters select the rows (default: %(default)s)",
+    )
+    query_cmd.add_argument("--member-id", nargs="+", metavar="ID", help="Only these member ids")
+    query_cmd.add_argument("--uan", nargs="+", help="Only members with these UANs")
+    query_cmd.add_argument(
+        "--establishment-id", nargs="+", metavar="ID", help="Only members of these establishments"
+    )
+    query_cmd.add_argument(
+        "--year", nargs="+", metavar="YEAR",
+        help="Only these passbook years (a passbook year ends in March of YEAR)",
+    )
+    query_cmd.add_argument(
+        "--type", choices=("CR", "DR"), help="Only credits (CR) or withdrawals (DR)"
+    )
+    query_cmd.add_argument("--description", help="Only transactions whose description contains this text")
+    query_cmd.add_argument(
+        "--from", dest="date_from", metavar="DD-MM-YYYY", help="Only transactions on or after this date"
+    )
+    query_cmd.add_argument(
+        "--to", dest="date_to", metavar="DD-MM-YYYY", help="Only transactions on or before this date"
+    )
+    query_cmd.add_argument(
+        "--group-by", nargs="+", metavar="KEY",
+        help="Aggregate transactions by member, uan, establishment, year, month, type "
+        "and/or description: counts, credits, withdrawals and first/last dates",
+    )
+    query_cmd.add_argument(
+        "--limit", type=_non_negative_int, default=None, help="Return at most this many rows"
+    )
+    query_cmd.add_argument("--json", action="store_true", help="Print one JSON object per row")
+    _add_store_arguments(query_cmd, optional=False)
+    query_cmd.set_defaults(func=_run_query)
+
+    import_cmd = subparsers.add_parser(
+        "import", help="Load existing consolidated JSON outputs into the results store"
+    )
+    import_cmd.add_argument(
+        "paths", nargs="+", metavar="PATH",
+        help="Consolidated output files, or directories holding *_consolidated.* files",
+    )
+    _add_store_arguments(import_cmd, optional=False)
+    import_cmd.set_defaults(func=_run_import)
+
+    return arg_parser
+
+
+def main_entry(argv: Optional[List[str]] = None):
+    """Main function to run the multi-year parser."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    argv = list(sys.argv[1:] if argv is None else argv)
+
+    # Keep the original `epfoparser <member_folder> [output_dir]` form working
+    if argv and argv[0] not in SUBCOMMANDS and not argv[0].startswith("-"):
+        argv.insert(0, "parse")
+
+    arg_parser = build_arg_parser()
+    args = arg_parser.parse_args(argv)
+    if not args.command:
+        arg_parser.print_help()
+        sys.exit(1)
+
+    profiling = getattr(args, "profile", False) or getattr(args, "profile_json", None)
+    PROFILER.enabled = bool(profiling)
+    args.func(args)
+    if profiling:
+        _report_profile(args)
+
+
 if __name__ == "__main__":
     main_entry()
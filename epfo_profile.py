@@ -0,0 +1,150 @@
+import functools
+import time
+from typing import Any, Dict, List, Optional
+
+# Stage summary: {stage: {"calls", "seconds", "self_seconds", "bytes"}}
+Summary = Dict[str, Dict[str, Any]]
+
+
+class _Stage:
+    """A timed stage in progress; time spent in nested stages is excluded from self time."""
+
+    __slots__ = ("profiler", "name", "nbytes", "start", "child_seconds")
+
+    def __init__(self, profiler: "StageProfiler", name: str, nbytes: int):
+        self.profiler = profiler
+        self.name = name
+        self.nbytes = nbytes
+
+    def __enter__(self) -> "_Stage":
+        self.child_seconds = 0.0
+        self.profiler._stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        elapsed = time.perf_counter() - self.start
+        stack = self.profiler._stack
+        stack.pop()
+        if stack:
+            stack[-1].child_seconds += elapsed
+        self.profiler.record(self.name, elapsed, elapsed - self.child_seconds, self.nbytes)
+        return False
+
+
+class _NullStage:
+    """What stage() returns while profiling is off: does nothing, ignores nbytes."""
+
+    __slots__ = ()
+    nbytes = property(lambda self: 0, lambda self, value: None)
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class StageProfiler:
+    """
+    Wall time, call count and bytes processed per pipeline stage.
+
+    Stages are timed with `with PROFILER.stage(name, nbytes):` or the @profiled
+    decorator. While disabled (the default) stage() hands back a shared no-op context,
+    so the instrumented hot paths cost one attribute check per call. Stages may nest
+    (e.g. page extraction inside parse_pdf); each stage's self time excludes the time
+    of stages nested in it.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.stats: Dict[str, List[float]] = {}
+        self._stack: List[_Stage] = []
+
+    def stage(self, name: str, nbytes: int = 0):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, nbytes)
+
+    def record(
+        self, name: str, seconds: float, self_seconds: Optional[float] = None,
+        nbytes: int = 0, calls: int = 1,
+    ):
+        stat = self.stats.get(name)
+        if stat is None:
+            stat = self.stats[name] = [0, 0.0, 0.0, 0]
+        stat[0] += calls
+        stat[1] += seconds
+        stat[2] += seconds if self_seconds is None else self_seconds
+        stat[3] += nbytes
+
+    def reset(self):
+        self.stats.clear()
+        self._stack.clear()
+
+    def summary(self) -> Summary:
+        """Per-stage totals, slowest (by self time) first, as JSON-ready dicts."""
+        return {
+            name: {
+                "calls": calls,
+                "seconds": round(seconds, 6),
+                "self_seconds": round(self_seconds, 6),
+                "bytes": nbytes,
+            }
+            for name, (calls, seconds, self_seconds, nbytes) in sorted(
+                self.stats.items(), key=lambda item: -item[1][2]
+            )
+        }
+
+    def merge(self, summary: Optional[Summary]):
+        """Add a summary recorded elsewhere (e.g. in a worker process)."""
+        for name, stat in (summary or {}).items():
+            self.record(
+                name, stat["seconds"], stat["self_seconds"], stat["bytes"], stat["calls"]
+            )
+
+    def report(self) -> str:
+        """Per-stage breakdown as a plain-text table."""
+        total = sum(stat[2] for stat in self.stats.values()) or 1.0
+        lines = [
+            f"{'stage':<32} {'calls':>7} {'total ms':>10} {'self ms':>10} {'self %':>7} {'KB':>9} {'KB/s':>9}",
+        ]
+        for name, stat in self.summary().items():
+            kb = stat["bytes"] / 1024
+            size = f"{kb:9.1f}" if stat["bytes"] else ""
+            rate = f"{kb / stat['self_seconds']:9.0f}" if stat["bytes"] and stat["self_seconds"] else ""
+            lines.append(
+                f"{name:<32} {stat['calls']:>7} {stat['seconds'] * 1000:>10.1f}"
+                f" {stat['self_seconds'] * 1000:>10.1f} {stat['self_seconds'] / total:>7.1%}"
+                f" {size:>9} {rate}".rstrip()
+            )
+        return "\n".join(lines)
+
+
+# Process-wide profiler used by the parser, the backends and the display
+PROFILER = StageProfiler()
+
+
+def profiled(stage: str, size_arg: Optional[int] = None):
+    """
+    Decorator: time every call of the function as `stage`.
+
+    If size_arg is given, len() of that positional argument is counted as the bytes
+    the call processed (e.g. 1 for the text argument of a method).
+    """
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            nbytes = len(args[size_arg] or "") if size_arg is not None and len(args) > size_arg else 0
+            with _Stage(PROFILER, stage, nbytes):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
@@ -0,0 +1,414 @@
+import asyncio
+import io
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from email import policy
+from email.parser import BytesParser
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from epfo_backends import get_backend
+from epfo_cache import PDFResultCache
+from epfo_parser_final import (
+    FILENAME_YEAR_RE,
+    EPFOMultiYearParser,
+    _cache_config,
+    _worker_cache,
+    dump_consolidated,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_MAX_UPLOAD_BYTES = 64 * 1024 * 1024
+# Latency percentiles are computed over this many most recent requests
+LATENCY_WINDOW = 1000
+
+
+class ServiceError(Exception):
+    """A request the service answers with an HTTP error status."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _warm_worker(parser_options: Dict[str, Any]):
+    """Pool initializer: pay the extraction library imports once per worker process."""
+    get_backend(parser_options.get("backend", "pdfplumber")).warm_up()
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _parse_folder_task(
+    folder: str,
+    cache_config: Optional[tuple],
+    parser_options: Dict[str, Any],
+    member_id: Optional[str] = None,
+) -> Tuple[int, bytes]:
+    """
+    Process-pool worker: parse a member folder and return (HTTP status, JSON body).
+
+    The consolidated result is serialized in the worker, so only the response bytes
+    travel back to the server process.
+    """
+    try:
+        parser = EPFOMultiYearParser(cache=_worker_cache(cache_config), **parser_options)
+        result = parser.process_member_folder(folder)
+    except Exception as e:
+        return HTTPStatus.INTERNAL_SERVER_ERROR, _error_body(f"{type(e).__name__}: {e}")
+    if not result or not parser.yearly_data:
+        return HTTPStatus.UNPROCESSABLE_ENTITY, _error_body("No data extracted from the PDFs")
+    if member_id and not result["member_info"].get("member_id"):
+        result["member_info"]["member_id"] = member_id
+    out = io.StringIO()
+    # Responses are not meant to be read by people: no indentation
+    dump_consolidated(result, out, compact=True)
+    return HTTPStatus.OK, out.getvalue().encode("utf-8")
+
+
+def _error_body(message: str) -> bytes:
+    return json.dumps({"error": message}).encode("utf-8")
+
+
+def _summary(samples) -> Dict[str, float]:
+    """Count, mean and percentiles (in ms) of a window of latencies in seconds."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    count = len(ordered)
+
+    def percentile(p):
+        return round(ordered[min(count - 1, int(p * count))] * 1000, 2)
+
+    return {
+        "count": count,
+        "mean": round(sum(ordered) / count * 1000, 2),
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "max": round(ordered[-1] * 1000, 2),
+    }
+
+
+class ParseService:
+    """
+    Long-running HTTP front end to the parser, for callers that parse many members.
+
+    Requests are queued on a bounded asyncio queue and handed to a warm process pool
+    (workers import the extraction library once, at start-up), so a request costs
+    only the parse itself. When the queue is full new parse requests are rejected
+    with 503 instead of piling up. Endpoints:
+
+    - POST /parse with a JSON body {"folder": "<member folder>"} parses a folder
+      readable by the service
+    - POST /parse with multipart/form-data parses the uploaded <member_id>_<year>.pdf
+      files as one member; a single PDF can also be posted as application/pdf with
+      ?filename=<member_id>_<year>.pdf
+    - GET /metrics returns queue depth, request counts and latency percentiles
+    - GET /health
+
+    Parse responses are the compact consolidated JSON (see dump_consolidated).
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        cache: Optional[PDFResultCache] = None,
+        parser_options: Optional[Dict[str, Any]] = None,
+        max_upload_bytes: int = DEFAULT_MAX_UPLOAD_BYTES,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.cache_config = _cache_config(cache)
+        self.parser_options = dict(parser_options or {})
+        self.max_upload_bytes = max_upload_bytes
+        self.queue: Optional[asyncio.Queue] = None
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self._dispatchers: List[asyncio.Task] = []
+        self.started_at = time.monotonic()
+        self.in_flight = 0
+        self.counts = {"accepted": 0, "completed": 0, "failed": 0, "rejected": 0}
+        self.pool_restarts = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.queue_waits = deque(maxlen=LATENCY_WINDOW)
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """Start the worker pool and dispatchers, then listen on host:port."""
+        loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.pool = self._new_pool()
+        # Start every worker now so the first requests don't pay process start-up
+        await asyncio.gather(
+            *(loop.run_in_executor(self.pool, _ping) for _ in range(self.workers))
+        )
+        self._dispatchers = [
+            asyncio.create_task(self._dispatch()) for _ in range(self.workers)
+        ]
+        self.started_at = time.monotonic()
+        return await asyncio.start_server(self._handle, host, port)
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # Workers are not forked from the server: a pool replaced while serving would
+        # inherit the open client sockets and keep those connections from closing
+        methods = multiprocessing.get_all_start_methods()
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn"
+            ),
+            initializer=_warm_worker,
+            initargs=(self.parser_options,),
+        )
+
+    def _replace_pool(self, broken: ProcessPoolExecutor):
+        """Swap a pool whose worker died (OOM kill, crash) for a fresh one, once."""
+        if self.pool is not broken:
+            # Another dispatcher already replaced it
+            return
+        logger.warning("A worker process died; restarting the worker pool")
+        self.pool = self._new_pool()
+        self.pool_restarts += 1
+        broken.shutdown(wait=False)
+
+    async def close(self):
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "queue_capacity": self.queue_size,
+            "in_flight": self.in_flight,
+            "workers": self.workers,
+            "pool_restarts": self.pool_restarts,
+            "requests": dict(self.counts),
+            "latency_ms": _summary(self.latencies),
+            "queue_wait_ms": _summary(self.queue_waits),
+            "uptime_s": round(time.monotonic() - self.started_at, 1),
+        }
+
+    async def _dispatch(self):
+        """Feed queued parse jobs to the process pool, one job at a time per worker."""
+        while True:
+            folder, member_id, future, enqueued_at = await self.queue.get()
+            self.queue_waits.append(time.monotonic() - enqueued_at)
+            self.in_flight += 1
+            try:
+                outcome = await self._run_job(folder, member_id)
+            except Exception as e:
+                outcome = (HTTPStatus.INTERNAL_SERVER_ERROR, _error_body(f"{type(e).__name__}: {e}"))
+            finally:
+                self.in_flight -= 1
+                self.queue.task_done()
+            if not future.cancelled():
+                future.set_result(outcome)
+
+    async def _run_job(self, folder: str, member_id: Optional[str]) -> Tuple[int, bytes]:
+        """
+        Parse a folder in the pool. If a worker dies, the pool is replaced and the
+        job is retried once: every job running on a broken pool fails with it, not
+        only the one that killed its worker. A job that breaks the new pool too fails.
+        """
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            pool = self.pool
+            try:
+                return await loop.run_in_executor(
+                    pool, _parse_folder_task, folder, self.cache_config,
+                    self.parser_options, member_id,
+                )
+            except BrokenProcessPool:
+                self._replace_pool(pool)
+                if attempt:
+                    raise
+
+    async def _submit(self, folder: str, member_id: Optional[str] = None) -> Tuple[int, bytes]:
+        """Queue a folder for parsing and wait for the worker's response."""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((folder, member_id, future, time.monotonic()))
+        except asyncio.QueueFull:
+            self.counts["rejected"] += 1
+            raise ServiceError(HTTPStatus.SERVICE_UNAVAILABLE, "Parse queue is full, retry later")
+        self.counts["accepted"] += 1
+        return await future
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        started = time.monotonic()
+        status, body, parsed = HTTPStatus.OK, b"", False
+        try:
+            method, target, headers, body_in = await self._read_request(reader)
+            status, body, parsed = await self._route(method, target, headers, body_in)
+        except ServiceError as e:
+            status, body = e.status, _error_body(str(e))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except Exception as e:
+            logger.exception("Request failed")
+            status, body = HTTPStatus.INTERNAL_SERVER_ERROR, _error_body(f"{type(e).__name__}: {e}")
+
+        if parsed:
+            self.latencies.append(time.monotonic() - started)
+            self.counts["completed" if status == HTTPStatus.OK else "failed"] += 1
+
+        status = HTTPStatus(status)
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            + ("Retry-After: 1\r\n" if status == HTTPStatus.SERVICE_UNAVAILABLE else "")
+            + "Connection: close\r\n\r\n"
+        )
+        try:
+            writer.write(head.encode("ascii") + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        if not request_line:
+            raise asyncio.IncompleteReadError(b"", None)
+        try:
+            method, target, _ = request_line.split(" ", 2)
+        except ValueError:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "Malformed request line") from None
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length header")
+        if length > self.max_upload_bytes:
+            raise ServiceError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"Request body exceeds {self.max_upload_bytes} bytes",
+            )
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    async def _route(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        """Return (status, body, is_parse_request) for a request."""
+        url = urlsplit(target)
+        if url.path == "/health" and method == "GET":
+            return HTTPStatus.OK, b'{"status":"ok"}', False
+        if url.path == "/metrics" and method == "GET":
+            return HTTPStatus.OK, json.dumps(self.metrics()).encode("utf-8"), False
+        if url.path != "/parse":
+            raise ServiceError(HTTPStatus.NOT_FOUND, f"Unknown endpoint {url.path}")
+        if method != "POST":
+            raise ServiceError(HTTPStatus.METHOD_NOT_ALLOWED, "Use POST /parse")
+
+        content_type = headers.get("content-type", "")
+        if content_type.startswith("application/json"):
+            try:
+                folder = json.loads(body)["folder"]
+            except (ValueError, KeyError, TypeError):
+                raise ServiceError(HTTPStatus.BAD_REQUEST, 'Expected {"folder": "<path>"}') from None
+            if not os.path.isdir(folder):
+                raise ServiceError(HTTPStatus.NOT_FOUND, f"Folder not found: {folder}")
+            status, response = await self._submit(folder)
+            return status, response, True
+
+        uploads = self._uploads(content_type, url.query, body)
+        with tempfile.TemporaryDirectory(prefix="epfoparser-") as folder:
+            for name, data in uploads:
+                with open(os.path.join(folder, name), "wb") as f:
+                    f.write(data)
+            member_id = uploads[0][0].rsplit("_", 1)[0]
+            status, response = await self._submit(folder, member_id)
+        return status, response, True
+
+    @staticmethod
+    def _uploads(content_type: str, query: str, body: bytes) -> List[Tuple[str, bytes]]:
+        """The (file name, PDF bytes) pairs of an upload request."""
+        if content_type.startswith("multipart/form-data"):
+            message = BytesParser(policy=policy.HTTP).parsebytes(
+                f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+            )
+            uploads = [
+                (part.get_filename() or "", part.get_payload(decode=True) or b"")
+                for part in message.iter_parts()
+                if part.get_filename()
+            ]
+        elif content_type.startswith("application/pdf"):
+            uploads = [(parse_qs(query).get("filename", [""])[0], body)]
+        else:
+            raise ServiceError(
+                HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+                "POST a JSON folder request, multipart/form-data PDFs or an application/pdf body",
+            )
+
+        if not uploads:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "No PDF files in the upload")
+        for name, _ in uploads:
+            if os.path.basename(name) != name or not FILENAME_YEAR_RE.search(name):
+                raise ServiceError(
+                    HTTPStatus.BAD_REQUEST,
+                    f"Upload file names must look like <member_id>_<year>.pdf, got {name!r}",
+                )
+        return uploads
+
+
+async def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    **service_options,
+):
+    """Run a ParseService until SIGINT/SIGTERM, then shut the worker pool down."""
+    service = ParseService(**service_options)
+    server = await service.start(host, port)
+    bound_host, bound_port = server.sockets[0].getsockname()[:2]
+    print(f"Serving on http://{bound_host}:{bound_port} ({service.workers} workers)", flush=True)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # Not supported on Windows; Ctrl+C still ends asyncio.run there
+            pass
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        await service.close()
+
+
+def run_service(**options):
+    """Blocking entry point for `epfoparser serve`; stops cleanly on Ctrl+C."""
+    try:
+        asyncio.run(serve(**options))
+    except KeyboardInterrupt:
+        pass
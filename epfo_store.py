@@ -0,0 +1,376 @@
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from display_epfo import iter_transactions, load_consolidated_header
+from epfo_parser_final import (
+    OUTPUT_FORMATS,
+    TRANSACTION_AMOUNT_FIELDS,
+    TRANSACTION_INT_FIELDS,
+    TransactionRange,
+    TransactionStore,
+    YEARLY_SUMMARY_FIELDS,
+    with_date_keys,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = os.environ.get(
+    "EPFOPARSER_STORE",
+    os.path.join(os.path.expanduser("~"), ".local", "share", "epfoparser", "results.sqlite"),
+)
+# Bump whenever the tables below change; older stores have to be re-filled
+SCHEMA_VERSION = 1
+
+MEMBER_COLUMNS = (
+    "member_id", "uan", "member_name", "establishment_id", "establishment_name",
+    "date_of_birth", "is_active", "last_transaction_date",
+)
+SUMMARY_COLUMNS = YEARLY_SUMMARY_FIELDS[1:]
+TRANSACTION_COLUMNS = (
+    ("year", "month", "wage_month_key", "date", "date_ordinal", "type", "description",
+     "due_month_code", "old_member_id") + TRANSACTION_AMOUNT_FIELDS
+)
+_KNOWN_TRANSACTION_FIELDS = frozenset(TRANSACTION_COLUMNS)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS members (
+    {", ".join(f"{c} TEXT" for c in MEMBER_COLUMNS[:6])},
+    is_active INTEGER,
+    last_transaction_date TEXT,
+    final_total INTEGER,
+    total_transactions INTEGER,
+    parser_version TEXT,
+    source TEXT,
+    PRIMARY KEY (member_id)
+);
+CREATE TABLE IF NOT EXISTS yearly_summaries (
+    member_id TEXT NOT NULL,
+    year TEXT NOT NULL,
+    {", ".join(f"{c} INTEGER" for c in SUMMARY_COLUMNS)},
+    PRIMARY KEY (member_id, year)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS transactions (
+    member_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    {", ".join(
+        f"{c} {'INTEGER' if c in TRANSACTION_INT_FIELDS else 'TEXT'}" for c in TRANSACTION_COLUMNS
+    )},
+    extra TEXT,
+    PRIMARY KEY (member_id, seq)
+);
+CREATE INDEX IF NOT EXISTS members_uan ON members (uan);
+CREATE INDEX IF NOT EXISTS members_establishment ON members (establishment_id);
+CREATE INDEX IF NOT EXISTS summaries_year ON yearly_summaries (year);
+CREATE INDEX IF NOT EXISTS transactions_year ON transactions (year, type);
+CREATE INDEX IF NOT EXISTS transactions_date ON transactions (date_ordinal);
+"""
+
+# Query filters on member_info: name -> column; each takes a value or a list of values
+MEMBER_FILTERS = {
+    "member_id": "m.member_id",
+    "uan": "m.uan",
+    "establishment_id": "m.establishment_id",
+}
+# Query filters on transaction rows (year also applies to yearly summaries)
+TRANSACTION_FILTERS = ("year", "type", "description", "date_from", "date_to")
+QUERY_TABLES = ("transactions", "summaries", "members")
+
+# Transaction group-by keys: name -> (selected columns, GROUP BY / ORDER BY expression)
+GROUP_KEYS = {
+    "member": (("t.member_id", "m.member_name"), "t.member_id"),
+    "uan": (("m.uan",), "m.uan"),
+    "establishment": (("m.establishment_id", "m.establishment_name"), "m.establishment_id"),
+    "year": (("t.year",), "t.year"),
+    "month": (("MIN(t.month) AS month",), "t.wage_month_key"),
+    "type": (("t.type",), "t.type"),
+    "description": (("t.description",), "t.description"),
+}
+AGGREGATES = (
+    "COUNT(*) AS transactions",
+    "SUM(COALESCE(t.employee_contribution, 0) + COALESCE(t.employer_contribution, 0)"
+    " + COALESCE(t.pension_contribution, 0)) AS credits",
+    "SUM(COALESCE(t.total_withdrawal, 0)) AS withdrawals",
+    "MIN(NULLIF(t.date_ordinal, 0)) AS first_date",
+    "MAX(t.date_ordinal) AS last_date",
+)
+# Transaction listing: credits and withdrawals share the per-fund amount columns
+LIST_COLUMNS = (
+    "t.member_id", "t.year", "t.month", "t.date", "t.type", "t.description",
+    "COALESCE(t.employee_contribution, t.employee_withdrawal) AS employee",
+    "COALESCE(t.employer_contribution, t.employer_withdrawal) AS employer",
+    "COALESCE(t.pension_contribution, t.pension_withdrawal) AS pension",
+    "t.old_member_id",
+)
+# Result columns holding day ordinals, shown as DD-MM-YYYY
+DATE_RESULT_COLUMNS = frozenset(("first_date", "last_date"))
+
+
+def day_ordinal(date: str) -> int:
+    """Day number of a DD-MM-YYYY date given as a query bound; ValueError if invalid."""
+    try:
+        return datetime.strptime(date, "%d-%m-%Y").toordinal()
+    except ValueError:
+        raise ValueError(f"Invalid date {date!r}, expected DD-MM-YYYY") from None
+
+
+def _values(value: Any) -> list:
+    return [value] if isinstance(value, str) else list(value)
+
+
+def _where(
+    filters: Dict[str, Any], prefix: Optional[str] = None, transactions: bool = False
+) -> Tuple[str, list]:
+    """
+    WHERE clause and parameters for the member filters, plus the year filter on
+    table alias prefix and, with transactions=True, the other transaction filters.
+    """
+    clauses, params = [], []
+
+    def add(clause: str, *values):
+        clauses.append(clause)
+        params.extend(values)
+
+    for name, column in MEMBER_FILTERS.items():
+        if filters.get(name):
+            values = _values(filters[name])
+            add(f"{column} IN ({', '.join('?' * len(values))})", *values)
+    if prefix and filters.get("year"):
+        values = _values(filters["year"])
+        add(f"{prefix}.year IN ({', '.join('?' * len(values))})", *values)
+    if transactions:
+        if filters.get("type"):
+            add(f"{prefix}.type = ?", filters["type"])
+        if filters.get("description"):
+            add(f"{prefix}.description LIKE ?", f"%{filters['description']}%")
+        if filters.get("date_from"):
+            add(f"{prefix}.date_ordinal >= ?", day_ordinal(filters["date_from"]))
+        if filters.get("date_to"):
+            add(f"{prefix}.date_ordinal BETWEEN 1 AND ?", day_ordinal(filters["date_to"]))
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+class ResultStore:
+    """
+    SQLite database of consolidated results, for queries across all members.
+
+    Holds one row per member (member_info plus final balance), one per member and
+    year (yearly_summaries) and one per transaction, indexed on UAN, member id,
+    establishment id, year and transaction date (as a day ordinal). A member's
+    rows are replaced as a whole, with bulk executemany inserts in one SQLite
+    transaction, whenever its result is stored again, so re-parsing or
+    re-importing a member never duplicates it.
+    """
+
+    label = "Results Store"
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or DEFAULT_STORE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            self.conn.close()
+            raise ValueError(
+                f"{self.path} has store schema version {version}, expected "
+                f"{SCHEMA_VERSION}; remove it and re-import the results"
+            )
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+            self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self.close()
+        return False
+
+    def add_result(
+        self,
+        result: Dict[str, Any],
+        transactions: Optional[Iterable[Any]] = None,
+        source: Optional[str] = None,
+    ) -> str:
+        """
+        Store a consolidated result, replacing the member's previous rows; return the member id.
+
+        transactions overrides result["all_transactions"] (e.g. rows streamed from a
+        file); rows without date_ordinal/wage_month_key get them computed. source
+        records where the result came from (e.g. its JSON file).
+        """
+        member_info = result.get("member_info", {})
+        member_id = member_info.get("member_id")
+        if not member_id:
+            raise ValueError("Result has no member_info.member_id")
+        if transactions is None:
+            transactions = result.get("all_transactions", [])
+            if isinstance(transactions, (TransactionStore, TransactionRange)):
+                transactions = transactions.iter_dicts()
+        metadata = result.get("extraction_metadata", {})
+
+        with self.conn:
+            for table in ("members", "yearly_summaries", "transactions"):
+                self.conn.execute(f"DELETE FROM {table} WHERE member_id = ?", (member_id,))
+            self.conn.execute(
+                "INSERT INTO members VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                tuple(member_info.get(c) for c in MEMBER_COLUMNS) + (
+                    result.get("final_balances", {}).get("total"),
+                    metadata.get("total_transactions"),
+                    metadata.get("parser_version"),
+                    source,
+                ),
+            )
+            self.conn.executemany(
+                f"INSERT INTO yearly_summaries VALUES ({', '.join('?' * (len(SUMMARY_COLUMNS) + 2))})",
+                (
+                    (member_id, summary["year"]) + tuple(summary.get(c) for c in SUMMARY_COLUMNS)
+                    for summary in result.get("yearly_summaries", [])
+                ),
+            )
+            self.conn.executemany(
+                f"INSERT INTO transactions VALUES ({', '.join('?' * (len(TRANSACTION_COLUMNS) + 3))})",
+                self._transaction_rows(member_id, transactions),
+            )
+        return member_id
+
+    @staticmethod
+    def _transaction_rows(member_id: str, transactions: Iterable[Any]) -> Iterator[tuple]:
+        for seq, transaction in enumerate(transactions):
+            transaction = with_date_keys(transaction)
+            extra = None
+            if not _KNOWN_TRANSACTION_FIELDS.issuperset(transaction):
+                extra = json.dumps(
+                    {k: v for k, v in transaction.items() if k not in _KNOWN_TRANSACTION_FIELDS},
+                    ensure_ascii=False,
+                )
+            yield (member_id, seq, *map(transaction.get, TRANSACTION_COLUMNS), extra)
+
+    def import_file(self, path: str) -> str:
+        """Store a consolidated output file (any layout written by the parser); return the member id."""
+        header = load_consolidated_header(path)
+        return self.add_result(header, iter_transactions(path), source=os.path.abspath(path))
+
+    def import_paths(self, paths: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """
+        Import consolidated output files, and every one found in the given directories.
+
+        Returns the imported member ids and an error message per file that could not
+        be read; a bad file never stops the rest of the import.
+        """
+        imported, errors = [], []
+        for path in iter_consolidated_files(paths):
+            try:
+                imported.append(self.import_file(path))
+            except (OSError, ValueError, KeyError, EOFError, sqlite3.Error) as e:
+                errors.append(f"{path}: {type(e).__name__}: {e}")
+                logger.warning(f"Could not import {path}: {e}")
+        return imported, errors
+
+    def remove_member(self, member_id: str):
+        with self.conn:
+            for table in ("members", "yearly_summaries", "transactions"):
+                self.conn.execute(f"DELETE FROM {table} WHERE member_id = ?", (member_id,))
+
+    def query(
+        self,
+        table: str = "transactions",
+        filters: Optional[Dict[str, Any]] = None,
+        group_by: Sequence[str] = (),
+        limit: Optional[int] = None,
+    ) -> Tuple[List[str], List[tuple]]:
+        """
+        Run a filtered query and return (column names, rows).
+
+        table is "transactions", "summaries" (yearly_summaries) or "members". filters
+        may hold member_id, uan, establishment_id and year (a value or a list of
+        values); transactions also accept type, description (a substring) and
+        date_from/date_to (DD-MM-YYYY, inclusive). Member filters apply to the rows
+        of the matching members, and transaction filters on members select the
+        members with at least one matching transaction. group_by (transactions only) names GROUP_KEYS to
+        aggregate by, giving per-group counts, credit and withdrawal sums and the
+        first and last transaction dates; with no group_by, the matching rows are
+        listed in member and passbook order.
+        """
+        filters = filters or {}
+        if table not in QUERY_TABLES:
+            raise ValueError(f"Unknown table {table!r} (choose from {', '.join(QUERY_TABLES)})")
+        unknown = [key for key in group_by if key not in GROUP_KEYS]
+        if unknown:
+            raise ValueError(
+                f"Unknown group-by key {unknown[0]!r} (choose from {', '.join(GROUP_KEYS)})"
+            )
+        if group_by and table != "transactions":
+            raise ValueError("Only transactions can be grouped")
+
+        if table == "members":
+            where, params = _where(filters)
+            row_filters = {k: filters[k] for k in TRANSACTION_FILTERS if filters.get(k)}
+            if row_filters:
+                # Members with at least one matching transaction
+                row_where, row_params = _where(row_filters, "t", True)
+                where += (" AND " if where else " WHERE ") + (
+                    f"m.member_id IN (SELECT t.member_id FROM transactions t{row_where})"
+                )
+                params += row_params
+            sql = f"SELECT m.* FROM members m{where} ORDER BY m.member_id"
+        elif table == "summaries":
+            if any(filters.get(k) for k in TRANSACTION_FILTERS[1:]):
+                raise ValueError("Yearly summaries can only be filtered by member and year")
+            where, params = _where(filters, "s")
+            sql = (
+                "SELECT s.* FROM yearly_summaries s JOIN members m ON m.member_id = s.member_id"
+                f"{where} ORDER BY s.member_id, s.year"
+            )
+        else:
+            where, params = _where(filters, "t", True)
+            source = "transactions t JOIN members m ON m.member_id = t.member_id"
+            if group_by:
+                columns = [c for key in group_by for c in GROUP_KEYS[key][0]]
+                keys = ", ".join(GROUP_KEYS[key][1] for key in group_by)
+                sql = (
+                    f"SELECT {', '.join(columns + list(AGGREGATES))} FROM {source}{where}"
+                    f" GROUP BY {keys} ORDER BY {keys}"
+                )
+            else:
+                sql = f"SELECT {', '.join(LIST_COLUMNS)} FROM {source}{where} ORDER BY t.member_id, t.seq"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        cursor = self.conn.execute(sql, params)
+        names = [d[0] for d in cursor.description]
+        rows = cursor.fetchall()
+        dates = [i for i, name in enumerate(names) if name in DATE_RESULT_COLUMNS]
+        if dates:
+            rows = [
+                tuple(
+                    datetime.fromordinal(v).strftime("%d-%m-%Y") if i in dates and v else v
+                    for i, v in enumerate(row)
+                )
+                for row in rows
+            ]
+        return names, rows
+
+
+def iter_consolidated_files(paths: Iterable[str]) -> Iterator[str]:
+    """The given files, plus the consolidated output files in the given directories."""
+    suffixes = tuple(
+        f"_consolidated.{fmt}{gz}" for fmt in OUTPUT_FORMATS for gz in ("", ".gz")
+    )
+    for path in paths:
+        if os.path.isdir(path):
+            yield from sorted(
+                str(p) for p in Path(path).iterdir() if p.name.endswith(suffixes)
+            )
+        else:
+            yield path
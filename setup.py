@@ -10,7 +10,7 @@ setup(
     long_description=Path("README.md").read_text(encoding="utf-8"),
     long_description_content_type="text/markdown",
     packages=find_packages(),
-    py_modules=["epfo_parser_final", "display_epfo"],
+    py_modules=["epfo_parser_final", "display_epfo", "epfo_cache", "epfo_backends", "epfo_service", "epfo_profile", "epfo_store", "epfo_parquet", "epfo_excel", "epfo_csv"],
     install_requires=[
         "pdfplumber==0.7.6",
         "tabulate",
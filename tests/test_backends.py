@@ -0,0 +1,46 @@
+"""
+Every text backend must give the reference (pdfplumber) backend's page text and
+parse result on synthetic passbooks, as benchmarks/bench_backends.py checks.
+"""
+import pytest
+
+pytest.importorskip("reportlab")
+pytest.importorskip("pdfplumber")
+pytest.importorskip("pdfminer")
+
+from bench_backends import parse  # noqa: E402
+from epfo_backends import BACKENDS, DEFAULT_BACKEND, get_backend  # noqa: E402
+from synthetic_passbook import write_passbook_pdf  # noqa: E402
+
+# One page; rows running across page breaks with transfers and withdrawals; and
+# descriptions wrapped onto continuation lines
+PASSBOOKS = {
+    "short": {"transactions": 12},
+    "multipage": {"transactions": 90, "transfer_rate": 0.1, "withdrawal_rate": 0.05},
+    "wrapped": {"transactions": 30, "wrap_particulars": 12, "transfer_rate": 0.2},
+}
+
+
+@pytest.fixture(scope="module", params=sorted(PASSBOOKS))
+def passbook(request, tmp_path_factory):
+    options = dict(PASSBOOKS[request.param])
+    pdf_path = write_passbook_pdf(
+        str(tmp_path_factory.mktemp(request.param) / "MHBAN00123450000012345_2023.pdf"),
+        2023, options.pop("transactions"), **options,
+    )
+    reference_text = list(get_backend(DEFAULT_BACKEND).iter_page_texts(pdf_path))
+    return pdf_path, reference_text, parse(pdf_path, DEFAULT_BACKEND)
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_page_text_matches_reference(passbook, backend):
+    pdf_path, reference_text, _ = passbook
+    assert reference_text
+    assert list(get_backend(backend).iter_page_texts(pdf_path)) == reference_text
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_parse_result_matches_reference(passbook, backend):
+    pdf_path, _, reference_result = passbook
+    assert reference_result[2]
+    assert parse(pdf_path, backend) == reference_result
@@ -0,0 +1,91 @@
+"""The on-disk parse cache: hits, misses when the key changes, and LRU eviction."""
+import os
+
+import pytest
+
+from epfo_cache import PDFResultCache
+from epfo_parser_final import PARSER_VERSION, EPFOMultiYearParser, open_cache
+
+YEAR = "2023"
+
+
+@pytest.fixture(scope="module")
+def pdf_path(tmp_path_factory):
+    pytest.importorskip("reportlab")
+    pytest.importorskip("pdfminer")
+    from synthetic_passbook import write_passbook_pdf
+
+    path = tmp_path_factory.mktemp("pdfs") / f"MHBAN00123450000012345_{YEAR}.pdf"
+    return write_passbook_pdf(str(path), int(YEAR), 30)
+
+
+def counting_parser(cache, calls, **options):
+    """A pdfminer parser whose page extractions are counted in calls."""
+    parser = EPFOMultiYearParser(cache=cache, backend="pdfminer", **options)
+    for name in ("iter_page_texts", "iter_page_lines"):
+        extract = getattr(parser.backend, name)
+
+        def counted(*args, _extract=extract, **kwargs):
+            calls.append(1)
+            return _extract(*args, **kwargs)
+
+        setattr(parser.backend, name, counted)
+    return parser
+
+
+def test_unchanged_pdf_is_served_from_cache(tmp_path, pdf_path):
+    calls = []
+    first = counting_parser(open_cache(str(tmp_path)), calls).parse_pdf(pdf_path, YEAR)
+    assert calls == [1]
+
+    second = counting_parser(open_cache(str(tmp_path)), calls).parse_pdf(pdf_path, YEAR)
+    assert calls == [1]
+    assert second == first
+
+
+@pytest.mark.parametrize(
+    "version, options",
+    [
+        ("0.0.0", {}),
+        (PARSER_VERSION, {"mode": "columns"}),
+    ],
+    ids=["parser-version", "mode"],
+)
+def test_changed_key_misses(tmp_path, pdf_path, version, options):
+    calls = []
+    counting_parser(open_cache(str(tmp_path)), calls).parse_pdf(pdf_path, YEAR)
+    cache = PDFResultCache(str(tmp_path), version=version)
+    counting_parser(cache, calls, **options).parse_pdf(pdf_path, YEAR)
+    assert len(calls) == 2
+
+
+def test_key_depends_on_content_year_version_and_variant(tmp_path, pdf_path):
+    cache = PDFResultCache(str(tmp_path), version="1")
+    key = cache.key_for(pdf_path, YEAR, "pdfminer:text")
+    assert cache.key_for(pdf_path, YEAR, "pdfminer:text") == key
+    assert len({
+        key,
+        cache.key_for(pdf_path, "2022", "pdfminer:text"),
+        cache.key_for(pdf_path, YEAR, "pdfplumber:text"),
+        cache.key_for(pdf_path, YEAR, "pdfminer:columns"),
+        cache.key_for(pdf_path, YEAR, "pdfminer:text", content_hash="0" * 64),
+        PDFResultCache(str(tmp_path), version="2").key_for(pdf_path, YEAR, "pdfminer:text"),
+    }) == 6
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    entry = {"payload": "x" * 1000}
+    cache = PDFResultCache(str(tmp_path), max_bytes=10**6)
+    keys = [f"{i:02d}" + "0" * 62 for i in range(10)]
+    for age, key in enumerate(keys):
+        cache.put(key, entry)
+        # Distinct, increasing access times without sleeping
+        os.utime(cache._entry_path(key), (age, age))
+    cache.get(keys[0])
+
+    # Trimmed to 90% of five entries: the four most recently used are kept
+    cache.max_bytes = 5 * cache._entry_path(keys[0]).stat().st_size
+    cache.evict()
+    kept = [key for key in keys if cache.get(key) is not None]
+    assert kept == [keys[0]] + keys[-3:]
+    assert cache._size_estimate <= cache.max_bytes
@@ -0,0 +1,94 @@
+"""CSV exports quote awkward values and split batch tables into shards."""
+import csv
+import gzip
+import os
+
+import pytest
+
+from bench_parquet import member_results
+from epfo_csv import CSVBatchWriter, write_member_csvs
+from epfo_excel import (
+    MEMBER_SHEET_COLUMNS,
+    SUMMARY_SHEET_COLUMNS,
+    TRANSACTION_SHEET_COLUMNS,
+    member_row,
+    summary_rows,
+    transaction_rows,
+)
+from synthetic_passbook import consolidated_result
+
+AWKWARD = ['Claim, "final" settlement', "two\nlines", " padded ,", '"', ""]
+
+
+@pytest.fixture(scope="module")
+def results():
+    _, result = consolidated_result(300, per_year=100)
+    members = []
+    for member in member_results(result, 3, establishments=2):
+        transactions = member["all_transactions"].to_dicts()
+        for transaction, description in zip(transactions, AWKWARD):
+            transaction["description"] = description
+        members.append(dict(member, all_transactions=transactions))
+    members[0]["member_info"] = dict(members[0]["member_info"], member_name="Doe, Jane \"JD\"")
+    return members
+
+
+def as_csv(rows):
+    """Rows as csv.reader returns them."""
+    return [["" if value is None else str(value) for value in row] for row in rows]
+
+
+def read_csv(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_member_csvs_quote_values(tmp_path, results):
+    result = results[0]
+    paths = write_member_csvs(result, str(tmp_path), "member", "20260101")
+    assert all(os.path.exists(path) for path in paths)
+
+    member_info = read_csv(paths[0])
+    assert member_info == as_csv([list(result["member_info"]), result["member_info"].values()])
+    rows = read_csv(paths[2])
+    assert rows[0] == list(TRANSACTION_SHEET_COLUMNS[1:])
+    assert rows[1:] == as_csv(row[1:] for row in transaction_rows(result))
+    assert [row[4] for row in rows[1:len(AWKWARD) + 1]] == AWKWARD
+
+
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("rows_per_shard", [1, 7, 10**6])
+def test_batch_shards(tmp_path, results, rows_per_shard, compress):
+    # Shards a previous, larger export left behind are removed
+    stale = tmp_path / "transactions-90000.csv"
+    stale.write_text("stale\n")
+    with CSVBatchWriter(str(tmp_path), rows_per_shard, compress) as writer:
+        for result in results:
+            writer.add_result(result)
+    assert not stale.exists()
+
+    expected = {
+        "members": (MEMBER_SHEET_COLUMNS, [member_row(r) for r in results]),
+        "yearly_summaries": (
+            SUMMARY_SHEET_COLUMNS, [row for r in results for row in summary_rows(r)],
+        ),
+        "transactions": (
+            TRANSACTION_SHEET_COLUMNS, [row for r in results for row in transaction_rows(r)],
+        ),
+    }
+    for name, (headers, rows) in expected.items():
+        paths = writer.tables[name].paths
+        assert [os.path.basename(p) for p in paths] == [
+            f"{name}-{i:05d}.csv" + (".gz" if compress else "") for i in range(1, len(paths) + 1)
+        ]
+        assert len(paths) == -(-len(rows) // rows_per_shard)
+        shards = [read_csv(path) for path in paths]
+        assert all(shard[0] == list(headers) for shard in shards)
+        assert all(1 <= len(shard) - 1 <= rows_per_shard for shard in shards)
+        assert [row for shard in shards for row in shard[1:]] == as_csv(rows)
+
+
+def test_rows_per_shard_must_be_positive(tmp_path):
+    with pytest.raises(ValueError):
+        CSVBatchWriter(str(tmp_path), rows_per_shard=0)
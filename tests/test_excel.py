@@ -0,0 +1,77 @@
+"""The batch Excel workbook has the Members, Yearly Summaries and Transactions sheets."""
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from openpyxl import load_workbook  # noqa: E402
+
+import epfo_excel  # noqa: E402
+from bench_parquet import member_results  # noqa: E402
+from epfo_excel import (  # noqa: E402
+    MEMBER_SHEET_COLUMNS,
+    SUMMARY_SHEET_COLUMNS,
+    TRANSACTION_SHEET_COLUMNS,
+    ExcelWorkbookWriter,
+    member_row,
+    summary_rows,
+    transaction_rows,
+)
+from synthetic_passbook import consolidated_result  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def results():
+    _, result = consolidated_result(120, per_year=60)
+    return list(member_results(result, 3, establishments=2))
+
+
+def write_workbook(path, results):
+    with ExcelWorkbookWriter(str(path)) as writer:
+        for result in results:
+            writer.add_result(result)
+    workbook = load_workbook(str(path), read_only=True)
+    sheets = {}
+    for sheet in workbook.worksheets:
+        rows = [list(row) for row in sheet.iter_rows(values_only=True)]
+        # Read-only sheets drop a row's trailing empty cells: pad to the header
+        sheets[sheet.title] = [row + [None] * (len(rows[0]) - len(row)) for row in rows]
+    workbook.close()
+    return sheets
+
+
+def as_cells(rows):
+    """Rows as openpyxl reads them back (empty cells are None)."""
+    return [[None if value == "" else value for value in row] for row in rows]
+
+
+def test_batch_workbook_sheets_and_columns(tmp_path, results):
+    sheets = write_workbook(tmp_path / "batch.xlsx", results)
+
+    assert list(sheets) == ["Members", "Yearly Summaries", "Transactions"]
+    expected = {
+        "Members": (MEMBER_SHEET_COLUMNS, [member_row(r) for r in results]),
+        "Yearly Summaries": (
+            SUMMARY_SHEET_COLUMNS, [row for r in results for row in summary_rows(r)],
+        ),
+        "Transactions": (
+            TRANSACTION_SHEET_COLUMNS, [row for r in results for row in transaction_rows(r)],
+        ),
+    }
+    for title, (headers, rows) in expected.items():
+        assert sheets[title][0] == list(headers)
+        assert sheets[title][1:] == as_cells(rows)
+
+
+def test_full_sheets_continue_on_numbered_sheets(tmp_path, monkeypatch, results):
+    monkeypatch.setattr(epfo_excel, "MAX_SHEET_ROWS", 50)
+    sheets = write_workbook(tmp_path / "batch.xlsx", results)
+
+    transactions = [row for r in results for row in transaction_rows(r)]
+    titles = [title for title in sheets if title.startswith("Transactions")]
+    assert titles == ["Transactions"] + [
+        f"Transactions ({n})" for n in range(2, len(titles) + 1)
+    ]
+    assert len(titles) == -(-len(transactions) // 49)
+    assert all(sheets[title][0] == list(TRANSACTION_SHEET_COLUMNS) for title in titles)
+    assert all(len(sheets[title]) <= 50 for title in titles)
+    assert [row for title in titles for row in sheets[title][1:]] == as_cells(transactions)
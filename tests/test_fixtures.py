@@ -0,0 +1,29 @@
+"""
+Extractor results on the cleaned-text fixtures in benchmarks/fixtures/text must match
+their .expected.json snapshots (rewrite them with
+`python benchmarks/bench_extractors.py --update-fixtures` after an intended change).
+"""
+import glob
+import json
+import os
+
+import pytest
+
+from bench_extractors import EXTRACTORS, FIXTURE_DIR, run_case
+
+FIXTURES = sorted(
+    os.path.basename(path)[:-4] for path in glob.glob(os.path.join(FIXTURE_DIR, "*.txt"))
+)
+
+
+def test_fixtures_present():
+    assert FIXTURES
+
+
+@pytest.mark.parametrize("extractor", list(EXTRACTORS))
+@pytest.mark.parametrize("fixture", FIXTURES)
+def test_fixture_matches_snapshot(fixture, extractor):
+    with open(os.path.join(FIXTURE_DIR, fixture + ".expected.json"), encoding="utf-8") as f:
+        expected = json.load(f)
+    _, _, result = run_case(extractor, fixture, 0, 1)
+    assert json.loads(json.dumps(result)) == expected[extractor]
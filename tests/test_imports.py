@@ -0,0 +1,40 @@
+"""
+Importing the parser or the display module must not load the heavy optional
+libraries: they are imported on the code paths that use them. Each module's
+`python -X importtime` cumulative time must also stay within a budget, a generous
+multiple of benchmarks/bench_importtime.py's so slow CI machines don't flake.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from bench_importtime import MODULES, import_profile
+
+HEAVY_MODULES = ("pdfplumber", "pdfminer", "pandas", "openpyxl", "reportlab", "pyarrow")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# bench_importtime.py's default budget is 150 ms per module
+IMPORT_BUDGET_MS = 500
+
+
+@pytest.mark.parametrize("module", ["epfo_parser_final", "display_epfo"])
+def test_import_does_not_load_heavy_modules(module):
+    # A fresh interpreter: other tests may already have imported these
+    code = (
+        f"import json, sys; import {module}; "
+        f"print(json.dumps(sorted({{name.split('.')[0] for name in sys.modules}})))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT
+    )
+    loaded = set(json.loads(proc.stdout))
+    assert not loaded & set(HEAVY_MODULES)
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_import_time_within_budget(module):
+    # Best of three fresh interpreters, so one slow start-up doesn't fail the test
+    best_ms = min(import_profile(module)[1] for _ in range(3)) / 1000
+    assert best_ms <= IMPORT_BUDGET_MS, f"importing {module} took {best_ms:.0f} ms"
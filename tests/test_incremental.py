@@ -0,0 +1,61 @@
+"""
+An incremental batch (--incremental) must write the same consolidated results as a
+full re-parse, while parsing only the new and changed PDFs.
+"""
+import json
+
+import pytest
+
+pytest.importorskip("reportlab")
+pytest.importorskip("pdfminer")
+
+from display_epfo import load_consolidated  # noqa: E402
+from epfo_parser_final import _json_default, process_batch  # noqa: E402
+from synthetic_passbook import (  # noqa: E402
+    member_id_for,
+    write_corpus,
+    write_passbook_pdf,
+)
+
+MEMBERS = 2
+OPTIONS = {"parser_options": {"backend": "pdfminer"}, "workers": 1}
+
+
+def comparable(path):
+    """A consolidated JSON as plain data, without the run-dependent timestamp."""
+    data = json.loads(json.dumps(load_consolidated(path), default=_json_default))
+    data["extraction_metadata"].pop("extracted_at")
+    return data
+
+
+def outputs(reports):
+    return {report["member_id"]: comparable(report["json_path"]) for report in reports}
+
+
+def test_incremental_batch_matches_full_reparse(tmp_path):
+    root = tmp_path / "PF"
+    write_corpus(str(root), members=MEMBERS, years=3, transactions=40, last_year=2023)
+    incremental_dir = str(tmp_path / "incremental")
+    process_batch(str(root), incremental_dir, incremental=True, **OPTIONS)
+
+    # Each member gets a new year, and the first member's middle year is re-issued
+    for index in range(MEMBERS):
+        member_id = member_id_for(index + 1)
+        write_passbook_pdf(
+            str(root / member_id / f"{member_id}_2024.pdf"), 2024, 40,
+            seed=index + 1, member_id=member_id,
+        )
+    first = member_id_for(1)
+    write_passbook_pdf(
+        str(root / first / f"{first}_2022.pdf"), 2022, 45, seed=99, member_id=first
+    )
+
+    updated = process_batch(str(root), incremental_dir, incremental=True, **OPTIONS)
+    full = process_batch(str(root), str(tmp_path / "full"), **OPTIONS)
+
+    assert [r["status"] for r in updated] == ["ok"] * MEMBERS
+    assert {r["member_id"]: r["parsed_pdfs"] for r in updated} == {
+        first: 2, member_id_for(2): 1,
+    }
+    assert all(len(r["years"]) == 4 for r in updated)
+    assert outputs(updated) == outputs(full)
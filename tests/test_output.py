@@ -0,0 +1,82 @@
+"""Every consolidated output layout reads back through display_epfo to the result written."""
+import json
+
+import pytest
+
+import display_epfo
+from display_epfo import _iter_consolidated, load_consolidated_header
+from epfo_parser_final import _json_default, write_consolidated_json
+from synthetic_passbook import consolidated_result
+
+# (output_format, compact, compress) and whether display_epfo reads it line by line
+LAYOUTS = [
+    ("json", False, False, False),
+    ("json", True, False, True),
+    ("ndjson", False, False, True),
+    ("json", False, True, False),
+    ("json", True, True, True),
+    ("ndjson", False, True, True),
+]
+LAYOUT_IDS = ["json", "compact", "ndjson", "json.gz", "compact.gz", "ndjson.gz"]
+
+
+@pytest.fixture(scope="module")
+def result():
+    _, result = consolidated_result(300, per_year=100)
+    return result
+
+
+def plain(result):
+    return json.loads(json.dumps(result, default=_json_default))
+
+
+def read_back(path):
+    records = _iter_consolidated(path)
+    header = next(records)
+    header["all_transactions"] = list(records)
+    return header
+
+
+@pytest.mark.parametrize("output_format, compact, compress, streamed", LAYOUTS, ids=LAYOUT_IDS)
+def test_layout_reads_back(
+    tmp_path, monkeypatch, result, output_format, compact, compress, streamed
+):
+    path = write_consolidated_json(result, str(tmp_path), output_format, compress, compact)
+    if streamed:
+        # The streamed layouts must never fall back to loading the whole document
+        def no_load(*args, **kwargs):
+            raise AssertionError("json.load fallback used")
+
+        monkeypatch.setattr(display_epfo.json, "load", no_load)
+    assert read_back(path) == plain(result)
+    header = load_consolidated_header(path)
+    assert "all_transactions" not in header
+    assert header["yearly_summaries"] == plain(result)["yearly_summaries"]
+
+
+@pytest.mark.parametrize(
+    "output_format, compact, compress, streamed", LAYOUTS[:3], ids=LAYOUT_IDS[:3]
+)
+def test_no_transactions(tmp_path, result, output_format, compact, compress, streamed):
+    empty = dict(result, all_transactions=[])
+    path = write_consolidated_json(empty, str(tmp_path), output_format, compress, compact)
+    assert read_back(path) == plain(empty)
+
+
+def test_indented_output_matches_json_dump(tmp_path, result):
+    path = write_consolidated_json(result, str(tmp_path))
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    header = {key: value for key, value in result.items() if key != "all_transactions"}
+    expected = dict(header, all_transactions=result["all_transactions"])
+    assert text == json.dumps(expected, indent=2, ensure_ascii=False, default=_json_default) + "\n"
+
+
+def test_truncated_compact_output_is_an_error(tmp_path, result):
+    path = write_consolidated_json(result, str(tmp_path), compact=True)
+    with open(path, encoding="utf-8") as f:
+        first_line = f.readline()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(first_line)
+    with pytest.raises(ValueError):
+        read_back(path)
@@ -0,0 +1,73 @@
+"""
+Every way of parsing a member folder must give the in-memory, serial parse's result:
+parallel years (--jobs), page streaming (--stream) and parallel page extraction
+(--page-jobs); the columns mode must read back every row of the synthetic corpus.
+"""
+import json
+
+import pytest
+
+pytest.importorskip("reportlab")
+pytest.importorskip("pdfminer")
+
+from epfo_parser_final import EPFOMultiYearParser, _json_default  # noqa: E402
+from synthetic_passbook import MEMBER_ID, transaction_rows, write_member_folder  # noqa: E402
+
+YEARS = 3
+ROWS_PER_YEAR = 90
+LAST_YEAR = 2024
+OPTIONS = {"transfer_rate": 0.1, "withdrawal_rate": 0.05, "claim_interest": True}
+
+
+def comparable(result):
+    """The result as plain JSON data, without the run-dependent timestamp."""
+    data = json.loads(json.dumps(result, default=_json_default))
+    data["extraction_metadata"].pop("extracted_at")
+    return data
+
+
+def parse(folder, jobs=1, **options):
+    parser = EPFOMultiYearParser(backend="pdfminer", **options)
+    return comparable(parser.process_member_folder(folder, jobs=jobs))
+
+
+@pytest.fixture(scope="module")
+def folder(tmp_path_factory):
+    # 90 rows at 40 per page: rows run across page breaks
+    return write_member_folder(
+        str(tmp_path_factory.mktemp("corpus")), years=YEARS, transactions=ROWS_PER_YEAR,
+        last_year=LAST_YEAR, **OPTIONS,
+    )
+
+
+@pytest.fixture(scope="module")
+def reference(folder):
+    return parse(folder)
+
+
+def test_jobs_matches_serial(folder, reference):
+    assert parse(folder, jobs=2) == reference
+
+
+def test_streaming_matches_in_memory(folder, reference):
+    assert parse(folder, streaming=True) == reference
+
+
+def test_page_jobs_matches_in_memory(folder, reference):
+    assert parse(folder, page_jobs=2) == reference
+
+
+def test_columns_reads_every_row(folder, reference):
+    result = parse(folder, mode="columns")
+    expected = []
+    for year in range(LAST_YEAR - YEARS + 1, LAST_YEAR + 1):
+        rows = transaction_rows(
+            year, ROWS_PER_YEAR, year,
+            **{k: v for k, v in OPTIONS.items() if k.endswith("_rate")},
+        )
+        expected.extend((row[0], row[1], row[2]) for row in rows)
+
+    assert [(t["month"], t["date"], t["type"]) for t in result["all_transactions"]] == expected
+    assert result["member_info"] == reference["member_info"]
+    assert result["final_balances"] == reference["final_balances"]
+    assert result["member_info"]["member_id"] == MEMBER_ID
@@ -0,0 +1,68 @@
+"""Re-exporting into a --parquet dataset replaces members' rows and keeps the others'."""
+import copy
+from collections import Counter
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from bench_parquet import member_results  # noqa: E402
+from epfo_parquet import ParquetExporter, open_dataset  # noqa: E402
+from synthetic_passbook import consolidated_result  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def members():
+    _, result = consolidated_result(200, per_year=100)
+    return [
+        dict(member, all_transactions=list(member["all_transactions"].iter_dicts()))
+        for member in member_results(result, members=4, establishments=2)
+    ]
+
+
+def export(path, results, basename="batch"):
+    with ParquetExporter(str(path), basename=basename) as exporter:
+        for result in results:
+            exporter.add_result(result)
+
+
+def rows(path):
+    """Transaction row count per (member_id, establishment_id)."""
+    table = open_dataset(str(path)).to_table().to_pydict()
+    return Counter(zip(table["member_id"], table["establishment_id"]))
+
+
+def test_reexport_replaces_rows(tmp_path, members):
+    export(tmp_path, members)
+    expected = rows(tmp_path)
+    assert len(expected) == len(members)
+
+    export(tmp_path, members[:1], basename=members[0]["member_info"]["member_id"])
+    assert rows(tmp_path) == expected
+    # A batch of some members keeps the rows of the others
+    export(tmp_path, members[1:2])
+    assert rows(tmp_path) == expected
+
+
+def test_member_changing_establishment_leaves_no_stale_rows(tmp_path, members):
+    export(tmp_path, members)
+    moved = copy.deepcopy(members[0])
+    moved["member_info"]["establishment_id"] = "MHBAN9999999999"
+    export(tmp_path, [moved])
+
+    counts = rows(tmp_path)
+    member_id = moved["member_info"]["member_id"]
+    assert [key for key in counts if key[0] == member_id] == [(member_id, "MHBAN9999999999")]
+    assert sum(counts.values()) == sum(len(m["all_transactions"]) for m in members)
+
+
+def test_failed_export_leaves_dataset_unchanged(tmp_path, members):
+    export(tmp_path, members[:2])
+    before = sorted(p.relative_to(tmp_path) for p in tmp_path.rglob("*") if p.is_file())
+    with pytest.raises(RuntimeError):
+        with ParquetExporter(str(tmp_path), basename="batch") as exporter:
+            exporter.add_result(members[0])
+            exporter.add_result(members[2])
+            exporter.flush()
+            raise RuntimeError("batch failed")
+    assert sorted(p.relative_to(tmp_path) for p in tmp_path.rglob("*") if p.is_file()) == before
@@ -0,0 +1,72 @@
+"""The `epfoparser serve` HTTP service, driven over a real socket."""
+import asyncio
+import json
+import os
+import signal
+
+import pytest
+
+from epfo_service import ParseService, _ping
+
+
+async def http(port: int, request: bytes):
+    """Send a raw HTTP request and return (status, parsed JSON body)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(request)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def post_folder(folder: str) -> bytes:
+    body = json.dumps({"folder": folder}).encode("utf-8")
+    return (
+        b"POST /parse HTTP/1.1\r\nContent-Type: application/json\r\n"
+        + f"Content-Length: {len(body)}\r\n\r\n".encode("ascii")
+        + body
+    )
+
+
+def run_service(scenario):
+    """Run scenario(service, port) against a one-worker service on a free port."""
+
+    async def main():
+        service = ParseService(workers=1, parser_options={"backend": "pdfminer"})
+        server = await service.start(port=0)
+        try:
+            return await scenario(service, server.sockets[0].getsockname()[1])
+        finally:
+            server.close()
+            await service.close()
+
+    return asyncio.run(main())
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="needs SIGKILL")
+def test_worker_death_restarts_pool(tmp_path):
+    async def scenario(service, port):
+        pid = await asyncio.get_running_loop().run_in_executor(service.pool, _ping)
+        os.kill(pid, signal.SIGKILL)
+        # An empty folder parses to 422 once the job reaches a live worker
+        first = await http(port, post_folder(str(tmp_path)))
+        second = await http(port, post_folder(str(tmp_path)))
+        return first, second, service.pool_restarts
+
+    first, second, restarts = run_service(scenario)
+    assert first[0] == 422
+    assert second[0] == 422
+    assert restarts == 1
+
+
+@pytest.mark.parametrize("length", ["abc", "-1", "1.5"])
+def test_invalid_content_length_is_rejected(length):
+    async def scenario(service, port):
+        return await http(
+            port, f"POST /parse HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode("ascii")
+        )
+
+    status, body = run_service(scenario)
+    assert status == 400
+    assert body == {"error": "Invalid Content-Length header"}
@@ -0,0 +1,79 @@
+"""Storing or importing a member again replaces its rows in the ResultStore."""
+import pytest
+
+from bench_parquet import member_results
+from epfo_parser_final import TransactionRange, write_consolidated_json
+from epfo_store import ResultStore
+from synthetic_passbook import consolidated_result
+
+MEMBERS = 3
+
+
+@pytest.fixture(scope="module")
+def results():
+    _, result = consolidated_result(300, per_year=100)
+    return list(member_results(result, MEMBERS, establishments=2))
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ResultStore(str(tmp_path / "results.sqlite")) as store:
+        yield store
+
+
+def counts(store):
+    return {
+        table: store.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("members", "yearly_summaries", "transactions")
+    }
+
+
+def expected_counts(results):
+    return {
+        "members": len(results),
+        "yearly_summaries": sum(len(r["yearly_summaries"]) for r in results),
+        "transactions": sum(len(r["all_transactions"]) for r in results),
+    }
+
+
+def test_reimport_creates_no_duplicates(tmp_path, store, results):
+    out = tmp_path / "out"
+    out.mkdir()
+    for result, (output_format, compact) in zip(
+        results, [("json", False), ("json", True), ("ndjson", False)]
+    ):
+        write_consolidated_json(result, str(out), output_format, compact=compact)
+
+    imported, errors = store.import_paths([str(out)])
+    assert errors == []
+    assert sorted(imported) == sorted(r["member_info"]["member_id"] for r in results)
+    assert counts(store) == expected_counts(results)
+
+    store.import_paths([str(out)])
+    assert counts(store) == expected_counts(results)
+    # Parsed and stored directly (batch --store), then imported from its file again
+    store.add_result(results[0])
+    store.import_paths([str(out)])
+    assert counts(store) == expected_counts(results)
+
+
+def test_storing_again_replaces_the_members_rows(store, results):
+    for result in results:
+        store.add_result(result)
+    part = results[0]["all_transactions"]
+    shorter = dict(
+        results[0],
+        yearly_summaries=results[0]["yearly_summaries"][:1],
+        all_transactions=TransactionRange(part.store, part.start, part.start + 5),
+    )
+    store.add_result(shorter)
+
+    assert counts(store) == expected_counts([shorter] + results[1:])
+    member_id = shorter["member_info"]["member_id"]
+    _, rows = store.query("transactions", {"member_id": member_id})
+    assert [(row[2], row[3]) for row in rows] == [
+        (t["month"], t["date"]) for t in shorter["all_transactions"]
+    ]
+
+    store.remove_member(member_id)
+    assert counts(store) == expected_counts(results[1:])
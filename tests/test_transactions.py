@@ -0,0 +1,95 @@
+"""TransactionStore and TransactionRange convert back to the dicts they were built from."""
+import pytest
+
+from epfo_parser_final import (
+    TRANSACTION_AMOUNT_FIELDS,
+    InternTable,
+    TransactionRange,
+    TransactionStore,
+)
+from synthetic_passbook import consolidated_result
+
+
+@pytest.fixture(scope="module")
+def records():
+    # Parsed passbook rows (contributions, transfers, withdrawals) plus rows that
+    # don't fit the typed columns
+    _, result = consolidated_result(600, per_year=200)
+    rows = result["all_transactions"].to_dicts()
+    rows[1] = dict(rows[1], description=None)
+    rows[2] = dict(rows[2], wages=2 ** 70, basic_wages="1,234")
+    rows[3] = dict(rows[3], note="extra key", employee_contribution=12.5)
+    rows.append({})
+    return rows
+
+
+def test_store_round_trip(records):
+    store = TransactionStore(records=records)
+    assert len(store) == len(records)
+    assert store.to_dicts() == records
+    assert [dict(row) for row in store] == records
+    assert dict(store[-1]) == records[-1]
+    with pytest.raises(IndexError):
+        store[len(records)]
+
+
+def test_store_keeps_value_types(records):
+    row = TransactionStore(records=records)[2]
+    assert row["wages"] == 2 ** 70
+    assert row["basic_wages"] == "1,234"
+    assert TransactionStore(records=records)[1]["description"] is None
+
+
+@pytest.mark.parametrize("shared_table", [True, False])
+def test_extend_round_trip(records, shared_table):
+    half = len(records) // 2
+    store = TransactionStore(records=records[:half])
+    other = TransactionStore(
+        store.table if shared_table else InternTable(), records=records[half:]
+    )
+    store.extend(other)
+    assert store.to_dicts() == records
+
+
+def test_range_round_trip(records):
+    store = TransactionStore(records=records)
+    part = TransactionRange(store, 100, 300)
+    assert len(part) == 200
+    assert part.to_dicts() == records[100:300]
+    assert [dict(row) for row in part] == records[100:300]
+    assert dict(part[-1]) == records[299]
+    assert part.field_names() == list(dict.fromkeys(k for r in records[100:300] for k in r))
+
+
+def python_sum(records, field, transaction_type=None):
+    return sum(
+        r[field] for r in records
+        if type(r.get(field)) is int and abs(r[field]) < 2 ** 63
+        and (transaction_type is None or r.get("type") == transaction_type)
+    )
+
+
+@pytest.mark.parametrize("transaction_type", [None, "CR", "DR", "XX"])
+def test_column_sums(records, transaction_type):
+    store = TransactionStore(records=records)
+    for field in TRANSACTION_AMOUNT_FIELDS:
+        assert store.column_sum(field, transaction_type) == python_sum(
+            records, field, transaction_type
+        )
+    if transaction_type is None:
+        assert store.column_sums() == {
+            field: python_sum(records, field) for field in TRANSACTION_AMOUNT_FIELDS
+        }
+
+
+def test_count_and_max_match_range(records):
+    store = TransactionStore(records=records)
+    whole = TransactionRange(store, 0, len(store))
+    for transaction_type in ("CR", "DR", "XX"):
+        assert store.count("type", transaction_type) == whole.count("type", transaction_type)
+        assert store.count("type", transaction_type) == sum(
+            r.get("type") == transaction_type for r in records
+        )
+    assert store.column_max("date_ordinal", "type", "CR") == whole.column_max(
+        "date_ordinal", "type", "CR"
+    )